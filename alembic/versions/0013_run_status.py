@@ -0,0 +1,41 @@
+"""run_status
+
+Estado de ejecución por Run (pending | running | completed | failed) para la
+generación de versiones en background: POST /documents/{id}/runs puede devolver
+202 con el run_id y el cliente consulta GET /documents/{id}/runs/{run_id}.
+Los runs existentes quedan como `completed` (antes solo se persistían al terminar).
+
+Revision ID: 0013_run_status
+Revises: 0012_tyto_query_log
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+try:
+    from process_ai_core.db.database import DATABASE_SCHEMA as SCHEMA
+except Exception:  # pragma: no cover
+    SCHEMA = "process_ai"
+if not SCHEMA:
+    SCHEMA = "process_ai"
+
+
+revision = "0013_run_status"
+down_revision = "0012_tyto_query_log"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "runs",
+        sa.Column("status", sa.String(20), nullable=False, server_default="completed"),
+        schema=SCHEMA,
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("runs", "status", schema=SCHEMA)
@@ -0,0 +1,55 @@
+"""list_indexes (índices compuestos para listados de documentos y runs)
+
+Los listados de documentos filtran por workspace + status (pending-approval,
+to-review) o workspace + domain (GET /documents) y ordenan por created_at; los
+runs de un documento se listan por document_id ordenados por created_at. Con
+índices de una sola columna Postgres filtra por workspace_id y ordena en memoria.
+
+Revision ID: 0014_list_indexes
+Revises: 0013_run_status
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+try:
+    from process_ai_core.db.database import DATABASE_SCHEMA as SCHEMA
+except Exception:  # pragma: no cover
+    SCHEMA = "process_ai"
+if not SCHEMA:
+    SCHEMA = "process_ai"
+
+
+revision = "0014_list_indexes"
+down_revision = "0013_run_status"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_documents_ws_status_created",
+        "documents",
+        ["workspace_id", "status", "created_at"],
+        schema=SCHEMA,
+    )
+    op.create_index(
+        "ix_documents_ws_domain_created",
+        "documents",
+        ["workspace_id", "domain", "created_at"],
+        schema=SCHEMA,
+    )
+    op.create_index(
+        "ix_runs_document_created",
+        "runs",
+        ["document_id", "created_at"],
+        schema=SCHEMA,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_runs_document_created", table_name="runs", schema=SCHEMA)
+    op.drop_index("ix_documents_ws_domain_created", table_name="documents", schema=SCHEMA)
+    op.drop_index("ix_documents_ws_status_created", table_name="documents", schema=SCHEMA)
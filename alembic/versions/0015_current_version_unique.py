@@ -0,0 +1,58 @@
+"""current_version_unique (una sola versión vigente por documento)
+
+Índice único parcial sobre document_versions(document_id) WHERE is_current:
+GET /documents/{id}/current-version resuelve la vigente con un solo probe del
+índice y la regla "una sola versión vigente por documento" pasa a ser un
+invariante de la DB. Antes de crearlo se deja vigente solo la versión más
+reciente de cada documento (por si una carrera dejó más de una marcada).
+
+Revision ID: 0015_current_version_unique
+Revises: 0014_list_indexes
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+try:
+    from process_ai_core.db.database import DATABASE_SCHEMA as SCHEMA
+except Exception:  # pragma: no cover
+    SCHEMA = "process_ai"
+if not SCHEMA:
+    SCHEMA = "process_ai"
+
+
+revision = "0015_current_version_unique"
+down_revision = "0014_list_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        sa.text(
+            f"""
+            UPDATE "{SCHEMA}".document_versions SET is_current = false
+            WHERE is_current AND id NOT IN (
+                SELECT DISTINCT ON (document_id) id
+                FROM "{SCHEMA}".document_versions
+                WHERE is_current
+                ORDER BY document_id, version_number DESC
+            )
+            """
+        )
+    )
+    op.create_index(
+        "uq_document_one_current",
+        "document_versions",
+        ["document_id"],
+        unique=True,
+        schema=SCHEMA,
+        postgresql_where=sa.text("is_current"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_document_one_current", table_name="document_versions", schema=SCHEMA)
@@ -0,0 +1,45 @@
+"""version_status_index (índice compuesto para lookups de versiones por estado)
+
+Editar, generar o parchear un documento busca su IN_REVIEW / DRAFT
+(document_id + version_status) y el siguiente version_number. Con solo el índice
+sobre document_id Postgres trae todas las versiones del documento y filtra u
+ordena en memoria; el compuesto resuelve ambos con un range scan, e INCLUDE (id)
+deja el agregado del run (MAX version_number / IN_REVIEW) como index-only scan.
+
+Revision ID: 0016_version_status_index
+Revises: 0015_current_version_unique
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+try:
+    from process_ai_core.db.database import DATABASE_SCHEMA as SCHEMA
+except Exception:  # pragma: no cover
+    SCHEMA = "process_ai"
+if not SCHEMA:
+    SCHEMA = "process_ai"
+
+
+revision = "0016_version_status_index"
+down_revision = "0015_current_version_unique"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_document_versions_doc_status_number",
+        "document_versions",
+        ["document_id", "version_status", "version_number"],
+        schema=SCHEMA,
+        postgresql_include=["id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_document_versions_doc_status_number", table_name="document_versions", schema=SCHEMA
+    )
@@ -24,6 +24,9 @@ logger = logging.getLogger(__name__)
 
 _DEV_SECRET = "dev-only-insecure-artifact-secret-do-not-use-in-prod"
 
+# Artefactos canónicos de un run (tipo en la respuesta → archivo en el run).
+RUN_ARTIFACT_FILES = {"json": "process.json", "markdown": "process.md", "pdf": "process.pdf"}
+
 
 def _get_secret() -> bytes:
     from process_ai_core.config import get_settings  # import tardío para evitar ciclos
@@ -63,14 +66,42 @@ def sign_artifact_url(
     Returns:
         URL relativa con token firmado: "/api/v1/artifacts/{run_id}/{filename}?token=..."
     """
+    return _sign(run_id, filename, workspace_id, _expiry(ttl), _get_secret())
+
+
+def sign_run_artifact_urls(
+    run_id: str,
+    workspace_id: str,
+    include_pdf: bool = False,
+    ttl: int | None = None,
+) -> dict[str, str]:
+    """
+    URLs firmadas de los artefactos canónicos de un run: json y markdown siempre,
+    pdf solo si `include_pdf`. Resuelve secreto y expiración una sola vez.
+
+    Returns:
+        {"json": ..., "markdown": ...[, "pdf": ...]}
+    """
+    exp = _expiry(ttl)
+    secret = _get_secret()
+    return {
+        atype: _sign(run_id, filename, workspace_id, exp, secret)
+        for atype, filename in RUN_ARTIFACT_FILES.items()
+        if include_pdf or atype != "pdf"
+    }
+
+
+def _expiry(ttl: int | None) -> int:
     from process_ai_core.config import get_settings
 
     if ttl is None:
         ttl = get_settings().artifact_url_ttl_seconds
+    return int(time.time()) + ttl
+
 
-    exp = int(time.time()) + ttl
+def _sign(run_id: str, filename: str, workspace_id: str, exp: int, secret: bytes) -> str:
     msg = f"{run_id}:{filename}:{workspace_id}:{exp}"
-    sig = hmac.new(_get_secret(), msg.encode("utf-8"), hashlib.sha256).hexdigest()
+    sig = hmac.new(secret, msg.encode("utf-8"), hashlib.sha256).hexdigest()
     token = f"{exp}.{workspace_id}.{sig}"
 
     # quote(filename, safe="/") preserva barras para subdirectorios (assets/frame.png)
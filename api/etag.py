@@ -0,0 +1,109 @@
+"""
+ETag / 304 para los GET JSON de documentos.
+
+La UI sondea el documento, los listados y los runs y casi siempre recibe el
+mismo payload. Este middleware ASGI calcula un ETag fuerte (hash del body) para
+las respuestas 200 JSON de los prefijos configurados y, si el cliente manda un
+`If-None-Match` que coincide, responde 304 sin body: la DB se consulta igual
+(no hay `updated_at` en documents para derivar el ETag sin armar la respuesta),
+pero se ahorran los bytes de red y el parseo en el cliente.
+
+Los handlers no cambian (siguen devolviendo sus modelos): todo pasa acá.
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+_DEFAULT_PREFIXES = ("/api/v1/documents",)
+_CACHE_CONTROL = b"private, max-age=0, must-revalidate"
+
+
+def compute_etag(body: bytes) -> str:
+    """ETag fuerte del body (blake2b de 128 bits, entre comillas)."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """True si algún valor de `If-None-Match` coincide (comparación débil, RFC 9110)."""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class ETagMiddleware:
+    """Agrega ETag a los GET 200 JSON bajo `prefixes` y contesta 304 si aplica."""
+
+    def __init__(self, app, prefixes: tuple[str, ...] = _DEFAULT_PREFIXES):
+        self.app = app
+        self.prefixes = prefixes
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not scope["path"].startswith(self.prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = ""
+        for name, value in scope["headers"]:
+            if name == b"if-none-match":
+                if_none_match = value.decode("latin-1")
+                break
+
+        start: dict | None = None
+        chunks: list[bytes] = []
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                headers = dict(message.get("headers", []))
+                content_type = headers.get(b"content-type", b"")
+                if (
+                    message["status"] != 200
+                    or not content_type.startswith(b"application/json")
+                    or b"etag" in headers
+                ):
+                    # PDFs, errores, respuestas que ya traen su ETag: tal cual.
+                    passthrough = True
+                    await send(message)
+                    return
+                start = message
+                return
+
+            # http.response.body: se junta el body completo (JSON en memoria).
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            etag = compute_etag(body)
+            headers = [
+                (k, v) for k, v in start.get("headers", [])
+                if k not in (b"content-length", b"cache-control")
+            ]
+            headers += [(b"etag", etag.encode("latin-1")), (b"cache-control", _CACHE_CONTROL)]
+
+            if if_none_match and etag_matches(if_none_match, etag):
+                headers = [(k, v) for k, v in headers if k != b"content-type"]
+                await send({"type": "http.response.start", "status": 304, "headers": headers})
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            headers.append((b"content-length", str(len(body)).encode("latin-1")))
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
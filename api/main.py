@@ -14,6 +14,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
+from .etag import ETagMiddleware
+from .responses import OrjsonResponse
 from .routes import artifacts, catalog, document_types, documents, evidence, folders, process_runs, semantic, tyto, users, validations, workspaces, subscriptions, operational_roles
 from process_ai_core.db.database import warmup_db_pool
 # recipe_runs: dominio "recetas" (experimento B2C, sin auth/workspace) deshabilitado para el MVP. Ver línea de include_router más abajo.
@@ -38,6 +40,9 @@ app = FastAPI(
     title="Process AI Core API",
     description="API para generar documentación de procesos asistida por IA",
     version="0.1.0",
+    # orjson serializa los payloads grandes (content_json, listados) bastante
+    # más rápido que el encoder json por defecto.
+    default_response_class=OrjsonResponse,
 )
 
 # CORS: configurar según ambiente
@@ -54,6 +59,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ETag + 304 para los GET JSON de documentos (la UI los sondea seguido).
+app.add_middleware(ETagMiddleware)
+
 # Registrar rutas
 app.include_router(catalog.router)
 app.include_router(document_types.router)
@@ -5,6 +5,7 @@ Estos modelos definen la estructura esperada de los requests HTTP,
 validando tipos y valores antes de pasarlos al core.
 """
 
+from datetime import datetime
 from enum import Enum
 from typing import List, Optional
 
@@ -334,4 +335,4 @@ class DocumentResponse(BaseModel):
     description: str = Field(..., description="Descripción")
     status: str = Field(..., description="Estado: draft|active|archived")
     metadata: Optional[dict] = Field(default=None, description="Metadata adicional del documento")
-    created_at: str = Field(..., description="Fecha de creación")
+    created_at: datetime = Field(..., description="Fecha de creación")
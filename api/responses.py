@@ -0,0 +1,22 @@
+"""
+Respuesta JSON serializada con orjson.
+
+FastAPI deprecó su `ORJSONResponse` (emite un warning en cada instancia), pero
+orjson sigue siendo bastante más rápido que el encoder json por defecto para los
+payloads grandes (content_json, listados) y serializa datetime sin pasar por
+`jsonable_encoder`. Esta subclase de `JSONResponse` solo cambia `render`.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class OrjsonResponse(JSONResponse):
+    """`JSONResponse` que codifica con `orjson.dumps` (claves no-str permitidas)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
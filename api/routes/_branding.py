@@ -36,7 +36,7 @@ def get_workspace_pdf_branding(session: Session, workspace_id: str | None) -> Pd
     if not workspace_id:
         return None
 
-    workspace = session.query(Workspace).filter_by(id=workspace_id).first()
+    workspace = session.get(Workspace, workspace_id)
     if not workspace:
         return None
 
@@ -49,10 +49,10 @@ def get_workspace_pdf_branding(session: Session, workspace_id: str | None) -> Pd
 
 
 def get_run_pdf_branding(session: Session, run_id: str) -> PdfBranding | None:
-    run = session.query(Run).filter_by(id=run_id).first()
+    run = session.get(Run, run_id)
     if not run:
         return None
-    document = session.query(Document).filter_by(id=run.document_id).first()
+    document = session.get(Document, run.document_id)
     if not document:
         return None
     return get_workspace_pdf_branding(session, document.workspace_id)
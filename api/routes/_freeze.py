@@ -27,6 +27,7 @@ from process_ai_core.export import export_pdf_from_content, get_export_content
 from process_ai_core.storage import get_storage, version_pdf_key
 from ..artifact_signing import sign_artifact_url
 from ._branding import get_workspace_pdf_branding
+from ._pdf_pool import get_pdf_executor
 
 logger = logging.getLogger(__name__)
 
@@ -65,6 +66,7 @@ def freeze_approved_pdf(session: Session, version: DocumentVersion, api_base: st
     Renderiza, sube y registra el PDF de una versión APROBADA. Devuelve True si tuvo éxito.
 
     Idempotente: si la versión ya tiene `pdf_storage_key`, no re-renderiza.
+    Bloquea hasta que el render termina: llamarla fuera del event loop.
     """
     if version.version_status != "APPROVED":
         return False
@@ -88,14 +90,17 @@ def freeze_approved_pdf(session: Session, version: DocumentVersion, api_base: st
             content = _rewrite_img_src(content, version.run_id, api_base, workspace_id)
 
         with tempfile.TemporaryDirectory() as tmp:
-            pdf_path = export_pdf_from_content(
+            # En el pool de PDFs (espera un hilo del threadpool, no el event loop):
+            # respeta el tope de renders concurrentes.
+            pdf_path = get_pdf_executor().submit(
+                export_pdf_from_content,
                 content=content,
                 format=fmt,
                 run_dir=Path(tmp),
                 pdf_name="document.pdf",
                 base_url=api_base,
                 branding=branding,
-            )
+            ).result()
             pdf_bytes = Path(pdf_path).read_bytes()
 
         sha256 = hashlib.sha256(pdf_bytes).hexdigest()
@@ -0,0 +1,42 @@
+"""
+Pool dedicado para los renders de PDF (Pandoc + LaTeX, WeasyPrint).
+
+Cada render tarda de cientos de ms a varios segundos de CPU. Si corren en el
+threadpool por defecto (`to_thread`, `run_in_executor(None, ...)`) compiten con
+las lecturas de disco/DB cortas de los handlers y, bajo autosave, pueden
+ocupar todos los hilos. Acá corren en un pool propio de
+`settings.pdf_render_workers` hilos, creado una sola vez por proceso.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from process_ai_core.config import get_settings
+
+T = TypeVar("T")
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_pdf_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=max(1, get_settings().pdf_render_workers),
+                    thread_name_prefix="pdf-render",
+                )
+    return _executor
+
+
+async def run_pdf_job(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Ejecuta `fn(*args, **kwargs)` en el pool de PDFs sin bloquear el event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_pdf_executor(), functools.partial(fn, *args, **kwargs))
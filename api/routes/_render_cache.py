@@ -0,0 +1,130 @@
+"""
+Caché de PDFs por contenido para los runs de patch.
+
+Un patch que no cambia el documento (reintentos idempotentes, clone→patch que
+solo toca metadatos) deja el mismo process.md con los mismos assets y branding:
+en vez de volver a correr Pandoc + LaTeX (segundos por PDF) se copia el PDF ya
+generado para ese contenido.
+
+La clave es sha256 de (workspace, markdown, branding con los bytes del logo,
+ruta + bytes de cada asset). Las entradas son copias independientes en
+{output_dir}/_render_cache/ y se podan por último uso al superar
+`RENDER_CACHE_MAX_ENTRIES`. Es solo caché: borrarla (p. ej. el prune de objetos
+flat en storage local) no rompe nada.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Callable
+
+from process_ai_core.config import get_settings
+from process_ai_core.export.branding import PdfBranding
+
+logger = logging.getLogger(__name__)
+
+RENDER_CACHE_MAX_ENTRIES = 256
+
+# Subir cuando cambie la plantilla de export: invalida las entradas previas.
+_RENDER_CACHE_VERSION = b"2"
+
+_HASH_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+
+def _render_cache_dir() -> Path:
+    return Path(get_settings().output_dir) / "_render_cache"
+
+
+def _file_digest(path: Path) -> bytes:
+    """sha256 de los bytes del archivo, leído por bloques (b"-" si no se puede leer)."""
+    h = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+                h.update(block)
+    except OSError:
+        return b"-"
+    return h.digest()
+
+
+def render_cache_key(
+    workspace_id: str,
+    markdown: str,
+    assets_dir: Path,
+    branding: PdfBranding | None,
+) -> str:
+    """sha256 de todo lo que determina el PDF del run."""
+    h = hashlib.sha256(_RENDER_CACHE_VERSION)
+    h.update(workspace_id.encode())
+    h.update(b"\0")
+    h.update(markdown.encode("utf-8"))
+    if branding is not None:
+        h.update(b"\0branding\0")
+        h.update(f"{branding.primary_color}|{branding.secondary_color}".encode())
+        if branding.logo_path:
+            h.update(branding.logo_path.encode())
+            h.update(_file_digest(Path(branding.logo_path)))
+    if assets_dir.is_dir():
+        for asset in sorted(p for p in assets_dir.rglob("*") if p.is_file()):
+            h.update(b"\0asset\0")
+            h.update(asset.relative_to(assets_dir).as_posix().encode())
+            h.update(_file_digest(asset))
+    return h.hexdigest()
+
+
+def _prune_render_cache(cache_dir: Path) -> None:
+    entries = [e for e in os.scandir(cache_dir) if e.name.endswith(".pdf")]
+    if len(entries) <= RENDER_CACHE_MAX_ENTRIES:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime_ns)
+    for entry in entries[: len(entries) - RENDER_CACHE_MAX_ENTRIES]:
+        try:
+            os.unlink(entry.path)
+        except OSError:
+            pass
+
+
+def _copy_atomic(src: Path, dest: Path) -> None:
+    """Copia `src` a `dest` vía temporal + os.replace: nunca se ve un PDF a medio copiar."""
+    tmp = dest.with_name(f".{dest.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dest)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def get_or_render_pdf(key: str, dest: Path, producer: Callable[[], Path]) -> Path:
+    """
+    Copia a `dest` el PDF cacheado para `key` o lo genera con `producer` y guarda
+    una copia en la caché. Son copias y no hardlinks: otros flujos (p. ej.
+    generate_pdf_from_run) reescriben process.pdf en el lugar, y con un inodo
+    compartido eso alteraría la entrada cacheada y los PDFs de otros runs.
+    Los errores de la caché no se propagan: en el peor caso se renderiza como siempre.
+    """
+    cache_dir = _render_cache_dir()
+    cached = cache_dir / f"{key}.pdf"
+    if cached.exists():
+        try:
+            _copy_atomic(cached, dest)
+            # mtime = último uso: la poda descarta primero lo que no se reutiliza.
+            os.utime(cached)
+            logger.info("PDF reutilizado de la caché de render (%s)", key[:12])
+            return dest
+        except OSError as exc:
+            logger.debug("No se pudo reutilizar el PDF cacheado %s: %s", key[:12], exc)
+
+    pdf_path = Path(producer())
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        _copy_atomic(pdf_path, cached)
+        _prune_render_cache(cache_dir)
+    except OSError as exc:
+        logger.debug("No se pudo guardar el PDF en la caché de render: %s", exc)
+    return pdf_path
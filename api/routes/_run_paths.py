@@ -29,10 +29,10 @@ def run_dir_for_run(session: Session, run_id: str) -> Path | None:
     """
     from process_ai_core.db.models import Run, Document
 
-    run = session.query(Run).filter_by(id=run_id).first()
+    run = session.get(Run, run_id)
     if run is None:
         return None
-    doc = session.query(Document).filter_by(id=run.document_id).first()
+    doc = session.get(Document, run.document_id)
     if doc is None:
         return None
     return run_dir(doc.workspace_id, run_id)
@@ -0,0 +1,49 @@
+"""
+Persistencia de uploads (UploadFile) a disco sin cargarlos enteros en memoria.
+
+`await upload.read()` deja el archivo completo en RAM (y luego `write_bytes` lo
+copia), lo que con videos de cientos de MB dispara el pico de memoria del worker.
+Starlette ya spoolea el upload a un archivo temporal (`upload.file`), así que
+alcanza con copiarlo por bloques en el threadpool.
+
+`link_or_copy` cubre el caso de reutilizar insumos de una corrida previa.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import shutil
+from pathlib import Path
+
+from fastapi import UploadFile
+
+# Tamaño del bloque de copia: acota la memoria por archivo independientemente del tamaño.
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+
+def _copy_upload(upload_file: UploadFile, dest: Path) -> None:
+    upload_file.file.seek(0)
+    with open(dest, "wb") as out:
+        shutil.copyfileobj(upload_file.file, out, UPLOAD_CHUNK_SIZE)
+
+
+async def save_upload(upload_file: UploadFile, dest: Path) -> None:
+    """Copia el contenido de `upload_file` a `dest` por bloques, fuera del event loop."""
+    await asyncio.to_thread(_copy_upload, upload_file, dest)
+
+
+def link_or_copy(src: Path, dest: Path) -> None:
+    """
+    Materializa `src` en `dest` con un hardlink (sin copiar bytes) si ambos
+    están en el mismo filesystem; si no (EXDEV, permisos, FS sin hardlinks)
+    cae a `shutil.copyfile`, que en Linux copia en kernel vía sendfile. No hace
+    falta `copy2`: el pipeline solo lee el contenido, no los metadatos (mtime,
+    permisos), y copiarlos son syscalls de más por archivo.
+
+    Solo para archivos que el pipeline lee: `dest` comparte inodo con `src`.
+    """
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copyfile(src, dest)
@@ -11,10 +11,11 @@ El token es generado por el backend al construir la URL del artefacto
 (api/artifact_signing.py) y expira según ARTIFACT_URL_TTL_SECONDS (default: 15 min).
 """
 
+import asyncio
 from pathlib import PurePosixPath
 
 from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import Response
+from fastapi.responses import FileResponse, Response
 
 from process_ai_core.storage import get_storage, normalize_key, run_artifact_key
 from ..artifact_signing import verify_and_extract_workspace
@@ -57,11 +58,16 @@ async def get_artifact(
     except ValueError:
         raise HTTPException(status_code=403, detail="Acceso denegado")
 
+    # Storage en disco (local): FileResponse lo envía con sendfile, sin leer el
+    # archivo a memoria. Remoto: los bytes se descargan en el threadpool.
     storage = get_storage()
-    try:
-        content = storage.get(key)
-    except FileNotFoundError:
-        raise HTTPException(status_code=404, detail=f"Artefacto {filename} no encontrado")
+    path = storage.local_path(key)
+    content = None
+    if path is None:
+        try:
+            content = await asyncio.to_thread(storage.get, key)
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail=f"Artefacto {filename} no encontrado")
 
     # Determinar content-type
     content_type_map = {
@@ -81,26 +87,22 @@ async def get_artifact(
     # Para PDFs, servir inline por defecto (para iframes) o forzar descarga
     if suffix == ".pdf":
         disposition = "attachment" if download else "inline"
-        return Response(
-            content=content,
-            media_type=content_type,
-            headers={
-                "Content-Disposition": f"{disposition}; filename=\"{filename}\"",
-                "Content-Type": "application/pdf",
-                "X-Content-Type-Options": "nosniff",
-                "Cache-Control": "no-cache, no-store, must-revalidate",
-                "Pragma": "no-cache",
-                "Expires": "0",
-            }
-        )
-    
-    # Para otros archivos, servir los bytes (inline o descarga).
-    disposition = "attachment" if download else "inline"
-    return Response(
-        content=content,
-        media_type=content_type,
-        headers={
+        headers = {
+            "Content-Disposition": f"{disposition}; filename=\"{filename}\"",
+            "Content-Type": "application/pdf",
+            "X-Content-Type-Options": "nosniff",
+            "Cache-Control": "no-cache, no-store, must-revalidate",
+            "Pragma": "no-cache",
+            "Expires": "0",
+        }
+    else:
+        # Para otros archivos, servir los bytes (inline o descarga).
+        disposition = "attachment" if download else "inline"
+        headers = {
             "Content-Disposition": f"{disposition}; filename=\"{PurePosixPath(key).name}\"",
-        },
-    )
+        }
+
+    if path is not None:
+        return FileResponse(path, media_type=content_type, headers=headers)
+    return Response(content=content, media_type=content_type, headers=headers)
 
@@ -5,7 +5,9 @@ Se extrajeron del módulo monolítico original (documents.py) para que crud,
 runs, content y versions puedan reutilizarlos sin duplicar lógica.
 """
 
+import functools
 import re
+import threading
 from typing import Optional
 
 from fastapi import HTTPException
@@ -27,21 +29,49 @@ _LATEX_ARTIFACT_RE = re.compile(
 
 def _strip_latex_artifacts(text: str) -> str:
     """Elimina comandos LaTeX que no tienen equivalente HTML y quedarían como texto basura."""
+    # Todos los comandos empiezan con barra invertida: si el texto no tiene ninguna
+    # (el caso normal) no hay nada que sacar, y `in` es un memchr en C.
+    if "\\" not in text:
+        return text
     return _LATEX_ARTIFACT_RE.sub("", text)
 
 
+_MARKDOWN_EXTENSIONS = ["extra", "nl2br", "tables", "sane_lists"]
+# Un conversor por thread: armarlo carga las extensiones y compila sus regex, y
+# una instancia de Markdown no es thread-safe (los GET corren en el threadpool).
+_markdown_local = threading.local()
+
+
+def _markdown_converter():
+    converter = getattr(_markdown_local, "converter", None)
+    if converter is None:
+        import markdown
+        converter = markdown.Markdown(extensions=_MARKDOWN_EXTENSIONS)
+        _markdown_local.converter = converter
+    return converter
+
+
+@functools.lru_cache(maxsize=128)
 def _markdown_to_html(md: str) -> str:
-    """Convierte Markdown a HTML para precarga del editor manual."""
+    """
+    Convierte Markdown a HTML para precarga del editor manual.
+
+    Memoizada por contenido: el editor recarga el mismo DRAFT muchas veces.
+    """
     # Limpiar artefactos LaTeX antes de convertir (no tienen sentido en HTML)
     md = _strip_latex_artifacts(md or "")
     try:
-        import markdown
-        return markdown.markdown(md, extensions=["extra", "nl2br", "tables", "sane_lists"])
+        return _markdown_converter().reset().convert(md)
     except Exception:
         import html as html_mod
         return "".join(f"<p>{html_mod.escape(line)}</p>" for line in md.splitlines())
 
 
+# Solo las rutas relativas a assets/ se reescriben: el resto (http..., /api/v1/...)
+# ni siquiera matchea, así que el callback corre una vez por imagen del run.
+_IMG_SRC_RE = re.compile(r'src="((?:\./)?assets/[^"]*)"')
+
+
 def _rewrite_img_src_to_absolute(
     html_content: str,
     run_id: Optional[str],
@@ -57,26 +87,27 @@ def _rewrite_img_src_to_absolute(
         workspace_id: Cuando se provee, genera URLs firmadas (HMAC). Si es None,
                       genera URLs sin token (solo para compatibilidad legacy).
     """
-    if not html_content:
+    # Sin run solo se reescribirían rutas assets/ (que requieren run_id): nada que hacer.
+    if not html_content or not run_id:
+        return html_content
+    # Caso común (imágenes ya absolutas): una búsqueda de substring y sin regex.
+    if 'src="assets/' not in html_content and 'src="./assets/' not in html_content:
         return html_content
 
     def replace_src(m: re.Match) -> str:
-        src = m.group(1)
-        if src.startswith("http") or src.startswith("/api/v1/"):
-            return m.group(0)
-        if run_id and (src.startswith("assets/") or src.startswith("./assets/")):
-            clean = src.lstrip("./")
-            if workspace_id:
-                signed = sign_artifact_url(run_id, clean, workspace_id)
-                return f'src="{api_base}{signed}"'
-            return f'src="{api_base}/api/v1/artifacts/{run_id}/{clean}"'
-        return m.group(0)
+        clean = m.group(1).lstrip("./")
+        if workspace_id:
+            signed = sign_artifact_url(run_id, clean, workspace_id)
+            return f'src="{api_base}{signed}"'
+        return f'src="{api_base}/api/v1/artifacts/{run_id}/{clean}"'
 
-    return re.sub(r'src="([^"]+)"', replace_src, html_content)
+    return _IMG_SRC_RE.sub(replace_src, html_content)
 
 
+# El lookahead `(?=[a-z])` descarta de entrada los "<" sueltos del markdown
+# ("a < b", "<-"): sin él el motor prueba las 20 alternativas en cada uno.
 _HTML_BLOCK_RE = re.compile(
-    r"<(?:h[1-6]|p|ul|ol|li|strong|em|b|i|table|img|div|span|a|br|hr|blockquote|pre|code)\b",
+    r"<(?=[a-z])(?:h[1-6]|p|ul|ol|li|strong|em|b|i|table|img|div|span|a|br|hr|blockquote|pre|code)\b",
     re.IGNORECASE,
 )
 
@@ -87,7 +118,9 @@ def _is_valid_html(text: str) -> bool:
     HTML generado por python-markdown o Tiptap siempre las tiene.
     Markdown crudo nunca las tiene.
     """
-    return bool(_HTML_BLOCK_RE.search(text or ""))
+    if not text or "<" not in text:
+        return False
+    return _HTML_BLOCK_RE.search(text) is not None
 
 
 def _looks_like_markdown(text: str) -> bool:
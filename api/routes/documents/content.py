@@ -5,28 +5,39 @@ Edición de contenido de un documento:
 - Patch asistido por IA a partir de observaciones de validación.
 """
 
-import json
+import asyncio
 import logging
+import os
+import threading
+import orjson
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 from fastapi import APIRouter, BackgroundTasks, Body, Depends, File, HTTPException, UploadFile
-from fastapi.responses import Response
+from fastapi.responses import FileResponse, Response
 
 from process_ai_core.db.database import get_db_session
 from process_ai_core.db.models import Document
 from process_ai_core.db.helpers import (
+    check_version_immutable,
     create_audit_log,
     get_editable_version,
     get_in_review_version,
     get_or_create_draft,
 )
 from process_ai_core.config import get_settings
+from process_ai_core.domains.processes.builder import ProcessBuilder
+from process_ai_core.domains.processes.profiles import get_profile
+from process_ai_core.domains.processes.renderer import ProcessRenderer
 from process_ai_core.export import export_pdf_from_content
 
 from api.routes._branding import get_workspace_pdf_branding
+from api.routes._pdf_pool import run_pdf_job
+from api.routes._render_cache import get_or_render_pdf, render_cache_key
+from api.routes._uploads import link_or_copy
 from api.routes._run_paths import run_dir as _run_dir
-from api.artifact_signing import sign_artifact_url
+from api.artifact_signing import sign_run_artifact_urls
 from api.dependencies import get_current_user_id
 from api.workspace_client import (
     WorkspaceSessionContext,
@@ -46,11 +57,15 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Builder y renderer no guardan estado entre llamadas: una instancia por proceso.
+_BUILDER = ProcessBuilder()
+_RENDERER = ProcessRenderer()
+
 
 @router.put("/{document_id}/content")
 async def update_document_content(
     document_id: str,
-    content_json: str = Body(..., embed=True),
+    content_json: Union[str, dict] = Body(..., embed=True),
     user_id: str = Depends(get_current_user_id),
     ctx: WorkspaceSessionContext = Depends(get_workspace_context),
 ):
@@ -63,13 +78,20 @@ async def update_document_content(
 
     Args:
         document_id: ID del documento
-        content_json: JSON del documento editado (ProcessDocument en formato JSON)
+        content_json: Documento editado (ProcessDocument): objeto JSON, o el mismo
+            objeto serializado como string (formato histórico de la UI)
 
     Returns:
         DocumentVersion creada o actualizada
     """
+    from sqlalchemy.orm import with_polymorphic
+    from process_ai_core.db.models import Process
+
     with get_db_session() as session:
-        doc = session.query(Document).filter_by(id=document_id).first()
+        # with_polymorphic: las columnas de Process (audience) llegan en el mismo
+        # SELECT del documento, sin un segundo round trip para el render.
+        doc_entity = with_polymorphic(Document, [Process])
+        doc = session.query(doc_entity).filter(doc_entity.id == document_id).first()
         if not doc:
             raise HTTPException(
                 status_code=404,
@@ -91,7 +113,6 @@ async def update_document_content(
             )
 
         # Verificar inmutabilidad (bloquea solo si hay IN_REVIEW)
-        from process_ai_core.db.helpers import check_version_immutable, get_or_create_draft
         is_immutable, reason = check_version_immutable(session, document_id)
         if is_immutable:
             raise HTTPException(
@@ -115,21 +136,18 @@ async def update_document_content(
 
         # Validar y parsear JSON
         try:
-            from process_ai_core.domains.processes.builder import ProcessBuilder
-            builder = ProcessBuilder()
-            process_doc = builder.parse_document(content_json)
+            process_doc = _BUILDER.parse_document(content_json)
         except Exception as e:
             raise HTTPException(
                 status_code=400,
                 detail=f"JSON inválido: {str(e)}"
             )
+        if isinstance(content_json, dict):
+            content_json = orjson.dumps(content_json).decode("utf-8")
 
         # Renderizar Markdown
-        from process_ai_core.domains.processes.renderer import ProcessRenderer
-        from process_ai_core.domains.processes.profiles import get_profile
-        from process_ai_core.db.models import Process
-
-        process = session.query(Process).filter_by(id=document_id).first()
+        # Ya cargado arriba (domain == "process" ⇒ instancia de Process).
+        process = doc if isinstance(doc, Process) else None
         if not process:
             raise HTTPException(
                 status_code=404,
@@ -137,9 +155,7 @@ async def update_document_content(
             )
 
         profile = get_profile(process.audience or "operativo")
-        renderer = ProcessRenderer()
-
-        markdown = renderer.render_markdown(
+        markdown = _RENDERER.render_markdown(
             document=process_doc,
             profile=profile,
             images_by_step={},
@@ -152,7 +168,6 @@ async def update_document_content(
         draft_version.content_type = "manual_edit"
 
         # Crear audit log
-        from process_ai_core.db.helpers import create_audit_log
         create_audit_log(
             session=session,
             document_id=document_id,
@@ -160,9 +175,9 @@ async def update_document_content(
             action="version.draft_updated",
             entity_type="version",
             entity_id=draft_version.id,
-            metadata_json=json.dumps({
+            metadata_json=orjson.dumps({
                 "version_number": draft_version.version_number,
-            }),
+            }).decode("utf-8"),
         )
 
         session.commit()
@@ -187,7 +202,7 @@ async def get_editable_content(
     Si no hay DRAFT, se obtiene o crea uno. Si no hay content_html, se genera desde content_markdown.
     """
     with get_db_session() as session:
-        doc = session.query(Document).filter_by(id=document_id).first()
+        doc = session.get(Document, document_id)
         if not doc:
             raise HTTPException(status_code=404, detail="Documento no encontrado")
         _assert_doc_in_active_workspace(doc.workspace_id, resolve_tenant_workspace_id(ctx), document_id)
@@ -199,7 +214,6 @@ async def get_editable_content(
         if doc.domain != "process":
             raise HTTPException(status_code=400, detail="Solo documentos de tipo process soportan edición manual")
 
-        from process_ai_core.db.helpers import check_version_immutable
         is_immutable, reason = check_version_immutable(session, document_id)
         if is_immutable:
             raise HTTPException(status_code=400, detail=reason)
@@ -249,6 +263,23 @@ async def get_editable_content(
         }
 
 
+def _draft_pdf_dir(
+    run_id: Optional[str],
+    document_id: str,
+    workspace_id: Optional[str],
+    output_dir: str,
+) -> Path:
+    """Directorio de draft_preview.pdf: el del run si existe, si no el del documento."""
+    if run_id and workspace_id:
+        candidate = _run_dir(workspace_id, run_id)
+        if candidate.exists():
+            return candidate
+    base = Path(output_dir)
+    if workspace_id:
+        base = base / "workspaces" / workspace_id
+    return base / "documents" / document_id
+
+
 def _generate_draft_pdf_background(
     content_html: str,
     run_id: Optional[str],
@@ -263,17 +294,8 @@ def _generate_draft_pdf_background(
         branding = None
         with get_db_session() as session:
             branding = get_workspace_pdf_branding(session, workspace_id)
-        pdf_dir: Optional[Path] = None
-        if run_id and workspace_id:
-            candidate = _run_dir(workspace_id, run_id)
-            if candidate.exists():
-                pdf_dir = candidate
-        if pdf_dir is None:
-            base = Path(output_dir)
-            if workspace_id:
-                base = base / "workspaces" / workspace_id
-            pdf_dir = base / "documents" / document_id
-            pdf_dir.mkdir(parents=True, exist_ok=True)
+        pdf_dir = _draft_pdf_dir(run_id, document_id, workspace_id, output_dir)
+        pdf_dir.mkdir(parents=True, exist_ok=True)
 
         # Evita servir un PDF viejo si esta generación falla.
         stale_pdf = pdf_dir / "draft_preview.pdf"
@@ -302,6 +324,44 @@ def _generate_draft_pdf_background(
         logger.warning("No se pudo guardar el PDF del borrador en background: %s", exc)
 
 
+# Autosave del editor: un worker por documento que renderiza sólo el último HTML.
+# La clave existe mientras hay un worker dueño del documento; el valor es el job
+# pendiente (None si no llegó nada nuevo desde el último render).
+_DRAFT_PDF_DEBOUNCE_S = 1.0
+_draft_pdf_jobs: dict[str, Optional[dict]] = {}
+_draft_pdf_lock = threading.Lock()
+
+
+def _enqueue_draft_pdf(document_id: str, job: dict) -> bool:
+    """Registra el último job del documento. True si hay que lanzar un worker."""
+    with _draft_pdf_lock:
+        owned = document_id in _draft_pdf_jobs
+        _draft_pdf_jobs[document_id] = job
+    return not owned
+
+
+async def _draft_pdf_worker(document_id: str) -> None:
+    """
+    Espera la ventana de debounce y renderiza el job más reciente; repite
+    mientras sigan llegando guardados. Los renders de un documento quedan
+    serializados y los intermedios se descartan.
+    """
+    try:
+        while True:
+            await asyncio.sleep(_DRAFT_PDF_DEBOUNCE_S)
+            with _draft_pdf_lock:
+                job = _draft_pdf_jobs.get(document_id)
+                if job is None:
+                    _draft_pdf_jobs.pop(document_id, None)
+                    return
+                _draft_pdf_jobs[document_id] = None
+            await run_pdf_job(_generate_draft_pdf_background, **job)
+    except BaseException:
+        with _draft_pdf_lock:
+            _draft_pdf_jobs.pop(document_id, None)
+        raise
+
+
 @router.put("/{document_id}/editable")
 async def save_editable_content(
     document_id: str,
@@ -314,7 +374,7 @@ async def save_editable_content(
     Guarda el HTML del editor manual en la versión DRAFT (borrador).
     """
     with get_db_session() as session:
-        doc = session.query(Document).filter_by(id=document_id).first()
+        doc = session.get(Document, document_id)
         if not doc:
             raise HTTPException(status_code=404, detail="Documento no encontrado")
         _assert_doc_in_active_workspace(doc.workspace_id, resolve_tenant_workspace_id(ctx), document_id)
@@ -326,7 +386,6 @@ async def save_editable_content(
         if doc.domain != "process":
             raise HTTPException(status_code=400, detail="Solo documentos de tipo process")
 
-        from process_ai_core.db.helpers import check_version_immutable
         is_immutable, reason = check_version_immutable(session, document_id)
         if is_immutable:
             raise HTTPException(status_code=400, detail=reason)
@@ -351,6 +410,19 @@ async def save_editable_content(
                 detail="Se esperaba HTML; el contenido parece markdown o texto crudo. Guarda desde el editor visual.",
             )
 
+        # Autosave sin cambios: el PDF de este mismo HTML ya se generó en un guardado
+        # anterior. Se exige que el archivo exista: si ese render falló (el PDF viejo
+        # se borra antes de renderizar) o el borrador nunca tuvo preview, se genera.
+        settings = get_settings()
+        pdf_up_to_date = (
+            draft.content_type == "manual_edit"
+            and draft.content_html == content_html
+            and (
+                _draft_pdf_dir(
+                    getattr(draft, "run_id", None), document_id, doc.workspace_id, settings.output_dir
+                ) / "draft_preview.pdf"
+            ).exists()
+        )
         draft.content_html = content_html
         draft.content_type = "manual_edit"
         draft_run_id = getattr(draft, "run_id", None)
@@ -363,23 +435,24 @@ async def save_editable_content(
             action="manual_edit_saved",
             entity_type="version",
             entity_id=draft_id,
-            metadata_json=json.dumps({"version_number": draft_version_number}),
+            metadata_json=orjson.dumps({"version_number": draft_version_number}).decode("utf-8"),
         )
         session.commit()
         from datetime import datetime, timezone
         now_iso = datetime.now(timezone.utc).isoformat()
 
         # Generar PDF en segundo plano para no bloquear la respuesta
-        settings = get_settings()
-        background_tasks.add_task(
-            _generate_draft_pdf_background,
-            content_html=content_html,
-            run_id=draft_run_id,
-            document_id=document_id,
-            workspace_id=doc.workspace_id,
-            output_dir=settings.output_dir,
-            api_base=settings.api_base_url.rstrip("/"),
-        )
+        if not pdf_up_to_date:
+            job = dict(
+                content_html=content_html,
+                run_id=draft_run_id,
+                document_id=document_id,
+                workspace_id=doc.workspace_id,
+                output_dir=settings.output_dir,
+                api_base=settings.api_base_url.rstrip("/"),
+            )
+            if _enqueue_draft_pdf(document_id, job):
+                background_tasks.add_task(_draft_pdf_worker, document_id)
 
         return {
             "version_id": draft_id,
@@ -404,7 +477,7 @@ async def upload_editor_image(
         raise HTTPException(status_code=400, detail="Solo se permiten archivos de imagen")
 
     with get_db_session() as session:
-        doc = session.query(Document).filter_by(id=document_id).first()
+        doc = session.get(Document, document_id)
         if not doc:
             raise HTTPException(status_code=404, detail="Documento no encontrado")
         _assert_doc_in_active_workspace(doc.workspace_id, resolve_tenant_workspace_id(ctx), document_id)
@@ -423,8 +496,16 @@ async def upload_editor_image(
     from process_ai_core.storage import get_storage, workspace_prefix
     key = f"{workspace_prefix(doc_workspace_id)}/editor-uploads/{document_id}/{name}"
     try:
-        contents = await file.read()
-        get_storage().put(key, contents, content_type=file.content_type or "image/png")
+        # Desde el archivo temporal del upload, en el threadpool: en disco se copia
+        # por bloques (sin cargar la imagen entera en memoria) y la subida al bucket
+        # no bloquea el event loop.
+        await file.seek(0)
+        await asyncio.to_thread(
+            get_storage().put_fileobj,
+            key,
+            file.file,
+            content_type=file.content_type or "image/png",
+        )
     except Exception as e:
         logger.exception("Error guardando imagen del editor")
         raise HTTPException(status_code=500, detail="Error al guardar la imagen") from e
@@ -439,18 +520,16 @@ async def get_editor_image(document_id: str, filename: str):
     if ".." in filename or "/" in filename or "\\" in filename:
         raise HTTPException(status_code=400, detail="Nombre de archivo no válido")
 
+    # Solo el workspace_id (sin cargar el documento completo).
     with get_db_session() as session:
-        doc = session.query(Document).filter_by(id=document_id).first()
-        if not doc:
-            raise HTTPException(status_code=404, detail="Imagen no encontrada")
-        doc_workspace_id = doc.workspace_id
+        doc_workspace_id = (
+            session.query(Document.workspace_id).filter(Document.id == document_id).scalar()
+        )
+    if doc_workspace_id is None:
+        raise HTTPException(status_code=404, detail="Imagen no encontrada")
 
     from process_ai_core.storage import get_storage, workspace_prefix
     key = f"{workspace_prefix(doc_workspace_id)}/editor-uploads/{document_id}/{filename}"
-    try:
-        content = get_storage().get(key)
-    except FileNotFoundError:
-        raise HTTPException(status_code=404, detail="Imagen no encontrada")
 
     from pathlib import PurePosixPath
     ctype_map = {
@@ -458,438 +537,634 @@ async def get_editor_image(document_id: str, filename: str):
         ".gif": "image/gif", ".webp": "image/webp",
     }
     media_type = ctype_map.get(PurePosixPath(filename).suffix.lower(), "application/octet-stream")
-    return Response(content=content, media_type=media_type, headers={
+    # El nombre es un uuid que nunca se reescribe: el navegador puede cachearla
+    # sin revalidar en cada carga del editor.
+    headers = {
         "Content-Disposition": f'inline; filename="{filename}"',
-    })
+        "Cache-Control": "private, max-age=31536000, immutable",
+    }
 
+    # Storage en disco (local): FileResponse la envía con sendfile y su propio
+    # ETag/Last-Modified. Remoto: los bytes se descargan en el threadpool.
+    storage = get_storage()
+    path = storage.local_path(key)
+    if path is not None:
+        return FileResponse(path, media_type=media_type, headers=headers)
+    try:
+        content = await asyncio.to_thread(storage.get, key)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Imagen no encontrada")
+    return Response(content=content, media_type=media_type, headers=headers)
 
-@router.post("/{document_id}/patch")
-async def patch_document_with_ai(
+
+# El patch por IA corre en fases que no comparten recursos:
+#   1. _load_patch_base: sesión de DB corta + lectura del JSON base → _PatchBase.
+#   2. LLM: sin sesión abierta (decenas de segundos). En paralelo,
+#      _prepare_patch_run_dir crea el run nuevo en disco y clona los assets.
+#   3. _write_patch_artifacts: render + disco + storage, sin sesión de DB.
+#   4. _persist_patch_run: sesión nueva solo para crear run/draft/auditoría.
+#   5. _export_patch_pdf_background: PDF después de responder (BackgroundTasks).
+# Las fases síncronas corren en el threadpool (asyncio.to_thread).
+
+
+@dataclass(frozen=True)
+class _PatchBase:
+    """Resultado de la fase de lectura del patch (valores planos, sin ORM)."""
+
+    base_json: str
+    process_audience: str
+    document_name: str
+    workspace_id: str
+    run_id: str | None
+
+
+def _load_patch_base(
     document_id: str,
-    observations: str = Body(..., embed=True),
-    run_id: str | None = Body(None, embed=True),
-    user_id: str = Depends(get_current_user_id),
-    ctx: WorkspaceSessionContext = Depends(get_workspace_context),
-):
+    run_id: str | None,
+    user_id: str,
+    ctx: WorkspaceSessionContext,
+) -> _PatchBase:
     """
-    Aplica un patch por IA usando observaciones de validación.
+    Fase de lectura del patch (DB + disco): valida acceso y devuelve el JSON
+    base, la audiencia, el nombre y el workspace del documento y el run base.
+    """
+    from sqlalchemy import select
+    from sqlalchemy.orm import with_polymorphic
+    from process_ai_core.db.models import Process, Run, DocumentVersion
 
-    Toma el documento actual (última versión aprobada o último run) y aplica
-    las correcciones indicadas en las observaciones usando el LLM.
+    with get_db_session() as session:
+        # Una sola query: documento + columnas de Process (LEFT JOIN) + id del run
+        # base (el pedido o el último) como subquery correlacionada.
+        doc_entity = with_polymorphic(Document, [Process])
+        base_run_query = select(Run.id).where(Run.document_id == doc_entity.id)
+        if run_id:
+            base_run_query = base_run_query.where(Run.id == run_id)
+        base_run_id_sq = (
+            base_run_query.order_by(Run.created_at.desc()).limit(1).scalar_subquery()
+        )
+        row = (
+            session.query(doc_entity, base_run_id_sq)
+            .filter(doc_entity.id == document_id)
+            .first()
+        )
+        doc, base_run_id = row if row else (None, None)
+        if not doc:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Documento {document_id} no encontrado"
+            )
+        _assert_doc_in_active_workspace(doc.workspace_id, resolve_tenant_workspace_id(ctx), document_id)
 
-    Args:
-        document_id: ID del documento
-        observations: Observaciones del validador con correcciones a aplicar
-        run_id: ID del run a corregir (opcional, si no se especifica usa el último run)
+        from process_ai_core.db.permissions import can_create_in_folder
+        if not can_create_in_folder(session, user_id, doc.workspace_id, doc.folder_id):
+            raise HTTPException(
+                status_code=403,
+                detail="No tiene acceso para modificar documentos en esta carpeta"
+            )
+        # Límite de almacenamiento del plan (no enforce si no hay suscripción/plan).
+        from process_ai_core.db.helpers import enforce_storage_limit
+        storage_error = enforce_storage_limit(session, doc.workspace_id)
+        if storage_error:
+            raise HTTPException(status_code=402, detail=storage_error)
 
-    Returns:
-        ProcessRunResponse con el nuevo run_id y artifacts
-    """
-    try:
-        logger.info(f"Patch por IA iniciado para documento {document_id}, run_id={run_id}")
+        if doc.domain != "process":
+            raise HTTPException(
+                status_code=400,
+                detail="Este endpoint solo funciona para documentos de tipo 'process'"
+            )
 
-        with get_db_session() as session:
-            doc = session.query(Document).filter_by(id=document_id).first()
-            if not doc:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"Documento {document_id} no encontrado"
-                )
-            _assert_doc_in_active_workspace(doc.workspace_id, resolve_tenant_workspace_id(ctx), document_id)
+        # Obtener el documento actual para corregir
+        # Prioridad: último run > última versión aprobada
+        process = doc if isinstance(doc, Process) else None
+        if not process:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Process {document_id} no encontrado"
+            )
 
-            from process_ai_core.db.permissions import can_create_in_folder
-            if not can_create_in_folder(session, user_id, doc.workspace_id, doc.folder_id):
-                raise HTTPException(
-                    status_code=403,
-                    detail="No tiene acceso para modificar documentos en esta carpeta"
-                )
-            # Límite de almacenamiento del plan (no enforce si no hay suscripción/plan).
-            from process_ai_core.db.helpers import enforce_storage_limit
-            storage_error = enforce_storage_limit(session, doc.workspace_id)
-            if storage_error:
-                raise HTTPException(status_code=402, detail=storage_error)
+        # Guardar valores necesarios antes de salir del contexto
+        process_audience = process.audience or "operativo"
+        document_name = doc.name
+        patch_workspace_id = doc.workspace_id
+        logger.info(f"Documento encontrado: {document_name}, audience: {process_audience}")
 
-            if doc.domain != "process":
+        # Determinar qué documento usar como base
+        base_json = None
+
+        if run_id:
+            # Usar el run específico
+            if not base_run_id:
                 raise HTTPException(
-                    status_code=400,
-                    detail="Este endpoint solo funciona para documentos de tipo 'process'"
+                    status_code=404,
+                    detail=f"Run {run_id} no encontrado"
                 )
 
-            # Obtener el documento actual para corregir
-            # Prioridad: último run > última versión aprobada
-            from process_ai_core.db.models import Process, Run, DocumentVersion
+            run_dir = _run_dir(patch_workspace_id, run_id)
+            json_path = run_dir / "process.json"
 
-            process = session.query(Process).filter_by(id=document_id).first()
-            if not process:
+            if not json_path.exists():
                 raise HTTPException(
                     status_code=404,
-                    detail=f"Process {document_id} no encontrado"
+                    detail=f"JSON del run {run_id} no encontrado"
                 )
 
-            # Guardar valores necesarios antes de salir del contexto
-            process_audience = process.audience or "operativo"
-            document_name = doc.name
-            patch_workspace_id = doc.workspace_id
-            logger.info(f"Documento encontrado: {document_name}, audience: {process_audience}")
-
-            # Determinar qué documento usar como base
-            base_json = None
-            base_markdown = None
-
-            if run_id:
-                # Usar el run específico
-                run = session.query(Run).filter_by(id=run_id, document_id=document_id).first()
-                if not run:
-                    raise HTTPException(
-                        status_code=404,
-                        detail=f"Run {run_id} no encontrado"
-                    )
-
-                run_dir = _run_dir(patch_workspace_id, run_id)
-                json_path = run_dir / "process.json"
+            base_json = json_path.read_text(encoding="utf-8")
+        else:
+            # Usar último run o última versión aprobada
+            last_run_id = base_run_id
 
-                if not json_path.exists():
-                    raise HTTPException(
-                        status_code=404,
-                        detail=f"JSON del run {run_id} no encontrado"
-                    )
+            if last_run_id:
+                run_dir = _run_dir(patch_workspace_id, last_run_id)
+                json_path = run_dir / "process.json"
 
-                base_json = json_path.read_text(encoding="utf-8")
+                if json_path.exists():
+                    base_json = json_path.read_text(encoding="utf-8")
+                    run_id = last_run_id
             else:
-                # Usar último run o última versión aprobada
-                last_run = session.query(Run).filter_by(document_id=document_id).order_by(Run.created_at.desc()).first()
-
-                if last_run:
-                    run_dir = _run_dir(patch_workspace_id, last_run.id)
-                    json_path = run_dir / "process.json"
-
-                    if json_path.exists():
-                        base_json = json_path.read_text(encoding="utf-8")
-                        run_id = last_run.id
-                else:
-                    # Usar última versión aprobada
-                    last_version = (
-                        session.query(DocumentVersion)
-                        .filter_by(document_id=document_id, is_current=True)
-                        .first()
-                    )
-
-                    if last_version:
-                        base_json = last_version.content_json
-                        base_markdown = last_version.content_markdown
-
-            if not base_json:
-                logger.error(f"No se encontró documento base para {document_id}")
-                raise HTTPException(
-                    status_code=404,
-                    detail="No se encontró documento base para corregir. Crea un run primero."
+                # Usar última versión aprobada
+                base_json = (
+                    session.query(DocumentVersion.content_json)
+                    .filter_by(document_id=document_id, is_current=True)
+                    .limit(1)
+                    .scalar()
                 )
 
-            logger.info(f"Documento base encontrado, tamaño: {len(base_json)} caracteres")
+        if not base_json:
+            logger.error(f"No se encontró documento base para {document_id}")
+            raise HTTPException(
+                status_code=404,
+                detail="No se encontró documento base para corregir. Crea un run primero."
+            )
 
-        # Construir prompt para patch (fuera del contexto de sesión)
-        patch_prompt = f"""=== DOCUMENTO ACTUAL ===
-{base_json}
+    # process.json se escribe indentado: compacto, el documento ocupa bastantes
+    # menos tokens de entrada en el prompt del patch. Si no parsea, va tal cual.
+    try:
+        base_json = orjson.dumps(orjson.loads(base_json)).decode("utf-8")
+    except orjson.JSONDecodeError:
+        pass
+    logger.info(f"Documento base encontrado, tamaño: {len(base_json)} caracteres")
 
-=== OBSERVACIONES DE VALIDACIÓN ===
-{observations}
+    return _PatchBase(
+        base_json=base_json,
+        process_audience=process_audience,
+        document_name=document_name,
+        workspace_id=patch_workspace_id,
+        run_id=run_id,
+    )
 
-=== INSTRUCCIONES ===
-Aplica las correcciones indicadas en las observaciones al documento actual.
-Mantén la estructura JSON y solo modifica los campos necesarios según las observaciones.
-Responde SOLO con el JSON corregido, sin texto adicional.
-"""
 
-        logger.info("Llamando al LLM para generar documento corregido...")
+_PATCH_IMAGE_EXTS = frozenset({".png", ".jpg", ".jpeg", ".webp"})
 
-        # Llamar al LLM para generar el documento corregido. El helper valida la
-        # estructura y reintenta una vez si el modelo devuelve un JSON inservible.
-        from process_ai_core.engine import generate_validated_document_json
-        from process_ai_core.domains.processes.builder import ProcessBuilder
 
-        builder = ProcessBuilder()
-        system_prompt = builder.get_system_prompt()
+def _scan_image_entries(dir_path: str, rel_prefix: str) -> list[dict]:
+    """Imágenes (archivos con extensión soportada) de un directorio, sin recursión."""
+    images = []
+    with os.scandir(dir_path) as it:
+        for entry in it:
+            stem, ext = os.path.splitext(entry.name)
+            if ext.lower() in _PATCH_IMAGE_EXTS and entry.is_file():
+                images.append({"path": f"{rel_prefix}/{entry.name}", "title": stem})
+    return images
 
-        try:
-            corrected_json = generate_validated_document_json(
-                builder=builder,
-                prompt=patch_prompt,
-                system_prompt=system_prompt,
-            )
-            logger.info("Documento corregido generado y validado exitosamente")
-        except Exception as e:
-            logger.error(f"Error al generar documento corregido: {e}", exc_info=True)
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error al generar documento corregido: {str(e)}"
+
+def _scan_patch_images(assets_dir: Path) -> tuple[dict[int, list[dict]], list[dict]]:
+    """
+    Recorre assets/ de un run: (imágenes por paso de assets/step_N/, imágenes de
+    assets/evidence/). Un solo os.scandir por directorio; el tipo de cada entrada
+    sale del listado, sin un stat por archivo como con Path.glob.
+    """
+    images_by_step: dict[int, list[dict]] = {}
+    evidence_images: list[dict] = []
+    with os.scandir(assets_dir) as it:
+        entries = [e for e in it if e.is_dir()]
+    for entry in entries:
+        if entry.name == "evidence":
+            evidence_images = _scan_image_entries(entry.path, "assets/evidence")
+        elif entry.name.startswith("step_"):
+            try:
+                step_num = int(entry.name.split("_")[1])
+            except (ValueError, IndexError):
+                continue
+            step_images = _scan_image_entries(entry.path, f"assets/{entry.name}")
+            if step_images:
+                images_by_step[step_num] = step_images
+    return images_by_step, evidence_images
+
+
+def _prepare_patch_run_dir(
+    patch_workspace_id: str,
+    base_run_id: str | None,
+) -> tuple[str, dict[int, list[dict]], list[dict]]:
+    """
+    Fase de preparación del run nuevo: id, directorio y assets del run base.
+
+    No depende de la respuesta del LLM, así que corre en paralelo con esa llamada.
+    Devuelve (new_run_id, imágenes por paso, imágenes de evidencia).
+    """
+    import uuid
+    import shutil
+
+    # Generar run_id antes de crear en BD
+    new_run_id = str(uuid.uuid4())
+    new_run_dir = _run_dir(patch_workspace_id, new_run_id)
+    new_run_dir.mkdir(parents=True, exist_ok=True)
+
+    # Obtener imágenes del run original si existe
+    images_by_step = {}
+    evidence_images = []
+
+    if base_run_id:
+        original_run_dir = _run_dir(patch_workspace_id, base_run_id)
+        original_assets_dir = original_run_dir / "assets"
+
+        if original_assets_dir.exists():
+            logger.info(f"Copiando imágenes del run original {base_run_id}...")
+            # Clonar el directorio de assets al nuevo run con hardlinks: son salidas
+            # inmutables del run original, así que no hace falta copiar los bytes
+            # (link_or_copy cae a copia si el hardlink no es posible).
+            new_assets_dir = new_run_dir / "assets"
+            shutil.copytree(
+                original_assets_dir,
+                new_assets_dir,
+                dirs_exist_ok=True,
+                copy_function=link_or_copy,
             )
+            logger.info(f"Imágenes copiadas a {new_assets_dir}")
 
-        # Reparsear para obtener el modelo de dominio (ya validado por el helper).
-        process_doc = builder.parse_document(corrected_json)
+            # Imágenes por paso y de evidencia, desde el directorio copiado. Si falla,
+            # las imágenes físicas igual están: el renderer funciona sin metadatos.
+            try:
+                images_by_step, evidence_images = _scan_patch_images(new_assets_dir)
+            except Exception as e:
+                logger.warning(f"No se pudieron leer metadatos de imágenes del run original: {e}")
 
-        from process_ai_core.domains.processes.renderer import ProcessRenderer
-        from process_ai_core.domains.processes.profiles import get_profile
-        from process_ai_core.db.helpers import create_run, update_document_status
-        from process_ai_core.config import get_settings
-        from process_ai_core.export import export_pdf
-        import uuid
-        import shutil
+    return new_run_id, images_by_step, evidence_images
 
-        # Generar run_id antes de crear en BD
-        new_run_id = str(uuid.uuid4())
-        settings = get_settings()
-        new_run_dir = _run_dir(patch_workspace_id, new_run_id)
-        new_run_dir.mkdir(parents=True, exist_ok=True)
 
-        # Obtener imágenes del run original si existe
-        images_by_step = {}
-        evidence_images = []
+async def _discard_patch_run_dir(prepare_task: asyncio.Future, patch_workspace_id: str) -> None:
+    """Si el patch falla después de preparar el run, borra su directorio (best-effort)."""
+    import shutil
 
-        if run_id:
-            original_run_dir = _run_dir(patch_workspace_id, run_id)
-            original_assets_dir = original_run_dir / "assets"
-
-            if original_assets_dir.exists():
-                logger.info(f"Copiando imágenes del run original {run_id}...")
-                # Copiar directorio de assets completo al nuevo run
-                new_assets_dir = new_run_dir / "assets"
-                if original_assets_dir.exists():
-                    shutil.copytree(original_assets_dir, new_assets_dir, dirs_exist_ok=True)
-                    logger.info(f"Imágenes copiadas a {new_assets_dir}")
-
-                # Intentar leer el resultado del run original para obtener metadatos de imágenes
-                # Si no está disponible, al menos las imágenes físicas están copiadas
-                try:
-                    # Buscar imágenes en el directorio copiado
-                    evidence_dir = new_assets_dir / "evidence"
-                    if evidence_dir.exists():
-                        for img_file in evidence_dir.glob("*"):
-                            if img_file.is_file() and img_file.suffix.lower() in ['.png', '.jpg', '.jpeg', '.webp']:
-                                rel_path = f"assets/evidence/{img_file.name}"
-                                evidence_images.append({
-                                    "path": rel_path,
-                                    "title": img_file.stem
-                                })
-
-                    # Buscar imágenes por paso (estructura: assets/step_N/...)
-                    for step_dir in new_assets_dir.glob("step_*"):
-                        if step_dir.is_dir():
-                            try:
-                                step_num = int(step_dir.name.split("_")[1])
-                                step_images = []
-                                for img_file in step_dir.glob("*"):
-                                    if img_file.is_file() and img_file.suffix.lower() in ['.png', '.jpg', '.jpeg', '.webp']:
-                                        rel_path = f"assets/{step_dir.name}/{img_file.name}"
-                                        step_images.append({
-                                            "path": rel_path,
-                                            "title": img_file.stem
-                                        })
-                                if step_images:
-                                    images_by_step[step_num] = step_images
-                            except (ValueError, IndexError):
-                                continue
-                except Exception as e:
-                    logger.warning(f"No se pudieron leer metadatos de imágenes del run original: {e}")
-                    # Las imágenes están copiadas, pero no tenemos metadatos
-                    # El renderer puede funcionar sin metadatos si las imágenes están en las rutas correctas
-
-        profile = get_profile(process_audience)
-        renderer = ProcessRenderer()
-
-        logger.info(f"Renderizando markdown con {len(images_by_step)} pasos con imágenes y {len(evidence_images)} imágenes de evidencia...")
-        markdown = renderer.render_markdown(
-            document=process_doc,
-            profile=profile,
-            images_by_step=images_by_step,
-            evidence_images=evidence_images,
-            output_base=new_run_dir,
-        )
+    try:
+        new_run_id, _, _ = await prepare_task
+    except Exception:
+        return
+    await asyncio.to_thread(shutil.rmtree, _run_dir(patch_workspace_id, new_run_id), True)
+
+
+def _write_patch_artifacts(
+    patch_workspace_id: str,
+    new_run_id: str,
+    images_by_step: dict[int, list[dict]],
+    evidence_images: list[dict],
+    process_audience: str,
+    corrected_json: str,
+) -> tuple[str, str]:
+    """
+    Fase de escritura del patch (render + disco + storage) sobre el run preparado.
 
-        logger.info("Creando nuevo run...")
+    Devuelve (corrected_json con assets, markdown).
+    """
+    # Un solo parse: el dict alimenta al modelo de dominio y al JSON final con assets.
+    corrected_data = orjson.loads(corrected_json)
+    process_doc = _BUILDER.parse_document(corrected_data)
+    new_run_dir = _run_dir(patch_workspace_id, new_run_id)
 
-        # Guardar artifacts en disco primero
-        settings = get_settings()
-        output_dir = _run_dir(patch_workspace_id, new_run_id)
-        output_dir.mkdir(parents=True, exist_ok=True)
+    profile = get_profile(process_audience)
 
-        json_path = output_dir / "process.json"
-        md_path = output_dir / "process.md"
+    logger.info(f"Renderizando markdown con {len(images_by_step)} pasos con imágenes y {len(evidence_images)} imágenes de evidencia...")
+    markdown = _RENDERER.render_markdown(
+        document=process_doc,
+        profile=profile,
+        images_by_step=images_by_step,
+        evidence_images=evidence_images,
+        output_base=new_run_dir,
+    )
+
+    logger.info("Creando nuevo run...")
+
+    # Guardar artifacts en disco primero (el directorio ya se creó al preparar el run)
+    output_dir = new_run_dir
+
+    json_path = output_dir / "process.json"
+    md_path = output_dir / "process.md"
+
+    # Enriquecer el JSON con las imágenes estructuradas (imagen↔paso + evidencia).
+    from process_ai_core.assets_json import inject_assets_into_json
+    corrected_json = inject_assets_into_json(corrected_data, images_by_step, evidence_images)
 
-        # Enriquecer el JSON con las imágenes estructuradas (imagen↔paso + evidencia).
-        from process_ai_core.assets_json import inject_assets_into_json
-        corrected_json = inject_assets_into_json(corrected_json, images_by_step, evidence_images)
+    json_path.write_text(corrected_json, encoding="utf-8")
+    md_path.write_text(markdown, encoding="utf-8")
 
-        json_path.write_text(corrected_json, encoding="utf-8")
-        md_path.write_text(markdown, encoding="utf-8")
+    logger.info(f"Artifacts guardados en {output_dir}")
 
-        logger.info(f"Artifacts guardados en {output_dir}")
+    # Subir artefactos del run (json/md + assets) a object storage (no-op en local).
+    # El PDF se genera después, en background (ver _export_patch_pdf_background).
+    from process_ai_core.storage import sync_run_dir_to_storage
+    sync_run_dir_to_storage(patch_workspace_id, new_run_id, output_dir)
 
-        # Generar PDF
-        pdf_generated = False
-        pdf_branding = None
+    return corrected_json, markdown
+
+
+def _export_patch_pdf_background(patch_workspace_id: str, new_run_id: str) -> None:
+    """Genera process.pdf del run de patch en segundo plano. No lanza excepciones."""
+    from process_ai_core.export import export_pdf
+    from process_ai_core.storage import get_storage, run_artifact_key
+
+    try:
+        output_dir = _run_dir(patch_workspace_id, new_run_id)
         with get_db_session() as branding_session:
-            doc_for_branding = branding_session.query(Document).filter_by(id=document_id).first()
-            pdf_branding = get_workspace_pdf_branding(
-                branding_session,
-                doc_for_branding.workspace_id if doc_for_branding else None,
-            )
-        try:
-            export_pdf(
+            pdf_branding = get_workspace_pdf_branding(branding_session, patch_workspace_id)
+        md_path = output_dir / "process.md"
+        # Mismo markdown + assets + branding que un patch anterior → mismo PDF.
+        cache_key = render_cache_key(
+            patch_workspace_id,
+            md_path.read_text(encoding="utf-8"),
+            output_dir / "assets",
+            pdf_branding,
+        )
+        pdf_path = get_or_render_pdf(
+            cache_key,
+            output_dir / "process.pdf",
+            lambda: export_pdf(
                 run_dir=output_dir,
                 md_path=md_path,
                 pdf_name="process.pdf",
                 branding=pdf_branding,
+            ),
+        )
+        logger.info("PDF del patch generado en %s", pdf_path)
+
+        # Solo el PDF: json/md/assets ya se subieron en la fase de escritura.
+        if (get_settings().storage_backend or "local").lower() != "local":
+            get_storage().put(
+                run_artifact_key(patch_workspace_id, new_run_id, "process.pdf"),
+                Path(pdf_path).read_bytes(),
+                content_type="application/pdf",
             )
-            pdf_generated = True
-            logger.info("PDF generado exitosamente")
-        except Exception as pdf_error:
-            logger.warning(f"Error al generar PDF (opcional): {pdf_error}")
+    except Exception as exc:
+        logger.warning("No se pudo generar el PDF del patch en background: %s", exc)
 
-        # Subir artefactos del run (json/md/pdf + assets) a object storage (no-op en local).
-        from process_ai_core.storage import sync_run_dir_to_storage
-        sync_run_dir_to_storage(patch_workspace_id, new_run_id, output_dir)
 
-        # Crear Run en BD (transacción atómica)
-        with get_db_session() as session:
-            from datetime import datetime, UTC
-            from process_ai_core.db.models import DocumentVersion, Validation
-            # Bloquear solo si existe IN_REVIEW (no por DRAFT)
-            in_review = get_in_review_version(session, document_id)
-            doc = session.query(Document).filter_by(id=document_id).first()
-            # Si el documento ya está "rejected" pero hay IN_REVIEW, es inconsistencia (ej. rechazo no persistido): reconciliar y seguir
-            if doc and doc.status == "rejected" and in_review:
-                logger.warning(
-                    f"Reconciliando inconsistencia: documento {document_id} está rejected pero versión {in_review.id} sigue IN_REVIEW; marcando como REJECTED para permitir patch."
-                )
-                in_review.version_status = "REJECTED"
-                in_review.rejected_at = datetime.now(UTC)
-                if in_review.validation_id:
-                    val = session.query(Validation).filter_by(id=in_review.validation_id).first()
-                    if val and val.status == "pending":
-                        val.status = "rejected"
-                        val.completed_at = datetime.now(UTC)
-                in_review = None  # permitir seguir con el patch
-            if in_review:
-                raise HTTPException(
-                    status_code=409,
-                    detail="Ya hay una versión pendiente de validación. Aprobá o rechazá esa versión antes de aplicar un nuevo patch."
-                )
+def _persist_patch_run(
+    *,
+    document_id: str,
+    user_id: str,
+    observations: str,
+    new_run_id: str,
+    process_audience: str,
+    patch_workspace_id: str,
+    json_content: str,
+    markdown_content: str,
+) -> None:
+    """Fase de persistencia del patch: Run + DRAFT (creado o reutilizado) + audit log."""
+    from process_ai_core.db.helpers import create_run, update_document_status
 
-            new_run = create_run(
-                session=session,
-                document_id=document_id,
-                domain="process",
-                profile=process_audience,
-                run_id=new_run_id,  # Usar el ID pre-generado
+    # Crear Run en BD (transacción atómica)
+    with get_db_session() as session:
+        from datetime import datetime, UTC
+        from process_ai_core.db.models import DocumentVersion, Validation
+        # Bloquear solo si existe IN_REVIEW (no por DRAFT)
+        in_review = get_in_review_version(session, document_id)
+        doc = session.get(Document, document_id)
+        # Si el documento ya está "rejected" pero hay IN_REVIEW, es inconsistencia (ej. rechazo no persistido): reconciliar y seguir
+        if doc and doc.status == "rejected" and in_review:
+            logger.warning(
+                f"Reconciliando inconsistencia: documento {document_id} está rejected pero versión {in_review.id} sigue IN_REVIEW; marcando como REJECTED para permitir patch."
+            )
+            in_review.version_status = "REJECTED"
+            in_review.rejected_at = datetime.now(UTC)
+            if in_review.validation_id:
+                val = session.get(Validation, in_review.validation_id)
+                if val and val.status == "pending":
+                    val.status = "rejected"
+                    val.completed_at = datetime.now(UTC)
+            in_review = None  # permitir seguir con el patch
+        if in_review:
+            raise HTTPException(
+                status_code=409,
+                detail="Ya hay una versión pendiente de validación. Aprobá o rechazá esa versión antes de aplicar un nuevo patch."
             )
-            session.flush()
 
-            # Los artefactos del run viven en object storage bajo la clave {run_id}/...;
-            # no se trackean en una tabla (se sirven por convención).
+        new_run = create_run(
+            session=session,
+            document_id=document_id,
+            domain="process",
+            profile=process_audience,
+            run_id=new_run_id,  # Usar el ID pre-generado
+        )
 
-            try:
-                # Leer el contenido generado del disco
-                json_path = output_dir / "process.json"
-                md_path = output_dir / "process.md"
-                json_content = json_path.read_text(encoding="utf-8")
-                markdown_content = md_path.read_text(encoding="utf-8")
-
-                # Resolver DRAFT: reutilizar existente o crear uno
-                draft = get_editable_version(session, document_id)
-                draft_was_created = False
-                if draft is None:
-                    # Selección source_version_id: REJECTED más reciente > APPROVED vigente > None
-                    rejected = (
-                        session.query(DocumentVersion)
-                        .filter_by(document_id=document_id, version_status="REJECTED")
-                        .order_by(DocumentVersion.created_at.desc())
-                        .first()
-                    )
-                    approved = (
-                        session.query(DocumentVersion)
-                        .filter_by(document_id=document_id, version_status="APPROVED", is_current=True)
-                        .first()
-                    )
-                    source_version_id = rejected.id if rejected else (approved.id if approved else None)
-                    draft = get_or_create_draft(
-                        session=session,
-                        document_id=document_id,
-                        source_version_id=source_version_id,
-                        user_id=user_id,
-                    )
-                    draft_was_created = True
-
-                # Aplicar patch al DRAFT (creado o reutilizado)
-                draft.run_id = new_run_id
-                draft.content_json = json_content
-                draft.content_markdown = markdown_content
-                draft.content_type = "ai_patch"
-                session.flush()
-
-                # Audit log
-                create_audit_log(
+        # Los artefactos del run viven en object storage bajo la clave {run_id}/...;
+        # no se trackean en una tabla (se sirven por convención). Sin flush
+        # explícito: Run, DRAFT y auditoría salen juntos en el flush del commit
+        # (o en el que hace get_or_create_draft al crear el DRAFT); los ids son
+        # client-side.
+
+        try:
+            # Resolver DRAFT: reutilizar existente o crear uno
+            draft = get_editable_version(session, document_id)
+            draft_was_created = False
+            if draft is None:
+                # Selección source_version_id: REJECTED más reciente > APPROVED vigente > None
+                rejected = (
+                    session.query(DocumentVersion)
+                    .filter_by(document_id=document_id, version_status="REJECTED")
+                    .order_by(DocumentVersion.created_at.desc())
+                    .first()
+                )
+                approved = (
+                    session.query(DocumentVersion)
+                    .filter_by(document_id=document_id, version_status="APPROVED", is_current=True)
+                    .first()
+                )
+                source_version_id = rejected.id if rejected else (approved.id if approved else None)
+                draft = get_or_create_draft(
                     session=session,
                     document_id=document_id,
+                    source_version_id=source_version_id,
                     user_id=user_id,
-                    action="version.draft_created_by_ai_patch" if draft_was_created else "version.draft_updated_by_ai_patch",
-                    entity_type="version",
-                    entity_id=draft.id,
-                    metadata_json=json.dumps({
-                        "run_id": new_run_id,
-                        "draft_version_id": draft.id,
-                        "draft_version_number": draft.version_number,
-                        "source_version_id": draft.supersedes_version_id,
-                        "observations_preview": (observations[:200] + "...") if observations and len(observations) > 200 else (observations or None),
-                    }),
                 )
+                draft_was_created = True
+
+            # Aplicar patch al DRAFT (creado o reutilizado)
+            draft.run_id = new_run_id
+            draft.content_json = json_content
+            draft.content_markdown = markdown_content
+            draft.content_type = "ai_patch"
+
+            # Audit log
+            create_audit_log(
+                session=session,
+                document_id=document_id,
+                user_id=user_id,
+                action="version.draft_created_by_ai_patch" if draft_was_created else "version.draft_updated_by_ai_patch",
+                entity_type="version",
+                entity_id=draft.id,
+                metadata_json=orjson.dumps({
+                    "run_id": new_run_id,
+                    "draft_version_id": draft.id,
+                    "draft_version_number": draft.version_number,
+                    "source_version_id": draft.supersedes_version_id,
+                    "observations_preview": (observations[:200] + "...") if observations and len(observations) > 200 else (observations or None),
+                }).decode("utf-8"),
+            )
 
-                # Dejar documento en draft: el creador envía a revisión cuando esté conforme
+            # Dejar documento en draft: el creador envía a revisión cuando esté conforme
+            update_document_status(
+                session=session,
+                document_id=document_id,
+                status="draft",
+            )
+
+            # Recalcular uso de storage del tenant (best-effort).
+            from process_ai_core.db.helpers import update_workspace_storage_usage
+            update_workspace_storage_usage(session, patch_workspace_id)
+
+            session.commit()
+        except HTTPException:
+            session.rollback()
+            raise
+        except Exception as e:
+            logger.error(f"Error al crear/actualizar versión en patch: {e}", exc_info=True)
+            session.rollback()
+            try:
                 update_document_status(
                     session=session,
                     document_id=document_id,
                     status="draft",
                 )
-
-                # Recalcular uso de storage del tenant (best-effort).
-                from process_ai_core.db.helpers import update_workspace_storage_usage
-                update_workspace_storage_usage(session, patch_workspace_id)
-
                 session.commit()
-            except HTTPException:
-                session.rollback()
-                raise
-            except Exception as e:
-                logger.error(f"Error al crear/actualizar versión en patch: {e}", exc_info=True)
+            except Exception as update_err:
+                logger.warning(f"No se pudo actualizar estado del documento tras fallo de patch: {update_err}")
                 session.rollback()
-                try:
-                    update_document_status(
-                        session=session,
-                        document_id=document_id,
-                        status="draft",
-                    )
-                    session.commit()
-                except Exception as update_err:
-                    logger.warning(f"No se pudo actualizar estado del documento tras fallo de patch: {update_err}")
-                    session.rollback()
-                raise
-
-            logger.info(f"Run {new_run_id} creado exitosamente")
-            # Commit se hace automáticamente al salir del with
+            raise
+
+        logger.info(f"Run {new_run_id} creado exitosamente")
+        # Commit se hace automáticamente al salir del with
+
+
+_PATCH_INSTRUCTIONS = """
+
+=== INSTRUCCIONES DE CORRECCIÓN ===
+Aplica las correcciones indicadas en las observaciones al documento actual.
+Mantén la estructura JSON y solo modifica los campos necesarios según las observaciones.
+Responde SOLO con el JSON corregido, sin texto adicional.
+"""
+
+# System prompt del patch: es estático (prompt de procesos + instrucciones de
+# corrección), se arma una vez al importar el módulo y no en cada request.
+_PATCH_SYSTEM_PROMPT = _BUILDER.get_system_prompt() + _PATCH_INSTRUCTIONS
+
+
+@router.post("/{document_id}/patch")
+async def patch_document_with_ai(
+    document_id: str,
+    background_tasks: BackgroundTasks,
+    observations: str = Body(..., embed=True),
+    run_id: str | None = Body(None, embed=True),
+    user_id: str = Depends(get_current_user_id),
+    ctx: WorkspaceSessionContext = Depends(get_workspace_context),
+):
+    """
+    Aplica un patch por IA usando observaciones de validación.
+
+    Toma el documento actual (última versión aprobada o último run) y aplica
+    las correcciones indicadas en las observaciones usando el LLM.
+
+    Args:
+        document_id: ID del documento
+        observations: Observaciones del validador con correcciones a aplicar
+        run_id: ID del run a corregir (opcional, si no se especifica usa el último run)
+
+    Returns:
+        ProcessRunResponse con el nuevo run_id y artifacts
+    """
+    try:
+        logger.info(f"Patch por IA iniciado para documento {document_id}, run_id={run_id}")
+
+        # Fases: ver el comentario sobre _PatchBase.
+        base = await asyncio.to_thread(_load_patch_base, document_id, run_id, user_id, ctx)
+        base_json = base.base_json
+        process_audience = base.process_audience
+        patch_workspace_id = base.workspace_id
+
+        # Construir prompt para patch (fuera del contexto de sesión). Las partes
+        # estables (system + instrucciones + documento) van primero y las
+        # observaciones al final, para que el prompt caching del proveedor reuse
+        # el prefijo entre patches sucesivos del mismo documento.
+        patch_prompt = f"""=== DOCUMENTO ACTUAL ===
+{base_json}
+
+=== OBSERVACIONES DE VALIDACIÓN ===
+{observations}
+"""
+
+        # El run nuevo (directorio + clonado de assets del run base) no depende de
+        # la respuesta del LLM: se prepara en el threadpool mientras tanto.
+        prepare_task = asyncio.ensure_future(
+            asyncio.to_thread(_prepare_patch_run_dir, patch_workspace_id, base.run_id)
+        )
+
+        logger.info("Llamando al LLM para generar documento corregido...")
+
+        # Llamar al LLM para generar el documento corregido. El helper valida la
+        # estructura y reintenta una vez si el modelo devuelve un JSON inservible.
+        from process_ai_core.engine import generate_validated_document_json
+
+        try:
+            # La llamada al LLM es síncrona y tarda decenas de segundos: en el
+            # threadpool para no congelar el event loop (y el resto de requests).
+            corrected_json = await asyncio.to_thread(
+                generate_validated_document_json,
+                builder=_BUILDER,
+                prompt=patch_prompt,
+                system_prompt=_PATCH_SYSTEM_PROMPT,
+            )
+            logger.info("Documento corregido generado y validado exitosamente")
+        except Exception as e:
+            logger.error(f"Error al generar documento corregido: {e}", exc_info=True)
+            await _discard_patch_run_dir(prepare_task, patch_workspace_id)
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error al generar documento corregido: {str(e)}"
+            )
+
+        new_run_id, images_by_step, evidence_images = await prepare_task
+        corrected_json, markdown = await asyncio.to_thread(
+            _write_patch_artifacts,
+            patch_workspace_id,
+            new_run_id,
+            images_by_step,
+            evidence_images,
+            process_audience,
+            corrected_json,
+        )
+
+        await asyncio.to_thread(
+            _persist_patch_run,
+            document_id=document_id,
+            user_id=user_id,
+            observations=observations,
+            new_run_id=new_run_id,
+            process_audience=process_audience,
+            patch_workspace_id=patch_workspace_id,
+            json_content=corrected_json,
+            markdown_content=markdown,
+        )
+
+        # El PDF (Pandoc + LaTeX, varios segundos) se genera tras responder; mientras
+        # tanto el artefacto no existe y la respuesta no incluye su URL.
+        background_tasks.add_task(run_pdf_job, _export_patch_pdf_background, patch_workspace_id, new_run_id)
 
         # Construir URLs firmadas para los artefactos
-        artifacts = {
-            "json": sign_artifact_url(new_run_id, "process.json", patch_workspace_id),
-            "markdown": sign_artifact_url(new_run_id, "process.md", patch_workspace_id),
-        }
-        if pdf_generated:
-            artifacts["pdf"] = sign_artifact_url(new_run_id, "process.pdf", patch_workspace_id)
+        artifacts = sign_run_artifact_urls(new_run_id, patch_workspace_id)
 
         logger.info(f"Patch completado exitosamente, run_id: {new_run_id}")
 
         from api.models.requests import ProcessRunResponse
         return ProcessRunResponse(
             run_id=new_run_id,
-            process_name=document_name,
+            process_name=base.document_name,
             status="completed",
             artifacts=artifacts,
         )
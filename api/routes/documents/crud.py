@@ -4,11 +4,13 @@ CRUD de documentos: listar, obtener, actualizar, eliminar y detalles de Process.
 Incluye los listados especializados (pendientes de aprobación, a revisar).
 """
 
+import asyncio
 import json
 import logging
 from typing import Any, Optional, List
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, File, UploadFile, Form
+from sqlalchemy.orm import aliased, with_polymorphic
 
 from process_ai_core.db.database import get_db_session
 from process_ai_core.db.models import Document, DocumentVersion, Process, Recipe, Run
@@ -109,12 +111,78 @@ def _to_document_response(session, doc, *, include_metadata: bool = False) -> Do
         description=doc.description,
         status=doc.status,
         metadata=_extract_open_questions_metadata(session, doc) if include_metadata else None,
-        created_at=doc.created_at.isoformat(),
+        created_at=doc.created_at,
     )
 
 
+# Proyección para los listados: solo las columnas que expone DocumentResponse, más
+# el número de la versión aprobada vía LEFT JOIN (evita el SELECT por fila de
+# _version_number y la hidratación de instancias ORM completas).
+_ApprovedVersion = aliased(DocumentVersion)
+
+
+def _document_list_query(session):
+    return session.query(
+        Document.id,
+        Document.workspace_id,
+        Document.folder_id,
+        Document.domain,
+        Document.document_type,
+        Document.name,
+        Document.description,
+        Document.status,
+        Document.created_at,
+        _ApprovedVersion.version_number,
+    ).outerjoin(_ApprovedVersion, _ApprovedVersion.id == Document.approved_version_id)
+
+
+def _row_to_document_response(row) -> DocumentResponse:
+    """
+    Como `_to_document_response`, pero desde una fila de `_document_list_query`.
+
+    Usa `model_construct` (sin validación) porque corre una vez por fila del listado,
+    así que los valores tienen que llegar ya con los tipos del modelo. Lo que puede
+    venir NULL está cubierto: `folder_id` y `version_number` (LEFT JOIN, sin versión
+    aprobada) son Optional en DocumentResponse, y `domain`/`document_type` caen a su
+    default acá. Una columna nullable nueva en el listado necesita lo mismo.
+    """
+    return DocumentResponse.model_construct(
+        id=row.id,
+        workspace_id=row.workspace_id,
+        folder_id=row.folder_id,
+        domain=row.domain or "process",
+        document_type=row.document_type or "procedimiento",
+        version_number=row.version_number,
+        name=row.name,
+        description=row.description,
+        status=row.status,
+        metadata=None,
+        created_at=row.created_at,
+    )
+
+
+def _visible_page(rows, folder_allowed, limit: Optional[int], offset: int) -> list:
+    """
+    Filtra filas por acceso a carpeta y aplica la página (offset/limit).
+
+    `folder_allowed(folder_id)` se evalúa una vez por carpeta distinta (cada chequeo
+    de permisos cuesta varias queries), no una vez por documento.
+    """
+    allowed: dict[Optional[str], bool] = {}
+    visible = []
+    for row in rows:
+        if row.folder_id not in allowed:
+            allowed[row.folder_id] = folder_allowed(row.folder_id)
+        if allowed[row.folder_id]:
+            visible.append(row)
+    end = offset + limit if limit is not None else None
+    return visible[offset:end]
+
+
 @router.get("/pending-approval", response_model=list[DocumentResponse])
 async def list_documents_pending_approval(
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Máximo de documentos a devolver (default: todos)"),
+    offset: int = Query(0, ge=0, description="Documentos a saltear (paginación)"),
     user_id: str = Depends(get_current_user_id),
     ctx: WorkspaceSessionContext = Depends(get_workspace_context),
 ):
@@ -130,7 +198,20 @@ async def list_documents_pending_approval(
     Returns:
         Lista de documentos con status="pending_validation"
     """
-    workspace_id = resolve_tenant_workspace_id(ctx)
+    return await asyncio.to_thread(
+        _list_documents_pending_approval_sync, user_id, resolve_tenant_workspace_id(ctx), limit, offset
+    )
+
+
+def _list_documents_pending_approval_sync(
+    user_id: str, workspace_id: str, limit: Optional[int], offset: int
+) -> list[DocumentResponse]:
+    """
+    Parte sync de GET /pending-approval. Corre en el threadpool (asyncio.to_thread):
+    la sesión SQLAlchemy es síncrona y, ejecutada directo en el handler async,
+    bloqueaba el event loop durante cada round trip a Postgres. Lo mismo vale para
+    los demás `_*_sync` de este módulo.
+    """
     with get_db_session() as session:
         # Verificar permisos usando el sistema de permisos
         from process_ai_core.db.permissions import has_permission
@@ -143,38 +224,42 @@ async def list_documents_pending_approval(
 
         # Documentos pendientes de validación que el usuario SÍ puede revisar:
         # excluir aquellos cuya versión IN_REVIEW fue creada por este usuario (segregación).
-        from sqlalchemy import or_
-        documents = (
-            session.query(Document)
-            .join(
-                DocumentVersion,
-                (DocumentVersion.document_id == Document.id)
-                & (DocumentVersion.version_status == "IN_REVIEW"),
+        # EXISTS correlacionado (semi-join): sin filas duplicadas ni DISTINCT.
+        from sqlalchemy import exists, or_
+        reviewable_version = exists().where(
+            (DocumentVersion.document_id == Document.id)
+            & (DocumentVersion.version_status == "IN_REVIEW")
+            & or_(
+                DocumentVersion.created_by.is_(None),
+                DocumentVersion.created_by != user_id,
             )
+        )
+        rows = (
+            _document_list_query(session)
             .filter(
                 Document.workspace_id == workspace_id,
                 Document.status == "pending_validation",
-                or_(
-                    DocumentVersion.created_by.is_(None),
-                    DocumentVersion.created_by != user_id,
-                ),
+                reviewable_version,
             )
             .order_by(Document.created_at.asc())
-            .distinct()
             .all()
         )
         # Solo documentos en carpetas donde el usuario puede aprobar (roles operativos)
         from process_ai_core.db.permissions import can_approve_in_folder
-        documents = [d for d in documents if can_approve_in_folder(session, user_id, workspace_id, d.folder_id)]
+        rows = _visible_page(
+            rows,
+            lambda folder_id: can_approve_in_folder(session, user_id, workspace_id, folder_id),
+            limit,
+            offset,
+        )
 
-        return [
-            _to_document_response(session, doc)
-            for doc in documents
-        ]
+        return [_row_to_document_response(row) for row in rows]
 
 
 @router.get("/to-review", response_model=list[DocumentResponse])
 async def list_documents_to_review(
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Máximo de documentos a devolver (default: todos)"),
+    offset: int = Query(0, ge=0, description="Documentos a saltear (paginación)"),
     user_id: str = Depends(get_current_user_id),
     ctx: WorkspaceSessionContext = Depends(get_workspace_context),
 ):
@@ -188,7 +273,15 @@ async def list_documents_to_review(
     Returns:
         Lista de documentos con status="rejected" creados por el usuario
     """
-    workspace_id = resolve_tenant_workspace_id(ctx)
+    return await asyncio.to_thread(
+        _list_documents_to_review_sync, user_id, resolve_tenant_workspace_id(ctx), limit, offset
+    )
+
+
+def _list_documents_to_review_sync(
+    user_id: str, workspace_id: str, limit: Optional[int], offset: int
+) -> list[DocumentResponse]:
+    """Parte sync de GET /to-review (corre en el threadpool)."""
     with get_db_session() as session:
         # Verificar que el usuario puede ver documentos
         from process_ai_core.db.permissions import has_permission
@@ -201,16 +294,23 @@ async def list_documents_to_review(
 
         # Obtener documentos rechazados del workspace
         # Por ahora, todos los documentos rechazados (luego podemos filtrar por creador)
-        documents = session.query(Document).filter_by(
-            workspace_id=workspace_id,
-            status="rejected",
-        ).order_by(Document.created_at.desc()).all()
-        documents = [d for d in documents if can_view_folder(session, user_id, workspace_id, d.folder_id)]
+        rows = (
+            _document_list_query(session)
+            .filter(
+                Document.workspace_id == workspace_id,
+                Document.status == "rejected",
+            )
+            .order_by(Document.created_at.desc())
+            .all()
+        )
+        rows = _visible_page(
+            rows,
+            lambda folder_id: can_view_folder(session, user_id, workspace_id, folder_id),
+            limit,
+            offset,
+        )
 
-        return [
-            _to_document_response(session, doc)
-            for doc in documents
-        ]
+        return [_row_to_document_response(row) for row in rows]
 
 
 @router.get("", response_model=list[DocumentResponse])
@@ -218,6 +318,8 @@ async def list_documents(
     folder_id: Optional[str] = Query(None, description="ID de la carpeta (opcional)"),
     domain: str = Query("process", description="Tipo de documento"),
     status: Optional[str] = Query(None, description="Filtrar por estado (draft|pending_validation|approved|rejected|archived)"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Máximo de documentos a devolver (default: todos)"),
+    offset: int = Query(0, ge=0, description="Documentos a saltear (paginación)"),
     user_id: str = Depends(get_current_user_id),
     ctx: WorkspaceSessionContext = Depends(get_workspace_context),
 ):
@@ -233,12 +335,34 @@ async def list_documents(
                    Si es "null" (string), devuelve solo documentos sin carpeta
         domain: Tipo de documento (query parameter, default: "process")
         status: Filtrar por estado (query parameter, opcional)
+        limit / offset: Paginación opcional (sin limit se devuelven todos)
         user_id: ID del usuario autenticado (desde token JWT)
 
     Returns:
         Lista de DocumentResponse
     """
-    workspace_id = resolve_tenant_workspace_id(ctx)
+    return await asyncio.to_thread(
+        _list_documents_sync,
+        user_id,
+        resolve_tenant_workspace_id(ctx),
+        folder_id,
+        domain,
+        status,
+        limit,
+        offset,
+    )
+
+
+def _list_documents_sync(
+    user_id: str,
+    workspace_id: str,
+    folder_id: Optional[str],
+    domain: str,
+    status: Optional[str],
+    limit: Optional[int],
+    offset: int,
+) -> list[DocumentResponse]:
+    """Parte sync de GET /documents (corre en el threadpool)."""
     with get_db_session() as session:
         # Verificar permiso documents.view en el workspace
         if not has_permission(session, user_id, workspace_id, "documents.view"):
@@ -253,28 +377,40 @@ async def list_documents(
         if user_role and user_role.name == "viewer":
             status = "approved"
 
-        query = session.query(Document).filter_by(
-            workspace_id=workspace_id,
-            domain=domain
+        query = _document_list_query(session).filter(
+            Document.workspace_id == workspace_id,
+            Document.domain == domain,
         )
 
-        if folder_id:
-            if folder_id.lower() == "null":
-                query = query.filter(Document.folder_id.is_(None))
-            else:
-                query = query.filter_by(folder_id=folder_id)
-
         if status:
             query = query.filter(Document.status == status)
 
-        documents = query.order_by(Document.created_at.desc()).all()
+        query = query.order_by(Document.created_at.desc())
+
         # Filtrar por acceso a carpeta (roles operativos)
-        documents = [d for d in documents if can_view_folder(session, user_id, workspace_id, d.folder_id)]
+        if folder_id:
+            # Una sola carpeta: el acceso se decide una vez y la página va en el SQL.
+            # "null" (sin distinguir mayúsculas) = raíz. El chequeo de largo deja
+            # pasar los UUIDs sin armar una copia en minúsculas en cada listado.
+            is_root = len(folder_id) == 4 and folder_id.lower() == "null"
+            target_folder_id = None if is_root else folder_id
+            if not can_view_folder(session, user_id, workspace_id, target_folder_id):
+                return []
+            query = query.filter(
+                Document.folder_id.is_(None)
+                if target_folder_id is None
+                else Document.folder_id == target_folder_id
+            )
+            rows = query.offset(offset).limit(limit).all()
+        else:
+            rows = _visible_page(
+                query.all(),
+                lambda fid: can_view_folder(session, user_id, workspace_id, fid),
+                limit,
+                offset,
+            )
 
-        return [
-            _to_document_response(session, doc)
-            for doc in documents
-        ]
+        return [_row_to_document_response(row) for row in rows]
 
 
 @router.post("/import", response_model=list[DocumentResponse])
@@ -387,9 +523,14 @@ async def get_document(
         403: Si el usuario no tiene permiso documents.view
         404: Si el documento no existe
     """
+    return await asyncio.to_thread(_get_document_sync, document_id, user_id, ctx)
+
+
+def _get_document_sync(document_id: str, user_id: str, ctx: WorkspaceSessionContext) -> DocumentResponse:
+    """Parte sync de GET /{document_id} (corre en el threadpool)."""
     with get_db_session() as session:
         # Usar polymorphic_identity para obtener el tipo correcto
-        doc = session.query(Document).filter_by(id=document_id).first()
+        doc = session.get(Document, document_id)
         if not doc:
             raise HTTPException(
                 status_code=404,
@@ -420,15 +561,6 @@ async def get_document(
                 detail="Solo puede ver documentos aprobados"
             )
 
-        # Si es un Process, obtener los campos específicos
-        if doc.domain == "process":
-            process = session.query(Process).filter_by(id=document_id).first()
-            if process:
-                # Retornar con campos extendidos (aunque DocumentResponse no los incluye,
-                # los podemos agregar en metadata o crear un response extendido)
-                # Por ahora, solo retornamos los campos básicos
-                pass
-
         return _to_document_response(session, doc, include_metadata=True)
 
 
@@ -452,9 +584,13 @@ async def update_document(
     Raises:
         404: Si el documento no existe
         400: Si el documento tiene versiones inmutables (IN_REVIEW)
+        409: Si falta la fila de la subclase (processes/recipes)
     """
     with get_db_session() as session:
-        doc = session.query(Document).filter_by(id=document_id).first()
+        # with_polymorphic: un solo SELECT (con LEFT JOIN a processes/recipes) ya
+        # devuelve la subclase con sus columnas cargadas.
+        doc_entity = with_polymorphic(Document, [Process, Recipe])
+        doc = session.query(doc_entity).filter(doc_entity.id == document_id).first()
         if not doc:
             raise HTTPException(
                 status_code=404,
@@ -475,6 +611,14 @@ async def update_document(
                 detail="No tiene acceso a la carpeta de este documento"
             )
 
+        # Sin fila en processes/recipes el LEFT JOIN igual devuelve la subclase, pero
+        # con id (la PK de la subclase) en None: el UPDATE no encontraría la fila.
+        if isinstance(doc, (Process, Recipe)) and doc.id is None:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Documento {document_id} sin registro de {doc.domain}; no se puede actualizar"
+            )
+
         # Verificar inmutabilidad (bloquea solo si hay IN_REVIEW)
         from process_ai_core.db.helpers import check_version_immutable
         is_immutable, reason = check_version_immutable(session, document_id)
@@ -505,57 +649,62 @@ async def update_document(
         if request.document_type is not None:
             doc.document_type = request.document_type
 
-        # Actualizar campos específicos según el tipo
-        if doc.domain == "process":
-            process = session.query(Process).filter_by(id=document_id).first()
-            if not process:
-                # Si no existe el Process, crearlo (no debería pasar, pero por seguridad)
-                process = Process(
-                    id=document_id,
-                    workspace_id=doc.workspace_id,
-                    folder_id=doc.folder_id,
-                    domain="process",
-                    name=doc.name,
-                    description=doc.description,
-                    status=doc.status,
-                )
-                session.add(process)
-
+        # Actualizar campos específicos según el tipo (doc ya es la subclase)
+        if isinstance(doc, Process):
             if request.audience is not None:
-                process.audience = request.audience
+                doc.audience = request.audience
             if request.detail_level is not None:
-                process.detail_level = request.detail_level
+                doc.detail_level = request.detail_level
             if request.context_text is not None:
-                process.context_text = request.context_text
-        elif doc.domain == "recipe":
-            recipe = session.query(Recipe).filter_by(id=document_id).first()
-            if recipe:
-                if request.cuisine is not None:
-                    recipe.cuisine = request.cuisine
-                if request.difficulty is not None:
-                    recipe.difficulty = request.difficulty
-                if request.servings is not None:
-                    recipe.servings = request.servings
-                if request.prep_time is not None:
-                    recipe.prep_time = request.prep_time
-                if request.cook_time is not None:
-                    recipe.cook_time = request.cook_time
+                doc.context_text = request.context_text
+        elif isinstance(doc, Recipe):
+            if request.cuisine is not None:
+                doc.cuisine = request.cuisine
+            if request.difficulty is not None:
+                doc.difficulty = request.difficulty
+            if request.servings is not None:
+                doc.servings = request.servings
+            if request.prep_time is not None:
+                doc.prep_time = request.prep_time
+            if request.cook_time is not None:
+                doc.cook_time = request.cook_time
 
         session.commit()
-        session.refresh(doc)
-
-        # Si es Process, refrescar también el Process
-        if doc.domain == "process":
-            process = session.query(Process).filter_by(id=document_id).first()
-            if process:
-                session.refresh(process)
 
         return _to_document_response(session, doc)
 
 
+def _delete_storage_prefix(storage, prefix: str) -> None:
+    """Borra un prefijo del storage (best-effort: solo loguea si falla)."""
+    try:
+        storage.delete_prefix(prefix)
+    except Exception as e:
+        logger.warning(f"No se pudo borrar storage bajo {prefix}: {e}")
+
+
+def _cleanup_document_storage(workspace_id: str, prefixes: list[str]) -> None:
+    """
+    Libera el storage de un documento ya borrado de la DB (runs + PDFs aprobados)
+    y recalcula el uso del tenant. Corre en background, después del commit.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from process_ai_core.storage import get_storage
+    from process_ai_core.db.helpers import update_workspace_storage_usage
+
+    storage = get_storage()
+    # Prefijos independientes: en paralelo (cada uno son varios round trips al bucket).
+    with ThreadPoolExecutor(max_workers=min(8, len(prefixes))) as pool:
+        list(pool.map(lambda prefix: _delete_storage_prefix(storage, prefix), prefixes))
+
+    # El uso se recalcula listando el storage: recién ahora refleja el borrado.
+    with get_db_session() as session:
+        update_workspace_storage_usage(session, workspace_id)
+
+
 @router.delete("/{document_id}")
 async def delete_document_endpoint(
     document_id: str,
+    background_tasks: BackgroundTasks,
     user_id: str = Depends(get_current_user_id),
     ctx: WorkspaceSessionContext = Depends(get_workspace_context),
 ):
@@ -594,7 +743,7 @@ async def delete_document_endpoint(
     """
     with get_db_session() as session:
         # Verificar que el documento existe
-        doc = session.query(Document).filter_by(id=document_id).first()
+        doc = session.get(Document, document_id)
         if not doc:
             raise HTTPException(
                 status_code=404,
@@ -616,34 +765,23 @@ async def delete_document_endpoint(
             )
 
         # Obtener runs antes de eliminar para limpiar archivos físicos
-        runs = session.query(Run).filter_by(document_id=document_id).all()
-        run_ids = [run.id for run in runs]
+        run_ids = [row[0] for row in session.query(Run.id).filter_by(document_id=document_id).all()]
         doc_workspace_id = doc.workspace_id  # capturar antes del delete (doc se expira)
 
         try:
             # Eliminar el documento y todos sus datos asociados
             delete_document(session, document_id)
-
-            # Liberar el storage del documento: sus runs y sus PDFs aprobados (en el
-            # bucket y en disco local — delete_prefix funciona para ambos backends).
-            from process_ai_core.storage import get_storage, run_prefix, workspace_prefix
-            storage = get_storage()
-            for run_id in run_ids:
-                try:
-                    storage.delete_prefix(run_prefix(doc_workspace_id, run_id))
-                except Exception as e:
-                    logger.warning(f"No se pudo borrar storage del run {run_id}: {e}")
-            try:
-                storage.delete_prefix(f"{workspace_prefix(doc_workspace_id)}/documents/{document_id}")
-            except Exception as e:
-                logger.warning(f"No se pudo borrar storage del documento {document_id}: {e}")
-
-            # Recalcular uso de storage del tenant (best-effort).
-            from process_ai_core.db.helpers import update_workspace_storage_usage
-            update_workspace_storage_usage(session, doc_workspace_id)
-
             session.commit()
 
+            # Liberar el storage del documento (sus runs y sus PDFs aprobados, en el
+            # bucket y en disco local) recién con el borrado confirmado en la DB, y
+            # después de responder: si la limpieza falla quedan huérfanos en storage,
+            # nunca un documento vivo sin sus archivos.
+            from process_ai_core.storage import run_prefix, workspace_prefix
+            prefixes = [run_prefix(doc_workspace_id, run_id) for run_id in run_ids]
+            prefixes.append(f"{workspace_prefix(doc_workspace_id)}/documents/{document_id}")
+            background_tasks.add_task(_cleanup_document_storage, doc_workspace_id, prefixes)
+
             return {
                 "message": f"Documento {document_id} eliminado exitosamente",
                 "deleted_runs": len(run_ids),
@@ -675,8 +813,16 @@ async def get_process_details(
 
     Solo funciona para documentos de tipo "process".
     """
+    return await asyncio.to_thread(_get_process_details_sync, document_id, user_id, ctx)
+
+
+def _get_process_details_sync(document_id: str, user_id: str, ctx: WorkspaceSessionContext) -> dict:
+    """Parte sync de GET /{document_id}/process (corre en el threadpool)."""
     with get_db_session() as session:
-        doc = session.query(Document).filter_by(id=document_id).first()
+        # with_polymorphic: el Process llega con sus columnas en el mismo SELECT
+        # (LEFT JOIN), sin un segundo round trip para audience/detail_level.
+        doc_entity = with_polymorphic(Document, [Process])
+        doc = session.query(doc_entity).filter(doc_entity.id == document_id).first()
         if not doc:
             raise HTTPException(
                 status_code=404,
@@ -697,17 +843,9 @@ async def get_process_details(
                 detail=f"El documento {document_id} no es un proceso"
             )
 
-        process = session.query(Process).filter_by(id=document_id).first()
-        if not process:
-            # Si no existe el Process, devolver valores vacíos
-            return {
-                "audience": "",
-                "detail_level": "",
-                "context_text": "",
-            }
-
+        # Sin fila en processes (LEFT JOIN vacío) las columnas vienen en None → "".
         return {
-            "audience": process.audience or "",
-            "detail_level": process.detail_level or "",
-            "context_text": process.context_text or "",
+            "audience": doc.audience or "",
+            "detail_level": doc.detail_level or "",
+            "context_text": doc.context_text or "",
         }
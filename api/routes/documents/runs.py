@@ -1,32 +1,41 @@
 """
 Runs de un documento: listado de runs y generación de una nueva versión
 ejecutando el pipeline de proceso (subida de archivos + LLM + artefactos).
+
+La generación puede correr en el request (default, responde 200 con los
+artefactos) o en background (`run_in_background=true`): en ese caso responde
+202 con el run_id y el estado se consulta en GET /{document_id}/runs/{run_id}.
 """
 
+import asyncio
 import logging
 import shutil
 import tempfile
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, HTTPException, Query, UploadFile
+from fastapi.responses import JSONResponse
 
 from process_ai_core.db.database import get_db_session
 from process_ai_core.db.models import Document, Process, Run, Workspace
 from process_ai_core.db.helpers import create_run
-from process_ai_core.config import get_settings
 from process_ai_core.domain_models import RawAsset
 from process_ai_core.domains.processes.profiles import get_profile
 from process_ai_core.engine import run_process_pipeline
+from process_ai_core.export.branding import PdfBranding
 from process_ai_core.prompt_context import build_context_block
 from process_ai_core.export import export_pdf
-from process_ai_core.ingest import discover_raw_assets
+from process_ai_core.ingest import discover_raw_assets_in_run
 from process_ai_core.upload_validation import ALLOWED_UPLOAD_EXTENSIONS
 
 from api.models.requests import ProcessRunResponse
+from api.responses import OrjsonResponse
 from api.routes._branding import get_workspace_pdf_branding
+from api.routes._pdf_pool import get_pdf_executor
 from api.routes._run_paths import run_dir as _run_dir
-from api.artifact_signing import sign_artifact_url
+from api.routes._uploads import link_or_copy, save_upload
+from api.artifact_signing import RUN_ARTIFACT_FILES, sign_artifact_url, sign_run_artifact_urls
 from api.dependencies import get_current_user_id
 from api.workspace_client import (
     WorkspaceSessionContext,
@@ -40,21 +49,95 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Bloque que se agrega al context_block cuando el pedido trae revision_notes.
+_REVISION_NOTES_BLOCK = (
+    "\n=== INSTRUCCIONES DE REVISIÓN ===\n"
+    "{notes}\n\n"
+    "IMPORTANTE: Aplica estas correcciones y mejoras al generar el documento.\n\n"
+)
+
+def _plan_uploads(
+    files: List[UploadFile], kind: str, prefix: str, temp_dir: Path
+) -> list[tuple[RawAsset, UploadFile, Path]]:
+    """
+    Valida la extensión de cada upload y le asigna id determinista y destino en temp_dir.
+
+    No toca el disco: devuelve (RawAsset, upload, destino) para copiarlos después.
+    Lanza 400 si alguna extensión no está permitida para `kind`.
+    """
+    allowed = ALLOWED_UPLOAD_EXTENSIONS[kind]
+    planned: list[tuple[RawAsset, UploadFile, Path]] = []
+    for n, upload_file in enumerate(files or [], start=1):
+        ext = Path(upload_file.filename).suffix.lower() if upload_file.filename else ""
+        if ext not in allowed:
+            raise HTTPException(
+                status_code=400,
+                detail=(
+                    f"Extensión no permitida para {kind}: '{ext or '(sin extensión)'}'. "
+                    f"Permitidas: {', '.join(sorted(allowed))}"
+                ),
+            )
+
+        asset_id = f"{prefix}{n}"
+        temp_path = temp_dir / f"{asset_id}{ext}"
+        titulo = Path(upload_file.filename).stem if upload_file.filename else f"{kind} {n}"
+        asset = RawAsset(
+            id=asset_id,
+            kind=kind,  # type: ignore
+            path_or_url=str(temp_path),
+            metadata={"titulo": titulo},
+        )
+        planned.append((asset, upload_file, temp_path))
+    return planned
+
+
+# Run.status (persistido) → status de ProcessRunResponse (processing|completed|error).
+_RESPONSE_STATUS = {
+    "pending": "processing",
+    "running": "processing",
+    "completed": "completed",
+    "failed": "error",
+}
+
+# El listado de runs expone el Markdown bajo "md" (contrato previo de la API);
+# las respuestas de un run usan las claves de RUN_ARTIFACT_FILES tal cual.
+_LISTING_ARTIFACT_FILES = {
+    ("md" if atype == "markdown" else atype): filename
+    for atype, filename in RUN_ARTIFACT_FILES.items()
+}
+
 
 @router.get("/{document_id}/runs")
 async def get_document_runs(
     document_id: str,
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Máximo de runs a devolver (default: todos)"),
+    offset: int = Query(0, ge=0, description="Runs a saltear (paginación)"),
     user_id: str = Depends(get_current_user_id),
     ctx: WorkspaceSessionContext = Depends(get_workspace_context),
 ):
     """
-    Obtiene todos los runs asociados a un documento.
+    Obtiene los runs asociados a un documento, del más reciente al más viejo.
+
+    limit / offset: paginación opcional (sin limit se devuelven todos).
     """
+    # DB y storage son síncronos: en el threadpool, como los GET de crud.py.
+    return await asyncio.to_thread(
+        _get_document_runs_sync, document_id, user_id, ctx, limit, offset
+    )
+
+
+def _get_document_runs_sync(
+    document_id: str,
+    user_id: str,
+    ctx: WorkspaceSessionContext,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> OrjsonResponse:
     from process_ai_core.db.models import Run
-    from process_ai_core.storage import get_storage, run_artifact_key
+    from process_ai_core.storage import get_storage, normalize_key, run_artifact_key
 
     with get_db_session() as session:
-        doc = session.query(Document).filter_by(id=document_id).first()
+        doc = session.get(Document, document_id)
         if not doc:
             raise HTTPException(
                 status_code=404,
@@ -69,38 +152,319 @@ async def get_document_runs(
                 detail="No tiene acceso a la carpeta de este documento"
             )
 
-        runs = session.query(Run).filter_by(document_id=document_id).order_by(Run.created_at.desc()).all()
+        # La página va en el SQL (usa ix_runs_document_created): con limit solo se
+        # firman y chequean en storage los artefactos de esos runs.
+        runs_query = (
+            session.query(Run.id, Run.created_at, Run.status)
+            .filter_by(document_id=document_id)
+            .order_by(Run.created_at.desc(), Run.id.desc())
+        )
+        if offset:
+            runs_query = runs_query.offset(offset)
+        if limit is not None:
+            runs_query = runs_query.limit(limit)
+        runs = runs_query.all()
 
         doc_workspace_id = doc.workspace_id
         storage = get_storage()
         # Artefactos bajo la clave canónica workspaces/{ws}/runs/{run_id}/process.{json,md,pdf}.
         # Se firman las URLs de los que existan en storage (ya no hay tabla Artifact).
-        artifact_files = {"json": "process.json", "md": "process.md", "pdf": "process.pdf"}
-        result = []
-        for run in runs:
-            artifact_dict = {}
-            for atype, filename in artifact_files.items():
-                if storage.exists(run_artifact_key(doc_workspace_id, run.id, filename)):
-                    artifact_dict[atype] = sign_artifact_url(run.id, filename, doc_workspace_id)
-
-            result.append({
+        # Un único chequeo de existencia por lote (no 3 round trips por run).
+        keys = {
+            (run.id, filename): normalize_key(run_artifact_key(doc_workspace_id, run.id, filename))
+            for run in runs
+            for filename in _LISTING_ARTIFACT_FILES.values()
+        }
+        existing = storage.existing_keys(list(keys.values()))
+        # created_at crudo: orjson lo serializa en ISO 8601 (igual que isoformat()).
+        result = [
+            {
                 "run_id": run.id,
-                "created_at": run.created_at.isoformat(),
-                "artifacts": artifact_dict,
-            })
+                "created_at": run.created_at,
+                "status": run.status,
+                "artifacts": {
+                    atype: sign_artifact_url(run.id, filename, doc_workspace_id)
+                    for atype, filename in _LISTING_ARTIFACT_FILES.items()
+                    if keys[(run.id, filename)] in existing
+                },
+            }
+            for run in runs
+        ]
+
+        return OrjsonResponse(result)
+
+
+@router.get("/{document_id}/runs/{run_id}", response_model=ProcessRunResponse)
+async def get_document_run(
+    document_id: str,
+    run_id: str,
+    user_id: str = Depends(get_current_user_id),
+    ctx: WorkspaceSessionContext = Depends(get_workspace_context),
+):
+    """
+    Estado de un run del documento (pensado para sondear generaciones en background).
+
+    Devuelve status processing|completed|error y, si terminó, las URLs firmadas
+    de los artefactos (mismo formato que la respuesta de POST /{document_id}/runs).
+    """
+    # Se sondea seguido: DB y storage en el threadpool, como el listado de runs.
+    return await asyncio.to_thread(
+        _get_document_run_sync, document_id, run_id, user_id, ctx
+    )
+
+
+def _get_document_run_sync(
+    document_id: str,
+    run_id: str,
+    user_id: str,
+    ctx: WorkspaceSessionContext,
+) -> ProcessRunResponse:
+    from process_ai_core.storage import get_storage, normalize_key, run_artifact_key
+
+    with get_db_session() as session:
+        doc = session.get(Document, document_id)
+        if not doc:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Documento {document_id} no encontrado"
+            )
+        _assert_doc_in_active_workspace(doc.workspace_id, resolve_tenant_workspace_id(ctx), document_id)
+
+        from process_ai_core.db.permissions import can_view_folder
+        if not can_view_folder(session, user_id, doc.workspace_id, doc.folder_id):
+            raise HTTPException(
+                status_code=403,
+                detail="No tiene acceso a la carpeta de este documento"
+            )
+
+        run = session.query(Run).filter_by(id=run_id, document_id=document_id).first()
+        if not run:
+            raise HTTPException(status_code=404, detail=f"Run {run_id} no encontrado")
+
+        status = _RESPONSE_STATUS.get(run.status, "completed")
+        artifacts = {}
+        if status == "completed":
+            keys = {
+                filename: normalize_key(run_artifact_key(doc.workspace_id, run_id, filename))
+                for filename in RUN_ARTIFACT_FILES.values()
+            }
+            existing = get_storage().existing_keys(list(keys.values()))
+            artifacts = {
+                atype: sign_artifact_url(run_id, filename, doc.workspace_id)
+                for atype, filename in RUN_ARTIFACT_FILES.items()
+                if keys[filename] in existing
+            }
+
+        return ProcessRunResponse(
+            run_id=run_id,
+            process_name=doc.name,
+            status=status,
+            artifacts=artifacts,
+            document_id=document_id,
+            error="La generación falló; revisá los logs del servidor" if status == "error" else None,
+        )
+
+
+def _set_run_status(run_id: str, status: str) -> None:
+    """Actualiza Run.status en su propia transacción (best-effort, no lanza)."""
+    try:
+        with get_db_session() as session:
+            session.query(Run).filter_by(id=run_id).update({Run.status: status})
+    except Exception as exc:
+        logger.warning("No se pudo actualizar el estado del run %s a %s: %s", run_id, status, exc)
+
+
+def _execute_document_run(
+    *,
+    document_id: str,
+    run_id: str,
+    workspace_id: str,
+    document_name: str,
+    process_audience: str,
+    raw_assets: List[RawAsset],
+    context_block: str,
+    pdf_branding: Optional[PdfBranding],
+    user_id: str,
+) -> dict:
+    """
+    Ejecuta el pipeline del run y persiste artefactos + versión DRAFT.
+
+    Devuelve el dict de URLs firmadas de los artefactos. Lanza ante cualquier
+    error del pipeline (el llamador decide si mapearlo a HTTP o solo loguearlo).
+    """
+    # Obtener perfil según audience
+    profile = get_profile(process_audience)
+
+    output_dir = _run_dir(workspace_id, run_id)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    result = run_process_pipeline(
+        process_name=document_name,
+        raw_assets=raw_assets,
+        profile=profile,
+        context_block=context_block,
+        output_base=output_dir,
+    )
+
+    # Persistir artefactos (el contenido queda en memoria para la versión DRAFT)
+    json_content = result["json_str"]
+    markdown_content = result["markdown"]
+    json_path = output_dir / "process.json"
+    md_path = output_dir / "process.md"
+
+    json_path.write_text(json_content, encoding="utf-8")
+    md_path.write_text(markdown_content, encoding="utf-8")
+
+    # Generar PDF
+    pdf_generated = False
+    try:
+        # En el pool de PDFs (este hilo espera): respeta el tope de renders concurrentes.
+        get_pdf_executor().submit(
+            export_pdf,
+            run_dir=output_dir,
+            md_path=md_path,
+            pdf_name="process.pdf",
+            branding=pdf_branding,
+        ).result()
+        pdf_generated = True
+    except Exception as pdf_error:
+        pass
+
+    # Subir artefactos del run (json/md/pdf + assets) a object storage (no-op en local).
+    from process_ai_core.storage import sync_run_dir_to_storage
+    sync_run_dir_to_storage(workspace_id, run_id, output_dir)
+
+    # Construir URLs firmadas para los artefactos
+    artifacts = sign_run_artifact_urls(run_id, workspace_id, include_pdf=pdf_generated)
+
+    # Crear versión IN_REVIEW automáticamente.
+    # Los artefactos del run (json/md/pdf/assets) viven en object storage bajo
+    # la clave {run_id}/...; no se trackean en una tabla (se sirven por convención).
+    with get_db_session() as db_session:
+        from process_ai_core.db.helpers import update_document_status, get_or_create_draft
+        from process_ai_core.db.models import DocumentVersion, Run
+        import uuid
+
+        # Registrar el manifiesto de fuentes (metadata + sha256 + transcripción)
+        # en el Run, para defensa de auditoría antes de que el temp se borre.
+        # UPDATE directo (sin SELECT previo del Run: solo se escriben columnas).
+        from process_ai_core.input_manifest import build_input_manifest_json
+        db_session.query(Run).filter_by(id=run_id).update(
+            {
+                Run.input_manifest_json: build_input_manifest_json(
+                    raw_assets, result.get("enriched_assets"), uploaded_by=user_id
+                ),
+                # Artefactos ya persistidos: el run queda terminado con la misma transacción.
+                Run.status: "completed",
+            },
+            synchronize_session=False,
+        )
+
+        # Crear versión DRAFT desde el run generado y enviarla automáticamente a revisión
+        try:
+            # Número de versión siguiente y si ya hay una IN_REVIEW, en una sola
+            # query agregada (sin traer filas de versión con su contenido).
+            from sqlalchemy import case, func
+            max_version_number, in_review_id = (
+                db_session.query(
+                    func.max(DocumentVersion.version_number),
+                    func.max(
+                        case(
+                            (DocumentVersion.version_status == "IN_REVIEW", DocumentVersion.id)
+                        )
+                    ),
+                )
+                .filter(DocumentVersion.document_id == document_id)
+                .one()
+            )
+            version_number = (max_version_number or 0) + 1
+
+            if in_review_id is not None:
+                # Si ya hay IN_REVIEW, el DRAFT queda a la espera (no se envía a revisión)
+                logger.info(f"Ya existe versión IN_REVIEW para documento {document_id}. Creando solo DRAFT.")
+
+            # Crear versión DRAFT; el creador enviará a revisión cuando esté conforme
+            draft_version = DocumentVersion(
+                id=str(uuid.uuid4()),
+                document_id=document_id,
+                run_id=run_id,
+                version_number=version_number,
+                version_status="DRAFT",
+                content_type="generated",
+                content_json=json_content,
+                content_markdown=markdown_content,
+                is_current=False,
+                created_by=user_id,  # Setear created_by para segregación de funciones
+            )
+            db_session.add(draft_version)
+
+            # Dejar documento en draft para que el creador pueda revisar/corregir antes de enviar
+            update_document_status(
+                session=db_session,
+                document_id=document_id,
+                status="draft",
+            )
+
+            # Recalcular uso de storage del tenant (best-effort).
+            from process_ai_core.db.helpers import update_workspace_storage_usage
+            update_workspace_storage_usage(db_session, workspace_id)
+
+            # Un único flush: INSERT de la versión y del audit log y UPDATE del
+            # documento salen juntos (sin flush intermedio por statement).
+            db_session.commit()
+        except Exception as e:
+            # Si falla la creación de versión, dejar en draft
+            logger.error(f"Error al crear versión desde run: {e}", exc_info=True)
+            update_document_status(
+                session=db_session,
+                document_id=document_id,
+                status="draft",
+            )
+            db_session.commit()
+
+    return artifacts
+
+
+def _run_document_pipeline_job(
+    *, temp_dir: Path, run_id: str, mark_running: bool = True, **kwargs
+) -> dict:
+    """
+    Envuelve `_execute_document_run` con el ciclo de vida del run:
+    running → completed | failed, y borra el directorio temporal de uploads.
+
+    `mark_running=False` cuando el run ya se creó como "running" (modo síncrono):
+    ahorra una sesión/transacción propia solo para ese UPDATE.
+    """
+    if mark_running:
+        _set_run_status(run_id, "running")
+    try:
+        return _execute_document_run(run_id=run_id, **kwargs)
+    except Exception:
+        _set_run_status(run_id, "failed")
+        raise
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
 
-        return result
+
+def _run_document_pipeline_background(**kwargs) -> None:
+    """Entrada de BackgroundTasks: no hay request al que propagar el error, solo se loguea."""
+    try:
+        _run_document_pipeline_job(**kwargs)
+    except Exception:
+        logger.exception("Error procesando el pipeline en background (run %s)", kwargs.get("run_id"))
 
 
 @router.post("/{document_id}/runs")
 async def create_document_run(
     document_id: str,
+    background_tasks: BackgroundTasks,
     audio_files: List[UploadFile] = File(default=[]),
     video_files: List[UploadFile] = File(default=[]),
     image_files: List[UploadFile] = File(default=[]),
     text_files: List[UploadFile] = File(default=[]),
     revision_notes: str = Form(""),
     reuse_previous_files: bool = Form(False),
+    run_in_background: bool = Form(False),
     user_id: str = Depends(get_current_user_id),
     ctx: WorkspaceSessionContext = Depends(get_workspace_context),
 ):
@@ -118,9 +482,12 @@ async def create_document_run(
         text_files: Archivos de texto nuevos (opcional; .txt, .md, .pdf, .docx)
         revision_notes: Instrucciones de revisión para el LLM (opcional, ej: "Corregir errores gramaticales")
         reuse_previous_files: Si True, reutiliza archivos del último run (automático si hay revision_notes sin archivos)
+        run_in_background: Si True, responde 202 apenas el run queda registrado y ejecuta
+            el pipeline en background (estado en GET /{document_id}/runs/{run_id})
 
     Returns:
-        ProcessRunResponse con el nuevo run_id y artifacts
+        ProcessRunResponse con el nuevo run_id y artifacts (status="processing" y sin
+        artifacts cuando run_in_background=True)
 
     Notas:
         - Si se proporcionan revision_notes sin archivos nuevos, se reutilizan automáticamente
@@ -128,7 +495,7 @@ async def create_document_run(
         - Las revision_notes se agregan al contexto del prompt para guiar al LLM en las correcciones.
     """
     with get_db_session() as session:
-        doc = session.query(Document).filter_by(id=document_id).first()
+        doc = session.get(Document, document_id)
         if not doc:
             raise HTTPException(
                 status_code=404,
@@ -155,16 +522,13 @@ async def create_document_run(
             )
 
         # Obtener el Process para acceder a los campos específicos
-        process = session.query(Process).filter_by(id=document_id).first()
+        process = session.get(Process, document_id)
         if not process:
             raise HTTPException(
                 status_code=404,
                 detail=f"Process {document_id} no encontrado"
             )
 
-        # Obtener el último run para reutilizar archivos si es necesario
-        last_run = session.query(Run).filter_by(document_id=document_id).order_by(Run.created_at.desc()).first()
-
         # Validar que haya archivos, instrucciones de revisión, o que se puedan reutilizar
         total_new_files = len(audio_files) + len(video_files) + len(image_files) + len(text_files)
         has_revision_notes = revision_notes and revision_notes.strip()
@@ -175,23 +539,41 @@ async def create_document_run(
                 detail="Se requiere al menos un archivo nuevo, instrucciones de revisión, o activar 'reuse_previous_files'"
             )
 
-        # Crear nuevo Run
+        # Último run, solo si hay que reutilizar sus archivos (el caso común —subida
+        # nueva— no lo necesita). Solo el id: alcanza para resolver su directorio.
+        # Debe consultarse ANTES de crear el run nuevo, que pasaría a ser el último.
+        reuse_last_run = total_new_files == 0 and (reuse_previous_files or has_revision_notes)
+        last_run_id = None
+        if reuse_last_run:
+            last_run_id = (
+                session.query(Run.id)
+                .filter(Run.document_id == document_id)
+                .order_by(Run.created_at.desc())
+                .limit(1)
+                .scalar()
+            )
+
+        # Crear nuevo Run: pending hasta que arranque el pipeline en background; en
+        # modo síncrono el pipeline arranca en este mismo request, así que nace
+        # "running" (sin una transacción aparte solo para cambiar el estado).
         run = create_run(
             session=session,
             document_id=document_id,
             domain="process",
             profile=process.audience or "operativo",
+            status="pending" if run_in_background else "running",
         )
-        session.flush()
         run_id = run.id
 
-        # Guardar valores necesarios antes de salir del contexto
+        # Guardar valores necesarios antes de salir del contexto (al cerrar la
+        # sesión las instancias quedan expiradas/detached).
         process_audience = process.audience or "operativo"
         document_name = doc.name
+        doc_workspace_id = doc.workspace_id
 
         # Construir context_block usando los datos del documento
         # Necesitamos obtener el workspace para build_context_block
-        workspace = session.query(Workspace).filter_by(id=doc.workspace_id).first()
+        workspace = session.get(Workspace, doc.workspace_id)
         if not workspace:
             raise HTTPException(
                 status_code=404,
@@ -206,265 +588,105 @@ async def create_document_run(
         )
 
         # Agregar instrucciones de revisión si existen
-        if revision_notes and revision_notes.strip():
-            context_block += "\n=== INSTRUCCIONES DE REVISIÓN ===\n"
-            context_block += revision_notes.strip()
-            context_block += "\n\n"
-            context_block += "IMPORTANTE: Aplica estas correcciones y mejoras al generar el documento.\n\n"
-
-    settings = get_settings()
-
-    # Crear directorio temporal para los uploads
-    with tempfile.TemporaryDirectory() as temp_dir_str:
-        temp_dir = Path(temp_dir_str)
-        raw_assets: List[RawAsset] = []
-
-        # Contadores para IDs deterministas
-        counters = {"audio": 0, "video": 0, "image": 0, "text": 0}
-
-        async def process_files(files: List[UploadFile], kind: str, prefix: str):
-            """Procesa una lista de archivos y los agrega a raw_assets."""
-            if not files:
-                return
-
-            for upload_file in files:
-                ext = Path(upload_file.filename).suffix.lower() if upload_file.filename else ""
-                allowed = ALLOWED_UPLOAD_EXTENSIONS[kind]
-                if ext not in allowed:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=(
-                            f"Extensión no permitida para {kind}: '{ext or '(sin extensión)'}'. "
-                            f"Permitidas: {', '.join(sorted(allowed))}"
-                        ),
-                    )
-
-                counters[kind] += 1
-                asset_id = f"{prefix}{counters[kind]}"
-
-                # Guardar archivo en temp_dir
-                temp_path = temp_dir / f"{asset_id}{ext}"
-
-                # Leer contenido y guardar
-                content = await upload_file.read()
-                temp_path.write_bytes(content)
-
-                # Construir RawAsset
-                titulo = (
-                    Path(upload_file.filename).stem
-                    if upload_file.filename
-                    else f"{kind} {counters[kind]}"
-                )
-
-                raw_assets.append(
-                    RawAsset(
-                        id=asset_id,
-                        kind=kind,  # type: ignore
-                        path_or_url=str(temp_path),
-                        metadata={"titulo": titulo},
-                    )
-                )
-
-        # Procesar archivos nuevos
-        await process_files(audio_files, "audio", "aud")
-        await process_files(video_files, "video", "vid")
-        await process_files(image_files, "image", "img")
-        await process_files(text_files, "text", "txt")
+        if has_revision_notes:
+            context_block += _REVISION_NOTES_BLOCK.format(notes=revision_notes.strip())
+
+        pdf_branding = get_workspace_pdf_branding(session, doc_workspace_id)
+
+    # Directorio temporal para los uploads. No se usa TemporaryDirectory porque en
+    # modo background debe sobrevivir al request: lo borra _run_document_pipeline_job.
+    temp_dir = Path(tempfile.mkdtemp())
+    try:
+        # Validar y nombrar todos los uploads antes de escribir nada; después se
+        # copian todos juntos (cada tipo tiene su propia numeración: aud1, vid1, ...).
+        planned = [
+            item
+            for files, kind, prefix in (
+                (audio_files, "audio", "aud"),
+                (video_files, "video", "vid"),
+                (image_files, "image", "img"),
+                (text_files, "text", "txt"),
+            )
+            for item in _plan_uploads(files, kind, prefix, temp_dir)
+        ]
+        raw_assets: List[RawAsset] = [asset for asset, _upload, _path in planned]
+        await asyncio.gather(*(save_upload(upload, path) for _asset, upload, path in planned))
 
         # Si no hay archivos nuevos y se solicita reutilizar, obtener archivos del último run
-        if total_new_files == 0 and (reuse_previous_files or has_revision_notes) and last_run:
+        if reuse_last_run and last_run_id:
             # Obtener el directorio del último run para descubrir los archivos originales
-            last_run_dir = _run_dir(doc.workspace_id, last_run.id)
-
-            # Buscar archivos en el directorio del último run (assets/, evidence/, etc.)
-            if last_run_dir.exists():
-                # Buscar en subdirectorios comunes
-                possible_dirs = [
-                    last_run_dir / "assets",
-                    last_run_dir / "evidence",
-                    last_run_dir,
-                ]
-
-                for search_dir in possible_dirs:
-                    if search_dir.exists():
-                        discovered = discover_raw_assets(search_dir)
-                        if discovered:
-                            # Convertir los paths absolutos a relativos o copiar a temp_dir
-                            for asset in discovered:
-                                # Copiar el archivo al temp_dir para procesarlo
-                                source_path = Path(asset.path_or_url)
-                                if source_path.exists():
-                                    # Mantener el mismo ID y tipo
-                                    new_path = temp_dir / f"{asset.id}{source_path.suffix}"
-                                    shutil.copy2(source_path, new_path)
-                                    raw_assets.append(
-                                        RawAsset(
-                                            id=asset.id,
-                                            kind=asset.kind,
-                                            path_or_url=str(new_path),
-                                            metadata=asset.metadata,
-                                        )
-                                    )
-                            break
+            last_run_dir = _run_dir(doc_workspace_id, last_run_id)
+
+            # Buscar archivos en el directorio del último run: assets/, luego
+            # evidence/ y si no, todo el run (un solo recorrido del árbol).
+            for asset in discover_raw_assets_in_run(last_run_dir):
+                # Enlazar (o copiar) el archivo al temp_dir para procesarlo
+                source_path = Path(asset.path_or_url)
+                if source_path.exists():
+                    # Mantener el mismo ID y tipo
+                    new_path = temp_dir / f"{asset.id}{source_path.suffix}"
+                    link_or_copy(source_path, new_path)
+                    raw_assets.append(
+                        RawAsset(
+                            id=asset.id,
+                            kind=asset.kind,
+                            path_or_url=str(new_path),
+                            metadata=asset.metadata,
+                        )
+                    )
 
         if not raw_assets and not has_revision_notes:
             raise HTTPException(
                 status_code=400,
                 detail="No se pudo obtener ningún archivo para procesar. Se requieren archivos o instrucciones de revisión."
             )
-
-        # Obtener perfil según audience
-        profile = get_profile(process_audience)
-
-        # Ejecutar pipeline
-        try:
-            output_dir = _run_dir(doc.workspace_id, run_id)
-            output_dir.mkdir(parents=True, exist_ok=True)
-
-            result = run_process_pipeline(
-                process_name=document_name,
-                raw_assets=raw_assets,
-                profile=profile,
-                context_block=context_block,
-                output_base=output_dir,
-            )
-
-            # Persistir artefactos
-            json_path = output_dir / "process.json"
-            md_path = output_dir / "process.md"
-
-            json_path.write_text(result["json_str"], encoding="utf-8")
-            md_path.write_text(result["markdown"], encoding="utf-8")
-
-            # Generar PDF
-            pdf_generated = False
-            try:
-                export_pdf(
-                    run_dir=output_dir,
-                    md_path=md_path,
-                    pdf_name="process.pdf",
-                    branding=get_workspace_pdf_branding(session, doc.workspace_id),
-                )
-                pdf_generated = True
-            except Exception as pdf_error:
-                pass
-
-            # Subir artefactos del run (json/md/pdf + assets) a object storage (no-op en local).
-            from process_ai_core.storage import sync_run_dir_to_storage
-            sync_run_dir_to_storage(doc.workspace_id, run_id, output_dir)
-
-            # Construir URLs firmadas para los artefactos
-            artifacts = {
-                "json": sign_artifact_url(run_id, "process.json", doc.workspace_id),
-                "markdown": sign_artifact_url(run_id, "process.md", doc.workspace_id),
-            }
-            if pdf_generated:
-                artifacts["pdf"] = sign_artifact_url(run_id, "process.pdf", doc.workspace_id)
-
-            # Crear versión IN_REVIEW automáticamente.
-            # Los artefactos del run (json/md/pdf/assets) viven en object storage bajo
-            # la clave {run_id}/...; no se trackean en una tabla (se sirven por convención).
-            with get_db_session() as db_session:
-                from process_ai_core.db.helpers import update_document_status, get_or_create_draft
-                from process_ai_core.db.models import DocumentVersion, Run
-                import uuid
-
-                # Registrar el manifiesto de fuentes (metadata + sha256 + transcripción)
-                # en el Run, para defensa de auditoría antes de que el temp se borre.
-                from process_ai_core.input_manifest import build_input_manifest_json
-                run_row = db_session.query(Run).filter_by(id=run_id).first()
-                if run_row is not None:
-                    run_row.input_manifest_json = build_input_manifest_json(
-                        raw_assets, result.get("enriched_assets"), uploaded_by=user_id
-                    )
-
-                # Crear versión DRAFT desde el run generado y enviarla automáticamente a revisión
-                try:
-                    # Leer el contenido generado
-                    json_content = json_path.read_text(encoding="utf-8")
-                    markdown_content = md_path.read_text(encoding="utf-8")
-
-                    # Obtener número de versión siguiente
-                    last_version = (
-                        db_session.query(DocumentVersion)
-                        .filter_by(document_id=document_id)
-                        .order_by(DocumentVersion.version_number.desc())
-                        .first()
-                    )
-                    version_number = (last_version.version_number + 1) if last_version else 1
-
-                    # Verificar que no haya una versión IN_REVIEW existente
-                    existing_in_review = (
-                        db_session.query(DocumentVersion)
-                        .filter_by(document_id=document_id, version_status="IN_REVIEW")
-                        .first()
-                    )
-
-                    if existing_in_review:
-                        # Si ya hay IN_REVIEW, crear solo DRAFT (no enviar a revisión)
-                        logger.info(f"Ya existe versión IN_REVIEW para documento {document_id}. Creando solo DRAFT.")
-                        draft_version = DocumentVersion(
-                            id=str(uuid.uuid4()),
-                            document_id=document_id,
-                            run_id=run_id,
-                            version_number=version_number,
-                            version_status="DRAFT",
-                            content_type="generated",
-                            content_json=json_content,
-                            content_markdown=markdown_content,
-                            is_current=False,
-                            created_by=user_id,  # Setear created_by para segregación de funciones
-                        )
-                        db_session.add(draft_version)
-                        db_session.flush()
-                    else:
-                        # Crear versión DRAFT; el creador enviará a revisión cuando esté conforme
-                        draft_version = DocumentVersion(
-                            id=str(uuid.uuid4()),
-                            document_id=document_id,
-                            run_id=run_id,
-                            version_number=version_number,
-                            version_status="DRAFT",
-                            content_type="generated",
-                            content_json=json_content,
-                            content_markdown=markdown_content,
-                            is_current=False,
-                            created_by=user_id,  # Setear created_by para segregación de funciones
-                        )
-                        db_session.add(draft_version)
-                        db_session.flush()
-
-                    # Dejar documento en draft para que el creador pueda revisar/corregir antes de enviar
-                    update_document_status(
-                        session=db_session,
-                        document_id=document_id,
-                        status="draft",
-                    )
-
-                    # Recalcular uso de storage del tenant (best-effort).
-                    from process_ai_core.db.helpers import update_workspace_storage_usage
-                    update_workspace_storage_usage(db_session, doc.workspace_id)
-
-                    db_session.commit()
-                except Exception as e:
-                    # Si falla la creación de versión, dejar en draft
-                    logger.error(f"Error al crear versión desde run: {e}", exc_info=True)
-                    update_document_status(
-                        session=db_session,
-                        document_id=document_id,
-                        status="draft",
-                    )
-                    db_session.commit()
-
-            return ProcessRunResponse(
+    except Exception:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        _set_run_status(run_id, "failed")
+        raise
+
+    job_kwargs = dict(
+        temp_dir=temp_dir,
+        document_id=document_id,
+        run_id=run_id,
+        workspace_id=doc_workspace_id,
+        document_name=document_name,
+        process_audience=process_audience,
+        raw_assets=raw_assets,
+        context_block=context_block,
+        pdf_branding=pdf_branding,
+        user_id=user_id,
+    )
+
+    if run_in_background:
+        # Los uploads ya están en disco: el pipeline (LLM + PDF) corre después de
+        # enviar la respuesta, en el threadpool de Starlette.
+        background_tasks.add_task(_run_document_pipeline_background, **job_kwargs)
+        return JSONResponse(
+            status_code=202,
+            content=ProcessRunResponse(
                 run_id=run_id,
                 process_name=document_name,
-                status="completed",
-                artifacts=artifacts,
-            )
+                status="processing",
+                document_id=document_id,
+            ).model_dump(),
+        )
 
-        except Exception as e:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error procesando el pipeline: {str(e)}",
-            ) from e
+    # Ejecutar pipeline en un thread: LLM, render y PDF son bloqueantes y, corriendo
+    # en el event loop, frenarían todos los demás requests del worker.
+    try:
+        artifacts = await asyncio.to_thread(
+            _run_document_pipeline_job, mark_running=False, **job_kwargs
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error procesando el pipeline: {str(e)}",
+        ) from e
+
+    return ProcessRunResponse(
+        run_id=run_id,
+        process_name=document_name,
+        status="completed",
+        artifacts=artifacts,
+    )
@@ -5,6 +5,7 @@ Versiones y flujo de aprobación de un documento:
 - Envío a revisión, cancelación de envío y clonado a borrador.
 """
 
+import asyncio
 import json
 import logging
 import shutil
@@ -16,6 +17,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import Response
 from pydantic import BaseModel
+from sqlalchemy import select
 
 
 class SubmitVersionRequest(BaseModel):
@@ -38,8 +40,10 @@ from process_ai_core.config import get_settings
 from process_ai_core.export import export_pdf_from_content, get_export_content
 
 from api.routes._branding import get_workspace_pdf_branding
+from api.routes._pdf_pool import run_pdf_job
 from api.routes._run_paths import run_dir as _run_dir
 from api.dependencies import get_current_user_id
+from api.responses import OrjsonResponse
 from api.workspace_client import (
     WorkspaceSessionContext,
     get_workspace_context,
@@ -56,6 +60,23 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Como en crud.py (ver _list_documents_pending_approval_sync), los GET de lectura
+# corren su parte sync (SQLAlchemy) en el threadpool vía asyncio.to_thread.
+
+
+def _assert_readable_document(session, document_id: str, ctx: WorkspaceSessionContext) -> None:
+    """404 si el documento no existe; valida que pertenezca al workspace activo.
+
+    Solo lee `workspace_id`: los GET de lectura no necesitan hidratar el Document.
+    """
+    row = session.query(Document.workspace_id).filter_by(id=document_id).first()
+    if row is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Documento {document_id} no encontrado"
+        )
+    _assert_doc_in_active_workspace(row.workspace_id, resolve_tenant_workspace_id(ctx), document_id)
+
 
 @router.get("/{document_id}/versions")
 async def get_document_versions(
@@ -71,42 +92,42 @@ async def get_document_versions(
     Returns:
         Lista de versiones ordenadas por número (más recientes primero)
     """
+    return await asyncio.to_thread(_get_document_versions_sync, document_id, ctx)
+
+
+def _get_document_versions_sync(document_id: str, ctx: WorkspaceSessionContext) -> OrjsonResponse:
     with get_db_session() as session:
-        doc = session.query(Document).filter_by(id=document_id).first()
-        if not doc:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Documento {document_id} no encontrado"
-            )
-        _assert_doc_in_active_workspace(doc.workspace_id, resolve_tenant_workspace_id(ctx), document_id)
+        _assert_readable_document(session, document_id, ctx)
 
         from process_ai_core.db.models import DocumentVersion
 
-        versions = (
-            session.query(DocumentVersion)
-            .filter_by(document_id=document_id)
+        # Solo las columnas del listado: sin content_json/markdown/html (pesados).
+        # .mappings() da cada fila como mapping columna→valor (sin instancias
+        # ORM ni dict armado a mano); las claves del payload son los nombres
+        # de columna, en el orden del SELECT.
+        versions = session.execute(
+            select(
+                DocumentVersion.id,
+                DocumentVersion.version_number,
+                DocumentVersion.version_status,
+                DocumentVersion.content_type,
+                DocumentVersion.run_id,
+                DocumentVersion.validation_id,
+                DocumentVersion.approved_at,
+                DocumentVersion.approved_by,
+                DocumentVersion.rejected_at,
+                DocumentVersion.rejected_by,
+                DocumentVersion.is_current,
+                DocumentVersion.created_by,
+                DocumentVersion.created_at,
+            )
+            .where(DocumentVersion.document_id == document_id)
             .order_by(DocumentVersion.version_number.desc())
-            .all()
-        )
+        ).mappings()
 
-        return [
-            {
-                "id": v.id,
-                "version_number": v.version_number,
-                "version_status": v.version_status,
-                "content_type": v.content_type,
-                "run_id": v.run_id,
-                "validation_id": v.validation_id,
-                "approved_at": v.approved_at.isoformat() if v.approved_at else None,
-                "approved_by": v.approved_by,
-                "rejected_at": v.rejected_at.isoformat() if v.rejected_at else None,
-                "rejected_by": v.rejected_by,
-                "is_current": v.is_current,
-                "created_by": v.created_by,
-                "created_at": v.created_at.isoformat(),
-            }
-            for v in versions
-        ]
+        # OrjsonResponse directo: evita el paso por jsonable_encoder y orjson
+        # serializa los datetime sin .isoformat() por fila.
+        return OrjsonResponse([dict(v) for v in versions])
 
 
 @router.get("/{document_id}/versions/{version_id}/preview-pdf")
@@ -125,7 +146,7 @@ async def get_version_preview_pdf(
     settings = get_settings()
     api_base = settings.api_base_url.rstrip("/")
     with get_db_session() as session:
-        document = session.query(Document).filter_by(id=document_id).first()
+        document = session.get(Document, document_id)
         if document:
             _assert_doc_in_active_workspace(document.workspace_id, resolve_tenant_workspace_id(ctx), document_id)
         version = (
@@ -217,12 +238,9 @@ async def get_version_preview_pdf(
     if run_dir is None:
         run_dir = Path(tempfile.mkdtemp())
 
-    # Ejecutar Pandoc en un thread pool para no bloquear el event loop.
+    # Ejecutar Pandoc en el pool de PDFs para no bloquear el event loop.
     # Si Pandoc corre en el hilo principal (sync), el event loop se congela y
     # el servidor no puede responder los pedidos de imágenes que hace Pandoc → deadlock.
-    import asyncio
-    import concurrent.futures
-
     _run_dir_for_cleanup = run_dir
     _is_temp_dir = not version_run_id
 
@@ -289,8 +307,7 @@ async def get_version_preview_pdf(
         return pdf_bytes
 
     try:
-        loop = asyncio.get_event_loop()
-        pdf_bytes = await loop.run_in_executor(None, _generate_sync)
+        pdf_bytes = await run_pdf_job(_generate_sync)
         return Response(
             content=pdf_bytes,
             media_type="application/pdf",
@@ -328,20 +345,29 @@ async def get_current_document_version(
     Returns:
         Versión actual con JSON y Markdown
     """
+    return await asyncio.to_thread(_get_current_document_version_sync, document_id, ctx)
+
+
+def _get_current_document_version_sync(document_id: str, ctx: WorkspaceSessionContext) -> OrjsonResponse:
     with get_db_session() as session:
-        doc = session.query(Document).filter_by(id=document_id).first()
-        if not doc:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Documento {document_id} no encontrado"
-            )
-        _assert_doc_in_active_workspace(doc.workspace_id, resolve_tenant_workspace_id(ctx), document_id)
+        _assert_readable_document(session, document_id, ctx)
 
         from process_ai_core.db.models import DocumentVersion
 
         current_version = (
-            session.query(DocumentVersion)
+            session.query(
+                DocumentVersion.id,
+                DocumentVersion.version_number,
+                DocumentVersion.content_type,
+                DocumentVersion.run_id,
+                DocumentVersion.content_json,
+                DocumentVersion.content_markdown,
+                DocumentVersion.approved_at,
+                DocumentVersion.approved_by,
+                DocumentVersion.created_at,
+            )
             .filter_by(document_id=document_id, is_current=True)
+            .order_by(DocumentVersion.version_number.desc())
             .first()
         )
 
@@ -351,17 +377,17 @@ async def get_current_document_version(
                 detail=f"No hay versión aprobada para el documento {document_id}"
             )
 
-        return {
+        return OrjsonResponse({
             "id": current_version.id,
             "version_number": current_version.version_number,
             "content_type": current_version.content_type,
             "run_id": current_version.run_id,
             "content_json": current_version.content_json,
             "content_markdown": current_version.content_markdown,
-            "approved_at": current_version.approved_at.isoformat(),
+            "approved_at": current_version.approved_at,
             "approved_by": current_version.approved_by,
-            "created_at": current_version.created_at.isoformat(),
-        }
+            "created_at": current_version.created_at,
+        })
 
 
 @router.get("/{document_id}/audit-log")
@@ -378,38 +404,32 @@ async def get_document_audit_log(
     Returns:
         Lista de registros de auditoría ordenados por fecha (más recientes primero)
     """
+    return await asyncio.to_thread(_get_document_audit_log_sync, document_id, ctx)
+
+
+def _get_document_audit_log_sync(document_id: str, ctx: WorkspaceSessionContext) -> OrjsonResponse:
     with get_db_session() as session:
-        doc = session.query(Document).filter_by(id=document_id).first()
-        if not doc:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Documento {document_id} no encontrado"
-            )
-        _assert_doc_in_active_workspace(doc.workspace_id, resolve_tenant_workspace_id(ctx), document_id)
+        _assert_readable_document(session, document_id, ctx)
 
         from process_ai_core.db.models import AuditLog
 
-        audit_logs = (
-            session.query(AuditLog)
-            .filter_by(document_id=document_id)
+        audit_logs = session.execute(
+            select(
+                AuditLog.id,
+                AuditLog.action,
+                AuditLog.entity_type,
+                AuditLog.entity_id,
+                AuditLog.run_id,
+                AuditLog.user_id,
+                AuditLog.changes_json,
+                AuditLog.metadata_json,
+                AuditLog.created_at,
+            )
+            .where(AuditLog.document_id == document_id)
             .order_by(AuditLog.created_at.desc())
-            .all()
-        )
+        ).mappings()
 
-        return [
-            {
-                "id": log.id,
-                "action": log.action,
-                "entity_type": log.entity_type,
-                "entity_id": log.entity_id,
-                "run_id": log.run_id,
-                "user_id": log.user_id,
-                "changes_json": log.changes_json,
-                "metadata_json": log.metadata_json,
-                "created_at": log.created_at.isoformat(),
-            }
-            for log in audit_logs
-        ]
+        return OrjsonResponse([dict(log) for log in audit_logs])
 
 
 @router.post("/{document_id}/versions/{version_id}/submit")
@@ -444,7 +464,7 @@ async def submit_version_for_review_endpoint(
             )
 
         # Verificar que el documento existe y pertenece al workspace
-        doc = session.query(Document).filter_by(id=document_id).first()
+        doc = session.get(Document, document_id)
         if not doc:
             raise HTTPException(
                 status_code=404,
@@ -519,7 +539,7 @@ async def cancel_submission_endpoint(
                 status_code=403,
                 detail="No tiene permisos para editar documentos"
             )
-        doc = session.query(Document).filter_by(id=document_id).first()
+        doc = session.get(Document, document_id)
         if not doc:
             raise HTTPException(status_code=404, detail="Documento no encontrado")
         _assert_doc_in_active_workspace(doc.workspace_id, workspace_id, document_id)
@@ -574,7 +594,7 @@ async def clone_version_to_draft(
             )
 
         # Verificar que el documento existe y pertenece al workspace
-        doc = session.query(Document).filter_by(id=document_id).first()
+        doc = session.get(Document, document_id)
         if not doc:
             raise HTTPException(
                 status_code=404,
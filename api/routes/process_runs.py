@@ -6,6 +6,7 @@ Este endpoint maneja:
 - GET /api/v1/process-runs/{run_id}: Consultar estado de una corrida
 """
 
+import asyncio
 import tempfile
 import uuid
 from pathlib import Path
@@ -23,7 +24,9 @@ from process_ai_core.upload_validation import ALLOWED_UPLOAD_EXTENSIONS
 
 from ..models.requests import ProcessMode, ProcessRunResponse
 from ._branding import get_run_pdf_branding, get_workspace_pdf_branding
-from ..artifact_signing import sign_artifact_url
+from ._pdf_pool import run_pdf_job
+from ._uploads import save_upload
+from ..artifact_signing import sign_artifact_url, sign_run_artifact_urls
 from api.workspace_client import (
     WorkspaceSessionContext,
     get_workspace_context,
@@ -169,9 +172,8 @@ async def create_process_run(
                 # Guardar archivo en temp_dir
                 temp_path = temp_dir / f"{asset_id}{ext}"
 
-                # Leer contenido y guardar
-                content = await upload_file.read()
-                temp_path.write_bytes(content)
+                # Copiar por bloques (sin cargar el archivo entero en memoria)
+                await save_upload(upload_file, temp_path)
 
                 # Construir RawAsset
                 titulo = (
@@ -232,7 +234,9 @@ async def create_process_run(
             output_dir = _run_dir(workspace_id, run_id)
             output_dir.mkdir(parents=True, exist_ok=True)
 
-            result = run_process_pipeline(
+            # Pipeline y subida a storage en el threadpool; el PDF, en el pool de PDFs.
+            result = await asyncio.to_thread(
+                run_process_pipeline,
                 process_name=process_name,
                 raw_assets=raw_assets,
                 profile=profile,
@@ -268,7 +272,8 @@ async def create_process_run(
 
                 with get_db_session() as session:
                     pdf_branding = get_workspace_pdf_branding(session, workspace_id)
-                export_pdf(
+                await run_pdf_job(
+                    export_pdf,
                     run_dir=output_dir,
                     md_path=md_path,
                     pdf_name="process.pdf",
@@ -282,15 +287,10 @@ async def create_process_run(
             # Subir los artefactos del run (json/md/pdf + assets) a object storage
             # para que el endpoint de artefactos los sirva en prod (no-op en local).
             from process_ai_core.storage import sync_run_dir_to_storage
-            sync_run_dir_to_storage(workspace_id, run_id, output_dir)
+            await asyncio.to_thread(sync_run_dir_to_storage, workspace_id, run_id, output_dir)
 
             # Construir URLs firmadas para los artefactos
-            artifacts = {
-                "json": sign_artifact_url(run_id, "process.json", workspace_id),
-                "markdown": sign_artifact_url(run_id, "process.md", workspace_id),
-            }
-            if pdf_generated:
-                artifacts["pdf"] = sign_artifact_url(run_id, "process.pdf", workspace_id)
+            artifacts = sign_run_artifact_urls(run_id, workspace_id, include_pdf=pdf_generated)
 
             # SOLO AHORA crear Document, Run y Artifacts en BD (transacción atómica)
             # Si algo falla aquí, el pipeline ya se ejecutó exitosamente
@@ -504,16 +504,12 @@ async def get_process_run(
     # Artefactos canónicos: json/md siempre; pdf solo si existe en storage.
     from process_ai_core.storage import get_storage, run_artifact_key
 
-    artifacts = {
-        "json": sign_artifact_url(run_id, "process.json", workspace_id),
-        "markdown": sign_artifact_url(run_id, "process.md", workspace_id),
-    }
     try:
-        if get_storage().exists(run_artifact_key(workspace_id, run_id, "process.pdf")):
-            artifacts["pdf"] = sign_artifact_url(run_id, "process.pdf", workspace_id)
+        pdf_exists = get_storage().exists(run_artifact_key(workspace_id, run_id, "process.pdf"))
     except Exception:
         # La existencia del PDF es best-effort; su ausencia no rompe la respuesta.
-        pass
+        pdf_exists = False
+    artifacts = sign_run_artifact_urls(run_id, workspace_id, include_pdf=pdf_exists)
 
     return ProcessRunResponse(
         run_id=run_id,
@@ -582,7 +578,8 @@ async def generate_pdf_from_run(run_id: str):
         with get_db_session() as session:
             pdf_branding = get_run_pdf_branding(session, run_id)
 
-        pdf_path = export_pdf(
+        pdf_path = await run_pdf_job(
+            export_pdf,
             run_dir=run_dir,
             md_path=md_path,
             pdf_name="process.pdf",
@@ -590,7 +587,7 @@ async def generate_pdf_from_run(run_id: str):
         )
 
         from process_ai_core.storage import sync_run_dir_to_storage
-        sync_run_dir_to_storage(workspace_id_for_signing, run_id, run_dir)
+        await asyncio.to_thread(sync_run_dir_to_storage, workspace_id_for_signing, run_id, run_dir)
 
         pdf_url = sign_artifact_url(run_id, "process.pdf", workspace_id_for_signing)
 
@@ -6,6 +6,7 @@ Este endpoint maneja:
 - GET /api/v1/recipe-runs/{run_id}: Consultar estado de una corrida
 """
 
+import asyncio
 import tempfile
 import uuid
 from pathlib import Path
@@ -20,6 +21,8 @@ from process_ai_core.engine import run_recipe_pipeline
 from process_ai_core.upload_validation import ALLOWED_UPLOAD_EXTENSIONS
 
 from ..models.requests import RecipeMode, RecipeRunResponse
+from ._pdf_pool import run_pdf_job
+from ._uploads import save_upload
 
 router = APIRouter(prefix="/api/v1/recipe-runs", tags=["recipe-runs"])
 
@@ -92,9 +95,8 @@ async def create_recipe_run(
                 # Guardar archivo en temp_dir
                 temp_path = temp_dir / f"{asset_id}{ext}"
 
-                # Leer contenido y guardar
-                content = await upload_file.read()
-                temp_path.write_bytes(content)
+                # Copiar por bloques (sin cargar el archivo entero en memoria)
+                await save_upload(upload_file, temp_path)
 
                 # Construir RawAsset
                 titulo = (
@@ -126,7 +128,9 @@ async def create_recipe_run(
             output_dir = Path(settings.output_dir) / run_id
             output_dir.mkdir(parents=True, exist_ok=True)
 
-            result = run_recipe_pipeline(
+            # Pipeline en el threadpool; el PDF, en el pool de PDFs.
+            result = await asyncio.to_thread(
+                run_recipe_pipeline,
                 recipe_name=recipe_name,
                 raw_assets=raw_assets,
                 profile=profile,
@@ -147,7 +151,9 @@ async def create_recipe_run(
             try:
                 from process_ai_core.export import export_pdf
 
-                export_pdf(run_dir=output_dir, md_path=md_path, pdf_name="recipe.pdf")
+                await run_pdf_job(
+                    export_pdf, run_dir=output_dir, md_path=md_path, pdf_name="recipe.pdf"
+                )
                 pdf_generated = True
             except Exception as pdf_error:
                 # PDF opcional, no fallamos si no se puede generar
@@ -272,7 +278,8 @@ async def generate_pdf_from_run(run_id: str):
     try:
         from process_ai_core.export import export_pdf
 
-        pdf_path = export_pdf(
+        pdf_path = await run_pdf_job(
+            export_pdf,
             run_dir=run_dir,
             md_path=md_path,
             pdf_name="recipe.pdf",
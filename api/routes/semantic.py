@@ -148,14 +148,40 @@ def _get_knowledge_object_or_404(session: Session, ko_id: str, workspace_id: str
     return ko
 
 
-def _target_response(session: Session, relation: DocumentRelation) -> RelationTargetResponse:
+def _target_names(session: Session, relations: list[DocumentRelation]) -> dict[str, str]:
+    """Nombres de los destinos de `relations` con dos queries de columnas (sin N+1)."""
+    doc_ids = {r.target_id for r in relations if r.target_type == "document"}
+    ko_ids = {r.target_id for r in relations if r.target_type != "document"}
+    names: dict[str, str] = {}
+    if doc_ids:
+        names.update(
+            session.query(Document.id, Document.name).filter(Document.id.in_(doc_ids)).all()
+        )
+    if ko_ids:
+        names.update(
+            session.query(KnowledgeObject.id, KnowledgeObject.canonical_name)
+            .filter(KnowledgeObject.id.in_(ko_ids))
+            .all()
+        )
+    return names
+
+
+def _target_response(
+    session: Session,
+    relation: DocumentRelation,
+    names: dict[str, str] | None = None,
+) -> RelationTargetResponse:
+    """Destino de la relación; `names` (de `_target_names`) evita la query por fila."""
+    if names is None:
+        names = _target_names(session, [relation])
+    name = names.get(relation.target_id)
     if relation.target_type == "document":
-        doc = session.query(Document).filter_by(id=relation.target_id).first()
-        name = doc.name if doc else "(documento eliminado)"
-        return RelationTargetResponse(id=relation.target_id, type="documento", name=name)
-    ko = session.query(KnowledgeObject).filter_by(id=relation.target_id).first()
-    name = ko.canonical_name if ko else "(entidad eliminada)"
-    return RelationTargetResponse(id=relation.target_id, type=relation.target_type, name=name)
+        return RelationTargetResponse(
+            id=relation.target_id, type="documento", name=name or "(documento eliminado)"
+        )
+    return RelationTargetResponse(
+        id=relation.target_id, type=relation.target_type, name=name or "(entidad eliminada)"
+    )
 
 
 def _ko_response(ko: KnowledgeObject) -> KnowledgeObjectResponse:
@@ -198,6 +224,7 @@ async def get_document_relations(
     relations = query.order_by(DocumentRelation.created_at).all()
 
     service = RelationService()
+    names = _target_names(session, relations)
     groups: dict[str, list[RelationItemResponse]] = {}
     for rel in relations:
         possible_duplicate = None
@@ -212,7 +239,7 @@ async def get_document_relations(
         groups.setdefault(rel.relation_type, []).append(
             RelationItemResponse(
                 id=rel.id,
-                target=_target_response(session, rel),
+                target=_target_response(session, rel, names),
                 confidence=rel.confidence,
                 status=rel.status,
                 evidence_text=rel.evidence_text,
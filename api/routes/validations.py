@@ -10,6 +10,8 @@ Este modulo maneja:
 Nota: Los endpoints de versiones (submit, clone) estan en api/routes/documents.py
 """
 
+import asyncio
+
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Body
 from typing import Optional, List
 from pydantic import BaseModel
@@ -73,6 +75,22 @@ class ValidationResponse(BaseModel):
     completed_at: Optional[str] = None
 
 
+def _approve_and_freeze(session: Session, validation_id: str, approver_id: str):
+    """
+    Aprueba la versión de la validación y congela su PDF (best-effort).
+
+    Síncrono: los handlers lo corren con `asyncio.to_thread`, así el render del
+    PDF (y la espera por el pool de PDFs) no bloquea el event loop.
+    """
+    approved_version = approve_version(
+        session=session,
+        validation_id=validation_id,
+        approver_id=approver_id,
+    )
+    freeze_approved_pdf(session, approved_version)
+    return approved_version
+
+
 # ============================================================
 # Endpoints
 # ============================================================
@@ -267,13 +285,10 @@ async def approve_document_validation_direct(
     
     # Aprobar version usando el helper existente
     try:
-        approved_version = approve_version(
-            session=session,
-            validation_id=version.validation_id,
-            approver_id=user_id,
+        # Congela el PDF aprobado (best-effort); en el threadpool por el render.
+        approved_version = await asyncio.to_thread(
+            _approve_and_freeze, session, version.validation_id, user_id
         )
-        # Congelar el PDF aprobado como artefacto de auditoría (best-effort).
-        freeze_approved_pdf(session, approved_version)
         session.commit()
         session.refresh(doc)
 
@@ -485,13 +500,10 @@ async def approve_document_validation(
         
         # Aprobar version usando el nuevo helper
         try:
-            approved_version = approve_version(
-                session=session,
-                validation_id=validation_id,
-                approver_id=user_id,
+            # Congela el PDF aprobado (best-effort); en el threadpool por el render.
+            approved_version = await asyncio.to_thread(
+                _approve_and_freeze, session, validation_id, user_id
             )
-            # Congelar el PDF aprobado como artefacto de auditoría (best-effort).
-            freeze_approved_pdf(session, approved_version)
             session.commit()
             session.refresh(validation)
 
@@ -56,20 +56,26 @@ def build_assets_block(
 
 
 def inject_assets_into_json(
-    json_str: str,
+    json_str: str | Dict[str, Any],
     images_by_step: Optional[Dict[int, List[Dict[str, str]]]],
     evidence_images: Optional[List[Dict[str, str]]],
 ) -> str:
     """
     Devuelve `json_str` enriquecido con el bloque `assets`. Best-effort: si el JSON no
     parsea, devuelve el original sin tocar (no rompe el pipeline).
+
+    Acepta también el dict ya parseado (no se modifica), para no volver a parsear
+    un JSON que el llamador ya decodificó.
     """
-    try:
-        data = json.loads(json_str)
-        if not isinstance(data, dict):
+    if isinstance(json_str, dict):
+        data = dict(json_str)
+    else:
+        try:
+            data = json.loads(json_str)
+            if not isinstance(data, dict):
+                return json_str
+        except (json.JSONDecodeError, TypeError):
             return json_str
-    except (json.JSONDecodeError, TypeError):
-        return json_str
 
     data["assets"] = build_assets_block(images_by_step, evidence_images)
     return json.dumps(data, ensure_ascii=False, indent=2)
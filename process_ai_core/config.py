@@ -99,6 +99,11 @@ class Settings:
     openai_timeout_seconds: float = 600.0
     openai_max_retries: int = 3
 
+    # Máximo de llamadas a IA independientes en vuelo dentro de un mismo run
+    # (transcripción por audio, selección de frame por paso de video). Cada llamada
+    # tiene un overhead fijo (red + cola del proveedor) que se solapa en vez de sumarse.
+    media_llm_concurrency: int = 4
+
     # I/O
     input_dir: str = "input"
     output_dir: str = "output"
@@ -110,6 +115,10 @@ class Settings:
     # URL base de la API (para construir URLs absolutas en HTML/PDF)
     api_base_url: str = "http://localhost:8000"
 
+    # Renders de PDF (Pandoc/LaTeX, WeasyPrint) en paralelo por proceso. Cada uno
+    # es CPU/memoria intensivo: acotarlos evita que el autosave sature el worker.
+    pdf_render_workers: int = 2
+
     # Firma de URLs de artefactos (HMAC-SHA256)
     # En producción DEBE setearse con ARTIFACT_SIGNING_SECRET; vacío solo se acepta en local/test.
     artifact_signing_secret: str = ""
@@ -205,6 +214,7 @@ def get_settings() -> Settings:
     return Settings(
         openai_api_key=os.getenv("OPENAI_API_KEY", ""),
         api_base_url=os.getenv("API_BASE_URL", "http://localhost:8000"),
+        pdf_render_workers=int(os.getenv("PDF_RENDER_WORKERS", "2")),
         artifact_signing_secret=os.getenv("ARTIFACT_SIGNING_SECRET", ""),
         artifact_url_ttl_seconds=int(os.getenv("ARTIFACT_URL_TTL_SECONDS", "900")),
         storage_backend=os.getenv("STORAGE_BACKEND", "local"),
@@ -234,6 +244,7 @@ def get_settings() -> Settings:
         ),
         openai_timeout_seconds=float(os.getenv("OPENAI_TIMEOUT_SECONDS", "600")),
         openai_max_retries=int(os.getenv("OPENAI_MAX_RETRIES", "3")),
+        media_llm_concurrency=int(os.getenv("MEDIA_LLM_CONCURRENCY", "4")),
 
         # OCR local (Tesseract)
         tesseract_cmd=os.getenv("TESSERACT_CMD", ""),
@@ -9,6 +9,7 @@ from dotenv import load_dotenv
 from sqlalchemy import MetaData, create_engine, event
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.pool import StaticPool
 
 """
 process_ai_core.database
@@ -136,19 +137,32 @@ def get_db_engine(echo: bool = False):
 
     if _engine is None:
         env = os.getenv("ENVIRONMENT", "local").lower()
-        pool_pre_ping = os.getenv("DB_POOL_PRE_PING", "false" if env == "local" else "true").lower() == "true"
-        pool_size = int(os.getenv("DB_POOL_SIZE", "5"))
-        max_overflow = int(os.getenv("DB_MAX_OVERFLOW", "10"))
 
         engine_kwargs: dict = {
             "echo": echo,
             "future": True,
-            "pool_size": pool_size,
-            "max_overflow": max_overflow,
-            "pool_recycle": 300,
         }
+        if DATABASE_URL.startswith("sqlite"):
+            # Tests: los handlers corren la sesión en el threadpool, así que la
+            # conexión se comparte entre threads. Con :memory: además tiene que ser
+            # UNA sola conexión (StaticPool); si no, cada thread vería una base vacía.
+            engine_kwargs["connect_args"] = {"check_same_thread": False}
+            if ":memory:" in DATABASE_URL:
+                engine_kwargs["poolclass"] = StaticPool
+        else:
+            # QueuePool explícito. Con los handlers delegando la sesión al threadpool
+            # (hasta 40 threads de anyio) el default de 5 conexiones hacía cola.
+            # pool_recycle corto: el pooler de Supabase corta conexiones ociosas.
+            engine_kwargs.update(
+                pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+                max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+                pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "30")),
+                pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "300")),
+            )
         if DATABASE_URL.startswith("postgresql"):
-            engine_kwargs["pool_pre_ping"] = pool_pre_ping
+            engine_kwargs["pool_pre_ping"] = (
+                os.getenv("DB_POOL_PRE_PING", "false" if env == "local" else "true").lower() == "true"
+            )
             # connect_timeout evita que un connect lento/colgado (ej. pooler ocupado)
             # bloquee el arranque: el warmup de startup está envuelto en try/except, así
             # que un timeout rápido deja que uvicorn bindee el puerto igual.
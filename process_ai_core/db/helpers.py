@@ -459,9 +459,13 @@ def create_run(
     domain: str,
     profile: str = "",
     run_id: str | None = None,
+    status: str = "completed",
 ) -> "Run":
     """
     Crea un Run (ejecución del pipeline).
+
+    El id se genera del lado de Python, así que `run.id` se puede leer sin
+    flushear: el INSERT sale con el commit de la sesión.
     
     Args:
         session: Sesión de base de datos
@@ -469,6 +473,7 @@ def create_run(
         domain: Tipo de documento ("process" | "recipe" | ...)
         profile: Perfil usado
         run_id: ID opcional para el run (si no se proporciona, se genera uno)
+        status: Estado inicial (pending para la generación en background)
     
     Returns:
         Run creado
@@ -479,6 +484,7 @@ def create_run(
         document_id=document_id,
         domain=domain,
         profile=profile,
+        status=status,
     )
     session.add(run)
     return run
@@ -729,24 +735,27 @@ def get_or_create_draft(
     from process_ai_core.db.models import DocumentVersion, Document
     from sqlalchemy.exc import IntegrityError
     
-    # Validar que NO exista IN_REVIEW (raise inmediato)
-    in_review = (
+    # IN_REVIEW y DRAFT en una sola query (ordenadas por version_number DESC):
+    # son pocas filas y evita un round trip por cada chequeo.
+    open_versions = (
         session.query(DocumentVersion)
-        .filter_by(document_id=document_id, version_status="IN_REVIEW")
-        .first()
+        .filter(
+            DocumentVersion.document_id == document_id,
+            DocumentVersion.version_status.in_(("IN_REVIEW", "DRAFT")),
+        )
+        .order_by(DocumentVersion.version_number.desc())
+        .all()
     )
+
+    # Validar que NO exista IN_REVIEW (raise inmediato)
+    in_review = next((v for v in open_versions if v.version_status == "IN_REVIEW"), None)
     if in_review:
         raise ValueError(
             f"No se puede crear DRAFT: el documento {document_id} tiene una versión IN_REVIEW (v{in_review.version_number})"
         )
     
-    # Buscar DRAFT existente (ordenar por version_number DESC)
-    existing_drafts = (
-        session.query(DocumentVersion)
-        .filter_by(document_id=document_id, version_status="DRAFT")
-        .order_by(DocumentVersion.version_number.desc())
-        .all()
-    )
+    # DRAFT existentes (ya ordenados por version_number DESC)
+    existing_drafts = open_versions
     
     if existing_drafts:
         # Si hay más de uno, loggear warning y devolver el más nuevo
@@ -1136,6 +1145,9 @@ def approve_version(
     if previous_current:
         previous_current.is_current = False
         previous_current.version_status = "OBSOLETE"
+        # uq_document_one_current se chequea fila a fila: la baja de la vigente
+        # anterior tiene que llegar a la DB antes de marcar la nueva.
+        session.flush()
     
     # Cambiar versión a APPROVED
     version.version_status = "APPROVED"
@@ -1484,7 +1496,9 @@ def update_document_status(
     Returns:
         Document actualizado
     """
-    document = session.query(Document).filter_by(id=document_id).first()
+    # session.get: si el documento ya está en la sesión (handlers que lo cargaron
+    # para validar permisos) no se vuelve a consultar.
+    document = session.get(Document, document_id)
     if not document:
         raise ValueError(f"Documento {document_id} no encontrado")
     
@@ -1797,7 +1811,9 @@ def prune_orphan_artifacts(session: Session, dry_run: bool = True) -> dict:
     doc_ws: dict[str, str] = {}   # doc_id -> ws
     flat_keys: list[str] = []
     for b in objects:
-        parts = b.key.split("/")
+        # Solo interesan los 4 primeros segmentos (workspaces/{ws}/{kind}/{id}):
+        # maxsplit evita partir la clave entera de cada objeto del bucket.
+        parts = b.key.split("/", 4)
         if len(parts) < 4 or parts[0] != "workspaces":
             flat_keys.append(b.key)
             continue
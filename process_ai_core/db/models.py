@@ -10,7 +10,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime, UTC
 
-from sqlalchemy import String, DateTime, ForeignKey, Text, Integer, Float, Boolean
+from sqlalchemy import String, DateTime, ForeignKey, Text, Integer, Float, Boolean, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .database import Base
@@ -121,6 +121,13 @@ class Document(Base):
     versions: Mapped[list["DocumentVersion"]] = relationship("DocumentVersion", foreign_keys="[DocumentVersion.document_id]")
     approved_version: Mapped["DocumentVersion | None"] = relationship("DocumentVersion", foreign_keys=[approved_version_id], post_update=True)
 
+    # Listados por workspace: pending-approval / to-review filtran por status y
+    # GET /documents por domain (+ status opcional); todos ordenan por created_at.
+    __table_args__ = (
+        Index("ix_documents_ws_status_created", "workspace_id", "status", "created_at"),
+        Index("ix_documents_ws_domain_created", "workspace_id", "domain", "created_at"),
+    )
+
     # Configuración de herencia polimórfica
     __mapper_args__ = {
         "polymorphic_identity": "document",
@@ -509,6 +516,13 @@ class Run(Base):
     model_transcribe: Mapped[str] = mapped_column(String(100), default="")
 
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    # Estado de la ejecución: pending | running | completed | failed.
+    # POST /documents/{id}/runs crea el run en "pending" (run_in_background) o directo
+    # en "running" (sincrónico) y lo pasa a completed | failed al terminar el pipeline.
+    # Los runs que se registran con los artefactos ya escritos (patch con IA,
+    # /process-runs) quedan en el default "completed".
+    status: Mapped[str] = mapped_column(String(20), default="completed", server_default="completed")
     
     # Validación asociada (opcional)
     validation_id: Mapped[str | None] = mapped_column(String(36), ForeignKey("validations.id"), nullable=True, index=True)
@@ -520,6 +534,11 @@ class Run(Base):
     document: Mapped["Document"] = relationship(back_populates="runs")
     validation: Mapped["Validation | None"] = relationship("Validation", foreign_keys=[validation_id])
 
+    # GET /documents/{id}/runs y el último run a reutilizar: document_id + created_at DESC.
+    __table_args__ = (
+        Index("ix_runs_document_created", "document_id", "created_at"),
+    )
+
 
 class Validation(Base):
     """
@@ -614,8 +633,27 @@ class DocumentVersion(Base):
     ENFORCE DB:
     - Índice único parcial: uq_document_one_draft (1 solo DRAFT por document_id)
     - Índice único parcial: uq_document_one_in_review (1 solo IN_REVIEW por document_id)
+    - Índice único parcial: uq_document_one_current (1 sola versión is_current por document_id)
     """
     __tablename__ = "document_versions"
+    __table_args__ = (
+        Index(
+            "uq_document_one_current",
+            "document_id",
+            unique=True,
+            postgresql_where=text("is_current"),
+            sqlite_where=text("is_current"),
+        ),
+        # DRAFT / IN_REVIEW de un documento y el siguiente version_number: filtro por
+        # document_id + version_status y orden por version_number en el mismo índice.
+        Index(
+            "ix_document_versions_doc_status_number",
+            "document_id",
+            "version_status",
+            "version_number",
+            postgresql_include=["id"],
+        ),
+    )
     
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)
     document_id: Mapped[str] = mapped_column(String(36), ForeignKey("documents.id", ondelete="CASCADE"), nullable=False, index=True)
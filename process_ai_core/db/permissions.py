@@ -9,6 +9,10 @@ Este módulo proporciona funciones para:
 
 from __future__ import annotations
 
+import os
+import time
+
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 from .models import (
@@ -18,6 +22,62 @@ from .models import (
 from .helpers import get_folder_by_id
 
 
+# ---------------------------------------------------------------------------
+# Caché de has_permission
+# ---------------------------------------------------------------------------
+# Cada chequeo cuesta 3–4 queries (superadmin, membership, rol, permisos) y los
+# handlers lo repiten en cada request (y can_view_folder por carpeta). Los permisos
+# cambian poco: se cachea el resultado por (user, workspace, permiso) con TTL corto
+# y se invalida todo en cuanto se comitea un cambio de membership/rol/permiso.
+
+_PERMISSION_CACHE_MAX_ENTRIES = 10_000
+_permission_cache: dict[tuple[str, str, str], tuple[bool, float]] = {}
+
+# Entidades cuya modificación puede cambiar el resultado de has_permission.
+_PERMISSION_ENTITIES = (Role, Permission, RolePermission, WorkspaceMembership)
+
+
+def _permission_cache_ttl() -> float:
+    raw = os.getenv("PERMISSION_CACHE_TTL_SECONDS", "").strip()
+    if not raw:
+        return 30.0
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return 30.0
+
+
+def clear_permission_cache() -> None:
+    """Vacía la caché de permisos (cambios de roles fuera del ORM, tests)."""
+    _permission_cache.clear()
+
+
+# Se marca la sesión en el flush y se vacía la caché recién en el commit: si se
+# vaciara en el flush, otro request podría volver a cachear el estado viejo (aún
+# comiteado) antes de que la transacción termine. Mientras tanto, esa sesión
+# consulta sin caché para ver sus propios cambios.
+_PERMISSION_CACHE_DIRTY = "permission_cache_dirty"
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_permission_cache_dirty_on_flush(session, flush_context) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, _PERMISSION_ENTITIES):
+            session.info[_PERMISSION_CACHE_DIRTY] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_permission_cache_on_commit(session) -> None:
+    if session.info.pop(_PERMISSION_CACHE_DIRTY, False):
+        _permission_cache.clear()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_permission_cache_dirty_on_rollback(session) -> None:
+    session.info.pop(_PERMISSION_CACHE_DIRTY, None)
+
+
 def has_permission(
     session: Session,
     user_id: str,
@@ -28,7 +88,11 @@ def has_permission(
     """
     Verifica si un usuario tiene un permiso específico en un workspace.
 
-    Los superadmins tienen todos los permisos automáticamente.
+    Los superadmins tienen todos los permisos automáticamente. El resultado se
+    cachea por (user_id, workspace_id, permission_name) durante
+    PERMISSION_CACHE_TTL_SECONDS (default 30s; 0 desactiva la caché). La caché es
+    por proceso: un cambio de rol la invalida al comitear solo en el proceso que
+    lo hizo; con varios workers de uvicorn, los demás lo ven tras el TTL.
 
     Args:
         session: Sesión de base de datos
@@ -47,6 +111,33 @@ def has_permission(
     if platform_is_superadmin:
         return True
 
+    # La sesión tiene cambios de permisos sin comitear (p. ej. el sync de membership
+    # del request): se consulta sin caché, ni leerla ni escribirla.
+    if session.info.get(_PERMISSION_CACHE_DIRTY):
+        return _has_permission_uncached(session, user_id, workspace_id, permission_name)
+
+    ttl = _permission_cache_ttl()
+    key = (user_id, workspace_id, permission_name)
+    now = time.monotonic()
+    entry = _permission_cache.get(key)
+    if entry is not None and now - entry[1] <= ttl:
+        return entry[0]
+
+    allowed = _has_permission_uncached(session, user_id, workspace_id, permission_name)
+    if ttl > 0:
+        if len(_permission_cache) >= _PERMISSION_CACHE_MAX_ENTRIES:
+            _permission_cache.clear()
+        _permission_cache[key] = (allowed, now)
+    return allowed
+
+
+def _has_permission_uncached(
+    session: Session,
+    user_id: str,
+    workspace_id: str,
+    permission_name: str,
+) -> bool:
+    """Regla de `has_permission` sin caché (el bypass por claim ya se resolvió allí)."""
     # Fallback legacy: superadmin por membership local (workspace 'sistema')
     # Se mantiene para compatibilidad mientras se ejecuta el script de cleanup.
     superadmin_role = session.query(Role).filter_by(name="superadmin", is_system=True).first()
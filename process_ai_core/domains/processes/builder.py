@@ -6,7 +6,7 @@ Implementa DocumentBuilder para construir prompts y parsear JSON de procesos.
 
 from __future__ import annotations
 
-import json
+import orjson
 from typing import List
 
 from ...domain_models import EnrichedAsset, VideoRef
@@ -134,23 +134,27 @@ class ProcessBuilder:
 
         return "\n".join(parts)
 
-    def validate_document(self, json_str: str) -> ProcessDocumentSchema:
+    def validate_document(self, json_str: str | dict) -> ProcessDocumentSchema:
         """
         Valida estructuralmente el JSON del LLM contra el esquema estricto.
 
+        Acepta el texto JSON o el dict ya decodificado (p.ej. el body de un
+        request, para no re-serializarlo solo para volver a parsearlo).
+
         Lanza `json.JSONDecodeError` si el texto no es JSON y
         `pydantic.ValidationError` si la estructura no respeta el esquema
         (p.ej. `pasos` que no es una lista). Devuelve el esquema validado y
         normalizado (strings recortados, defaults aplicados).
         """
-        data = json.loads(json_str)
+        # orjson.JSONDecodeError es subclase de json.JSONDecodeError.
+        data = json_str if isinstance(json_str, dict) else orjson.loads(json_str)
         return ProcessDocumentSchema.model_validate(data)
 
     def is_document_usable(self, doc: ProcessDocument) -> bool:
         """True si el documento es servible (tiene al menos un paso u objetivo)."""
         return bool(doc.pasos) or bool(doc.objetivo.strip())
 
-    def parse_document(self, json_str: str) -> ProcessDocument:
+    def parse_document(self, json_str: str | dict) -> ProcessDocument:
         """
         Parsea el JSON devuelto por el LLM a un ProcessDocument.
 
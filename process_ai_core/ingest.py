@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import json
+import os
+import time
+from dataclasses import replace
 from pathlib import Path
 from typing import Dict, List, Tuple
 
@@ -166,23 +169,109 @@ def discover_raw_assets(input_dir: Path) -> List[RawAsset]:
     if not input_dir.exists():
         return []
 
-    # Recolectamos todos los archivos soportados
-    found: List[Tuple[str, Path]] = []
+    return _build_raw_assets(_scan_supported_files(input_dir))
 
-    for p in input_dir.rglob("*"):
-        if not p.is_file():
-            continue
 
-        # Ignoramos sidecars explícitamente
-        if p.suffix.lower() == ".json":
-            continue
+# Caché de `discover_raw_assets_in_run`: al iterar revisiones sobre el mismo run
+# base se vuelve a descubrir el mismo árbol en cada corrida. La clave incluye el
+# mtime de `run_dir` y de los subdirectorios preferidos, así que agregar o quitar
+# archivos ahí la invalida; el TTL acota lo que no se ve (subcarpetas anidadas).
+_RUN_ASSETS_TTL = 300.0
+_RUN_ASSETS_MAX_ENTRIES = 256
+_run_assets_cache: Dict[tuple, Tuple[List[RawAsset], float]] = {}
+
 
-        kind = _kind_from_ext(p.suffix)
-        if kind:
-            found.append((kind, p))
+def _run_assets_cache_key(run_dir: Path, preferred_subdirs: Tuple[str, ...]) -> tuple:
+    mtimes = []
+    for path in (run_dir, *(run_dir / name for name in preferred_subdirs)):
+        try:
+            mtimes.append(path.stat().st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return (str(run_dir), preferred_subdirs, tuple(mtimes))
 
+
+def discover_raw_assets_in_run(
+    run_dir: Path,
+    preferred_subdirs: Tuple[str, ...] = ("assets", "evidence"),
+) -> List[RawAsset]:
+    """
+    Descubre los insumos de una corrida previa con un único recorrido de `run_dir`.
+
+    Equivale a probar `discover_raw_assets` sobre cada subdirectorio de
+    `preferred_subdirs` (en orden) y, si ninguno tiene archivos soportados,
+    sobre `run_dir` completo; pero sin volver a recorrer el mismo árbol en
+    cada intento. El resultado se memoiza por (directorio, mtimes) durante
+    unos minutos; se devuelven copias, así que el caller puede modificarlas.
+    """
+    run_dir = Path(run_dir)
+    if not run_dir.exists():
+        return []
+
+    key = _run_assets_cache_key(run_dir, preferred_subdirs)
+    entry = _run_assets_cache.get(key)
+    if entry is not None and time.monotonic() - entry[1] <= _RUN_ASSETS_TTL:
+        assets = entry[0]
+    else:
+        assets = _discover_raw_assets_in_run(run_dir, preferred_subdirs)
+        if len(_run_assets_cache) >= _RUN_ASSETS_MAX_ENTRIES:
+            # dict preserva el orden de inserción: se descarta la entrada más vieja.
+            del _run_assets_cache[next(iter(_run_assets_cache))]
+        _run_assets_cache[key] = (assets, time.monotonic())
+
+    return [replace(a, metadata=dict(a.metadata)) for a in assets]
+
+
+def _discover_raw_assets_in_run(
+    run_dir: Path, preferred_subdirs: Tuple[str, ...]
+) -> List[RawAsset]:
+    found = _scan_supported_files(run_dir)
+    for name in preferred_subdirs:
+        sub = run_dir / name
+        bucket = [(kind, p) for kind, p in found if sub in p.parents]
+        if bucket:
+            return _build_raw_assets(bucket)
+    return _build_raw_assets(found)
+
+
+def _scan_supported_files(root: Path) -> List[Tuple[str, Path]]:
+    """
+    Recorre `root` recursivamente (os.scandir) y devuelve `(kind, path)` de
+    los archivos soportados, ignorando sidecars `.json`.
+
+    `DirEntry.is_file()/is_dir()` reutilizan el tipo que devuelve el listado
+    del directorio, así que no hace un `stat` por archivo como `rglob`.
+    """
+    found: List[Tuple[str, Path]] = []
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(entry.path)
+                continue
+            if not entry.is_file():
+                continue
+
+            ext = os.path.splitext(entry.name)[1].lower()
+            # Ignoramos sidecars explícitamente
+            if ext == ".json":
+                continue
+
+            kind = _kind_from_ext(ext)
+            if kind:
+                found.append((kind, Path(entry.path)))
+    return found
+
+
+def _build_raw_assets(found: List[Tuple[str, Path]]) -> List[RawAsset]:
+    """Ordena los archivos encontrados y construye los `RawAsset` con IDs por tipo."""
     # Orden estable → IDs consistentes entre corridas
-    found.sort(key=lambda t: (t[0], str(t[1]).lower()))
+    found = sorted(found, key=lambda t: (t[0], str(t[1]).lower()))
 
     counters = {
         "audio": 0,
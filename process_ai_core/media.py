@@ -33,6 +33,7 @@ La función principal `enrich_assets` devuelve **tres estructuras**:
 import logging
 import shutil
 import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
@@ -298,6 +299,26 @@ def _join_segments_text(segments: List[Dict[str, Any]]) -> str:
     return " ".join(out).strip()
 
 
+# ============================================================
+# Llamadas a IA en paralelo
+# ============================================================
+
+def _run_llm_calls(calls: List[Tuple[Any, tuple]], max_workers: int) -> List[Future]:
+    """
+    Ejecuta llamadas a IA independientes en un pool acotado y espera a que terminen.
+
+    Cada llamada (transcripción, selección de frame) paga un overhead fijo de red y
+    cola del proveedor; lanzarlas juntas lo solapa en vez de sumarlo. Devuelve los
+    futures en el mismo orden que `calls`: `.result()` re-lanza la excepción de esa
+    llamada, así el llamador conserva su manejo de errores por asset/paso.
+    """
+    if not calls:
+        return []
+    workers = max(1, min(max_workers, len(calls)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return [pool.submit(fn, *args) for fn, args in calls]
+
+
 # ============================================================
 # API principal
 # ============================================================
@@ -356,6 +377,18 @@ def enrich_assets(
         f"text={counts.get('text', 0)}"
     )
 
+    # Transcripciones de audio: independientes entre sí, se lanzan todas juntas
+    # antes de recorrer los assets (el orden del resultado no cambia).
+    llm_concurrency = settings.media_llm_concurrency
+    pending_audio = [
+        a for a in raw_assets
+        if a.kind == "audio" and not (a.metadata.get("extracted_text_override") or "").strip()
+    ]
+    audio_futures = dict(zip(
+        (id(a) for a in pending_audio),
+        _run_llm_calls([(transcribe_audio, (a.path_or_url,)) for a in pending_audio], llm_concurrency),
+    ))
+
     for a in raw_assets:
         path = a.path_or_url
 
@@ -364,7 +397,7 @@ def enrich_assets(
         # ----------------------------
         if a.kind == "audio":
             override = (a.metadata.get("extracted_text_override") or "").strip()
-            extracted = override if override else transcribe_audio(path)
+            extracted = override if override else audio_futures[id(a)].result()
             print(f"🎧 Transcripción de {a.id}:\n{extracted}\n{'-'*60}")
             enriched.append(
                 EnrichedAsset(
@@ -471,6 +504,8 @@ def enrich_assets(
                 frames_dir.mkdir(parents=True, exist_ok=True)
 
                 print(f"🧩 Pasos inferidos para {a.id}: {len(planned_steps)}")
+                # 1) Extraer candidatos de todos los pasos (ffmpeg, local)
+                step_candidates: List[Tuple[int, str, List[str]]] = []
                 for st in planned_steps:
                     if isinstance(st, dict):
                         order = int(st.get("order", 0) or 0)
@@ -497,8 +532,16 @@ def enrich_assets(
                     if not candidate_paths:
                         continue
 
+                    step_candidates.append((order, summary, candidate_paths))
+
+                # 2) Selección con IA de todos los pasos en paralelo; se consume en orden
+                frame_futures = _run_llm_calls(
+                    [(select_best_frame_for_step, (summary, paths)) for _, summary, paths in step_candidates],
+                    llm_concurrency,
+                )
+                for (order, summary, candidate_paths), future in zip(step_candidates, frame_futures):
                     try:
-                        choice = select_best_frame_for_step(summary, candidate_paths)
+                        choice = future.result()
                         if isinstance(choice, dict):
                             idx = int(choice.get("selected_index", -1))
                             title = str(choice.get("title", "")).strip() or summary
@@ -38,15 +38,92 @@ Salidas
 Ese bloque se concatena con el resto del prompt (transcripciones, evidencia, etc.).
 """
 
-from typing import Optional
+import os
+import time
+from typing import Callable, Optional
 
-from sqlalchemy import select
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
 
 from process_ai_core.db.models_catalog import CatalogOption
-from process_ai_core.db.models import Workspace, Document, Process, Recipe, Folder
+from process_ai_core.db.models import Workspace, Document, DocumentVersion, Process, Recipe, Folder
 from process_ai_core.db.helpers import get_workspace_metadata
 
 
+# ---------------------------------------------------------------------------
+# Caché de las partes del bloque que no dependen del documento
+# ---------------------------------------------------------------------------
+# Cada POST /runs arma el bloque: 5 queries al catálogo más la carga de todos los
+# documentos importados del workspace (con su markdown completo). Ambas cosas
+# cambian poco: se cachean con TTL corto y se invalidan en cuanto se comitea un
+# cambio de catálogo, de una versión importada o un borrado de documento.
+
+_CONTEXT_CACHE_MAX_ENTRIES = 1_000
+_context_cache: dict[tuple, tuple[object, float]] = {}
+
+
+def _context_cache_ttl() -> float:
+    raw = os.getenv("CONTEXT_CACHE_TTL_SECONDS", "").strip()
+    if not raw:
+        return 60.0
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return 60.0
+
+
+def clear_context_cache() -> None:
+    """Vacía la caché del bloque de contexto (cambios fuera del ORM, tests)."""
+    _context_cache.clear()
+
+
+# Como en la caché de permisos: el flush solo marca la sesión y la caché se vacía
+# en el commit, para que otro request no re-cachee el bloque viejo entre ambos.
+_CONTEXT_CACHE_DIRTY = "context_cache_dirty"
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_context_cache_dirty_on_flush(session, flush_context) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        # __dict__ para no disparar un refresh dentro del flush; si content_type no
+        # está cargado se invalida igual.
+        if isinstance(obj, CatalogOption) or (
+            isinstance(obj, DocumentVersion)
+            and obj.__dict__.get("content_type", "imported") == "imported"
+        ):
+            session.info[_CONTEXT_CACHE_DIRTY] = True
+            return
+    if any(isinstance(obj, Document) for obj in session.deleted):
+        session.info[_CONTEXT_CACHE_DIRTY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_context_cache_on_commit(session) -> None:
+    if session.info.pop(_CONTEXT_CACHE_DIRTY, False):
+        _context_cache.clear()
+
+
+@event.listens_for(Session, "after_rollback")
+def _invalidate_context_cache_on_rollback(session) -> None:
+    if session.info.pop(_CONTEXT_CACHE_DIRTY, False):
+        _context_cache.clear()
+
+
+def _cached(key: tuple, load: Callable[[], object]):
+    ttl = _context_cache_ttl()
+    now = time.monotonic()
+    entry = _context_cache.get(key)
+    if entry is not None and now - entry[1] <= ttl:
+        return entry[0]
+
+    value = load()
+    if ttl > 0:
+        if len(_context_cache) >= _CONTEXT_CACHE_MAX_ENTRIES:
+            _context_cache.clear()
+        _context_cache[key] = (value, now)
+    return value
+
+
 def _prompt_for(session, domain: str, value: Optional[str]) -> str:
     """
     Obtiene el texto de prompt (`prompt_text`) desde el catálogo para una combinación
@@ -76,17 +153,51 @@ def _prompt_for(session, domain: str, value: Optional[str]) -> str:
     if not value:
         return ""
 
-    stmt = (
-        select(CatalogOption.prompt_text)
-        .where(
-            CatalogOption.domain == domain,
-            CatalogOption.value == value,
-            CatalogOption.is_active.is_(True),
+    def load() -> str:
+        stmt = (
+            select(CatalogOption.prompt_text)
+            .where(
+                CatalogOption.domain == domain,
+                CatalogOption.value == value,
+                CatalogOption.is_active.is_(True),
+            )
+            .limit(1)
+        )
+        return session.execute(stmt).scalar_one_or_none() or ""
+
+    return _cached(("catalog", domain, value), load)
+
+
+def _imported_context_lines(session, workspace_id: str) -> tuple[str, ...]:
+    """
+    Líneas del bloque con los documentos de contexto del negocio del workspace:
+    documentos importados aprobados (versión vigente) con texto extraído.
+    """
+
+    def load() -> tuple[str, ...]:
+        rows = (
+            session.query(DocumentVersion.source_file_name, DocumentVersion.content_markdown)
+            .join(Document, DocumentVersion.document_id == Document.id)
+            .filter(
+                Document.workspace_id == workspace_id,
+                DocumentVersion.version_status == "APPROVED",
+                DocumentVersion.content_type == "imported",
+                DocumentVersion.is_current == True,
+            )
+            .all()
         )
-        .limit(1)
-    )
-    out = session.execute(stmt).scalar_one_or_none()
-    return out or ""
+        lines: list[str] = []
+        for source_file_name, content_markdown in rows:
+            text = (content_markdown or "").strip()
+            if not text:
+                continue
+            source_name = source_file_name or "documento importado"
+            lines.append("")
+            lines.append(f"Documento de contexto ({source_name}):")
+            lines.append(text)
+        return tuple(lines)
+
+    return _cached(("imported", workspace_id), load)
 
 
 def build_context_block(session, workspace: Workspace, document: Document) -> str:
@@ -127,7 +238,10 @@ def build_context_block(session, workspace: Workspace, document: Document) -> st
     - Si existe prompt_text, se agrega como bullet: `- <prompt_text>`.
     - Al final se agregan bloques de texto libre (si existen), separados por líneas en blanco:
         * "Contexto del workspace:"
+        * "Documento de contexto (...)": importados aprobados del workspace
         * "Contexto del documento:"
+    - Los textos del catálogo y los documentos importados salen de una caché con
+      TTL (CONTEXT_CACHE_TTL_SECONDS, default 60s; 0 desactiva la caché).
 
     Args:
         session:
@@ -179,7 +293,7 @@ def build_context_block(session, workspace: Workspace, document: Document) -> st
     # Información de la carpeta (reemplaza process_type)
     folder_context = ""
     if document.folder_id:
-        folder = session.query(Folder).filter_by(id=document.folder_id).first()
+        folder = session.get(Folder, document.folder_id)
         if folder:
             # Usar el path completo de la carpeta como contexto
             folder_context = folder.path or folder.name
@@ -206,30 +320,10 @@ def build_context_block(session, workspace: Workspace, document: Document) -> st
     if workspace_context_text and workspace_context_text.strip():
         lines.append("")
         lines.append("Contexto del workspace:")
-        lines.append(workspace_context.strip())
+        lines.append(workspace_context_text.strip())
 
     # Archivos de contexto del negocio: documentos importados aprobados con texto extraído
-    from process_ai_core.db.models import DocumentVersion
-
-    imported_versions = (
-        session.query(DocumentVersion)
-        .join(Document, DocumentVersion.document_id == Document.id)
-        .filter(
-            Document.workspace_id == workspace.id,
-            DocumentVersion.version_status == "APPROVED",
-            DocumentVersion.content_type == "imported",
-            DocumentVersion.is_current == True,
-        )
-        .all()
-    )
-    for version in imported_versions:
-        text = (version.content_markdown or "").strip()
-        if not text:
-            continue
-        source_name = version.source_file_name or "documento importado"
-        lines.append("")
-        lines.append(f"Documento de contexto ({source_name}):")
-        lines.append(text)
+    lines.extend(_imported_context_lines(session, workspace.id))
 
     if document_context_text and document_context_text.strip():
         lines.append("")
@@ -17,6 +17,8 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
 
 
 class StorageError(RuntimeError):
@@ -58,6 +60,18 @@ class BlobStorage(ABC):
     def put(self, key: str, data: bytes, content_type: str = "application/octet-stream") -> str:
         """Sube `data` bajo `key`. Devuelve la clave normalizada almacenada."""
 
+    def put_fileobj(
+        self, key: str, fileobj: BinaryIO, content_type: str = "application/octet-stream"
+    ) -> str:
+        """
+        Sube el contenido de `fileobj` (desde su posición actual) bajo `key`.
+
+        Default: lo lee entero y delega en `put()` (los backends remotos suben un
+        único body igual). Los que escriben a disco lo sobrescriben para copiar
+        por bloques sin materializar el archivo en memoria.
+        """
+        return self.put(key, fileobj.read(), content_type=content_type)
+
     @abstractmethod
     def get(self, key: str) -> bytes:
         """Devuelve los bytes almacenados en `key`. Lanza `FileNotFoundError` si no existe."""
@@ -66,6 +80,24 @@ class BlobStorage(ABC):
     def exists(self, key: str) -> bool:
         """True si existe un blob en `key`."""
 
+    def existing_keys(self, keys: list[str]) -> set[str]:
+        """
+        Subconjunto (normalizado) de `keys` que existe en storage.
+
+        Default: un `exists()` por clave. Los backends remotos lo sobrescriben para
+        resolver varias claves del mismo directorio con un solo listado.
+        """
+        return {normalize_key(k) for k in keys if self.exists(k)}
+
+    def local_path(self, key: str) -> Path | None:
+        """
+        Path en el filesystem local del blob en `key`, si el backend lo tiene en disco.
+
+        Permite servirlo con `FileResponse` (sendfile) en vez de cargar los bytes en
+        memoria. Default: None (backends remotos).
+        """
+        return None
+
     @abstractmethod
     def delete(self, key: str) -> None:
         """Borra el blob en `key`. No falla si no existe (idempotente)."""
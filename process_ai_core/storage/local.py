@@ -8,7 +8,9 @@ Raíz configurable (por defecto `output_dir`). Las claves se mapean a
 
 from __future__ import annotations
 
+import shutil
 from pathlib import Path
+from typing import BinaryIO
 
 from .base import BlobInfo, BlobStorage, normalize_key
 
@@ -33,6 +35,15 @@ class LocalDiskStorage(BlobStorage):
         path.write_bytes(data)
         return normalize_key(key)
 
+    def put_fileobj(
+        self, key: str, fileobj: BinaryIO, content_type: str = "application/octet-stream"
+    ) -> str:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as out:
+            shutil.copyfileobj(fileobj, out, length=1024 * 1024)
+        return normalize_key(key)
+
     def get(self, key: str) -> bytes:
         path = self._path(key)
         if not path.exists():
@@ -42,6 +53,10 @@ class LocalDiskStorage(BlobStorage):
     def exists(self, key: str) -> bool:
         return self._path(key).exists()
 
+    def local_path(self, key: str) -> Path | None:
+        path = self._path(key)
+        return path if path.is_file() else None
+
     def delete(self, key: str) -> None:
         path = self._path(key)
         if path.exists():
@@ -65,6 +65,26 @@ class SupabaseStorage(BlobStorage):
             return False
         return any(e.get("name") == name for e in (entries or []))
 
+    def existing_keys(self, keys: list[str]) -> set[str]:
+        # Un list() por directorio padre (no por clave): los artefactos de un run
+        # comparten carpeta, así que process.{json,md,pdf} se resuelven en una llamada.
+        by_parent: dict[str, dict[str, str]] = {}
+        for key in keys:
+            norm = normalize_key(key)
+            parent, _, name = norm.rpartition("/")
+            by_parent.setdefault(parent, {})[name] = norm
+        found: set[str] = set()
+        for parent, names in by_parent.items():
+            try:
+                entries = self._store.list(path=parent)
+            except Exception:
+                continue
+            for e in entries or []:
+                norm = names.get(e.get("name"))
+                if norm:
+                    found.add(norm)
+        return found
+
     def delete(self, key: str) -> None:
         norm = normalize_key(key)
         try:
@@ -22,6 +22,7 @@ from __future__ import annotations
 
 import sqlite3
 
+import pytest
 from sqlalchemy import event
 from sqlalchemy.engine import Engine
 
@@ -36,3 +37,24 @@ def _attach_app_schema_on_sqlite(dbapi_connection, connection_record):
     """Adjunta el schema de la app como un database en memoria en cada conexión SQLite."""
     if _APP_SCHEMA and isinstance(dbapi_connection, sqlite3.Connection):
         dbapi_connection.execute(f'ATTACH DATABASE \':memory:\' AS "{_APP_SCHEMA}"')
+
+
+@pytest.fixture(autouse=True)
+def _clear_permission_cache():
+    """La caché de has_permission es global al proceso: cada test arranca vacío
+    (los tests reutilizan ids de usuario/workspace sobre bases distintas)."""
+    from process_ai_core.db.permissions import clear_permission_cache
+
+    clear_permission_cache()
+    yield
+    clear_permission_cache()
+
+
+@pytest.fixture(autouse=True)
+def _clear_context_cache():
+    """Ídem para la caché del bloque de contexto de prompts (catálogo/importados)."""
+    from process_ai_core.prompt_context import clear_context_cache
+
+    clear_context_cache()
+    yield
+    clear_context_cache()
@@ -26,7 +26,7 @@ from unittest.mock import patch, MagicMock
 import pytest
 from fastapi.testclient import TestClient
 
-from api.artifact_signing import sign_artifact_url, verify_artifact_token
+from api.artifact_signing import sign_artifact_url, sign_run_artifact_urls, verify_artifact_token
 from process_ai_core.config import get_settings, Settings
 from process_ai_core.storage.local import LocalDiskStorage
 
@@ -92,6 +92,15 @@ class TestSignArtifactUrl:
             exp = int(token.split(".")[0])
         assert before + 55 <= exp <= before + 65
 
+    def test_sign_run_artifact_urls_firma_los_canonicos(self):
+        with patch(_SETTINGS_PATCH, return_value=_patched_settings()):
+            urls = sign_run_artifact_urls(_RUN, _WS_A, include_pdf=True)
+            assert set(urls) == {"json", "markdown", "pdf"}
+            for atype, filename in (("json", "process.json"), ("markdown", "process.md"), ("pdf", _FILE)):
+                token = urls[atype].split("token=")[1]
+                assert verify_artifact_token(token, _RUN, filename)
+            assert set(sign_run_artifact_urls(_RUN, _WS_A)) == {"json", "markdown"}
+
 
 class TestVerifyArtifactToken:
     def test_token_valido_retorna_true(self):
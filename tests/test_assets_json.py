@@ -49,6 +49,13 @@ def test_inject_empty_assets():
     assert data["assets"] == {"images_by_step": {}, "evidence_images": []}
 
 
+def test_inject_accepts_parsed_dict_without_mutating_it():
+    doc = {"x": 1}
+    out = inject_assets_into_json(doc, {1: [{"path": "assets/a.png"}]}, [])
+    assert json.loads(out)["assets"]["images_by_step"]["1"][0]["asset_id"] == "a"
+    assert doc == {"x": 1}
+
+
 def test_inject_invalid_json_returns_original():
     bad = "no soy json"
     assert inject_assets_into_json(bad, {1: [{"path": "a.png"}]}, []) == bad
@@ -0,0 +1,69 @@
+"""Ciclo de vida del run en la generación de versiones en background.
+
+POST /documents/{id}/runs con run_in_background=true responde 202 y delega el
+pipeline a `_run_document_pipeline_background`. Estos tests cubren el envoltorio
+`_run_document_pipeline_job`: transiciones de Run.status y limpieza del directorio
+temporal de uploads (que en modo background ya no lo borra el request).
+"""
+
+import pytest
+
+from api.routes.documents import runs as runs_route
+
+
+@pytest.fixture
+def statuses(monkeypatch):
+    recorded: list[tuple[str, str]] = []
+    monkeypatch.setattr(runs_route, "_set_run_status", lambda run_id, status: recorded.append((run_id, status)))
+    return recorded
+
+
+def test_job_exitoso_marca_running_y_borra_temp(monkeypatch, statuses, tmp_path):
+    temp_dir = tmp_path / "uploads"
+    temp_dir.mkdir()
+    (temp_dir / "aud1.mp3").write_bytes(b"x")
+    monkeypatch.setattr(runs_route, "_execute_document_run", lambda **kwargs: {"json": "url"})
+
+    artifacts = runs_route._run_document_pipeline_job(temp_dir=temp_dir, run_id="run-1")
+
+    assert artifacts == {"json": "url"}
+    # "completed" se setea dentro de la transacción de versión (_execute_document_run).
+    assert statuses == [("run-1", "running")]
+    assert not temp_dir.exists()
+
+
+def test_job_fallido_marca_failed_y_propaga(monkeypatch, statuses, tmp_path):
+    temp_dir = tmp_path / "uploads"
+    temp_dir.mkdir()
+
+    def _boom(**kwargs):
+        raise RuntimeError("LLM caído")
+
+    monkeypatch.setattr(runs_route, "_execute_document_run", _boom)
+
+    with pytest.raises(RuntimeError):
+        runs_route._run_document_pipeline_job(temp_dir=temp_dir, run_id="run-2")
+
+    assert statuses == [("run-2", "running"), ("run-2", "failed")]
+    assert not temp_dir.exists()
+
+
+def test_background_no_propaga_errores(monkeypatch, statuses, tmp_path):
+    def _boom(**kwargs):
+        raise RuntimeError("LLM caído")
+
+    monkeypatch.setattr(runs_route, "_execute_document_run", _boom)
+
+    # No hay request al que devolver el error: solo se loguea.
+    runs_route._run_document_pipeline_background(temp_dir=tmp_path / "nada", run_id="run-3")
+
+    assert statuses[-1] == ("run-3", "failed")
+
+
+def test_job_sincrono_no_repite_running(monkeypatch, statuses, tmp_path):
+    # En modo síncrono el run ya nace "running": sin transacción extra para eso.
+    monkeypatch.setattr(runs_route, "_execute_document_run", lambda **kwargs: {})
+
+    runs_route._run_document_pipeline_job(temp_dir=tmp_path / "nada", run_id="run-4", mark_running=False)
+
+    assert statuses == []
@@ -10,6 +10,7 @@ import pytest
 # parchea (get_db_session, has_permission, can_view_folder, resolve_tenant_workspace_id)
 # viven ahora en el sub-router crud.
 from api.routes.documents import crud as documents_route
+from api.routes.documents._helpers import _rewrite_img_src_to_absolute
 from process_ai_core.db.database import get_db_session
 from process_ai_core.db.models import DocumentVersion, Folder, Process, Workspace
 
@@ -95,3 +96,19 @@ def test_get_document_devuelve_preguntas_abiertas_en_metadata(monkeypatch, sessi
     response = asyncio.run(documents_route.get_document(doc.id, user_id="test-user", ctx=None))
 
     assert response.metadata == {"preguntas_abiertas": approved_question}
+
+
+def test_rewrite_img_src_solo_toca_assets_relativos():
+    """El HTML del editor: assets/ y ./assets/ → absolutas; http y /api/v1 quedan igual."""
+    html = (
+        '<img src="assets/a.png"><img src="./assets/b.png">'
+        '<img src="http://cdn/x.png"><img src="/api/v1/artifacts/r/c.png">'
+    )
+    out = _rewrite_img_src_to_absolute(html, "run-1", "http://api")
+    assert out == (
+        '<img src="http://api/api/v1/artifacts/run-1/assets/a.png">'
+        '<img src="http://api/api/v1/artifacts/run-1/assets/b.png">'
+        '<img src="http://cdn/x.png"><img src="/api/v1/artifacts/r/c.png">'
+    )
+    ya_absoluto = '<img src="http://cdn/x.png">'
+    assert _rewrite_img_src_to_absolute(ya_absoluto, "run-1", "http://api") is ya_absoluto
@@ -0,0 +1,54 @@
+"""Debounce del PDF del borrador en PUT /documents/{id}/editable.
+
+Cada guardado registra su job en `_enqueue_draft_pdf`; sólo el primero lanza el
+worker, que espera la ventana de debounce y renderiza el HTML más reciente.
+"""
+
+import asyncio
+
+import pytest
+
+from api.routes.documents import content as content_route
+
+
+@pytest.fixture
+def rendered(monkeypatch):
+    calls: list[str] = []
+    monkeypatch.setattr(content_route, "_DRAFT_PDF_DEBOUNCE_S", 0.01)
+    monkeypatch.setattr(
+        content_route, "_generate_draft_pdf_background", lambda **job: calls.append(job["content_html"])
+    )
+    monkeypatch.setattr(content_route, "_draft_pdf_jobs", {})
+    return calls
+
+
+def test_guardados_seguidos_renderizan_solo_el_ultimo(rendered):
+    async def _scenario():
+        assert content_route._enqueue_draft_pdf("doc-1", {"content_html": "<p>1</p>"}) is True
+        assert content_route._enqueue_draft_pdf("doc-1", {"content_html": "<p>2</p>"}) is False
+        assert content_route._enqueue_draft_pdf("doc-1", {"content_html": "<p>3</p>"}) is False
+        await content_route._draft_pdf_worker("doc-1")
+
+    asyncio.run(_scenario())
+
+    assert rendered == ["<p>3</p>"]
+    assert content_route._draft_pdf_jobs == {}
+
+
+def test_guardado_durante_el_render_se_procesa_despues(rendered, monkeypatch):
+    def _render(**job):
+        rendered.append(job["content_html"])
+        if len(rendered) == 1:
+            # Llega otro guardado mientras se renderiza el primero: no lanza otro worker.
+            assert content_route._enqueue_draft_pdf("doc-1", {"content_html": "<p>b</p>"}) is False
+
+    monkeypatch.setattr(content_route, "_generate_draft_pdf_background", _render)
+
+    async def _scenario():
+        content_route._enqueue_draft_pdf("doc-1", {"content_html": "<p>a</p>"})
+        await content_route._draft_pdf_worker("doc-1")
+
+    asyncio.run(_scenario())
+
+    assert rendered == ["<p>a</p>", "<p>b</p>"]
+    assert content_route._draft_pdf_jobs == {}
@@ -0,0 +1,56 @@
+"""Tests del middleware de ETag / 304 (api/etag.py)."""
+
+from fastapi import FastAPI
+from fastapi.responses import Response
+from fastapi.testclient import TestClient
+
+from api.etag import ETagMiddleware, compute_etag, etag_matches
+
+
+def _client():
+    app = FastAPI()
+    app.add_middleware(ETagMiddleware)
+
+    @app.get("/api/v1/documents/{doc_id}")
+    def get_doc(doc_id: str):
+        return {"id": doc_id, "status": "draft"}
+
+    @app.get("/api/v1/documents/{doc_id}/pdf")
+    def get_pdf(doc_id: str):
+        return Response(b"%PDF", media_type="application/pdf")
+
+    @app.get("/api/v1/other")
+    def other():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_get_json_devuelve_etag_y_304_si_coincide():
+    client = _client()
+    first = client.get("/api/v1/documents/d1")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert etag == compute_etag(first.content)
+    assert first.headers["cache-control"] == "private, max-age=0, must-revalidate"
+
+    second = client.get("/api/v1/documents/d1", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+
+    # Otro documento → otro body → otro ETag: 200 completo.
+    third = client.get("/api/v1/documents/d2", headers={"If-None-Match": etag})
+    assert third.status_code == 200 and third.json()["id"] == "d2"
+
+
+def test_no_toca_respuestas_no_json_ni_otros_prefijos():
+    client = _client()
+    assert "etag" not in client.get("/api/v1/documents/d1/pdf").headers
+    assert "etag" not in client.get("/api/v1/other").headers
+
+
+def test_etag_matches():
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches("*", '"x"')
+    assert not etag_matches('"a"', '"b"')
@@ -0,0 +1,63 @@
+"""Descubrimiento de insumos (process_ai_core/ingest.py)."""
+
+from __future__ import annotations
+
+from process_ai_core.ingest import discover_raw_assets, discover_raw_assets_in_run
+
+
+def _touch(path, content="x"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def test_discover_raw_assets_ids_por_tipo_e_ignora_sidecars(tmp_path):
+    _touch(tmp_path / "b.mp3")
+    _touch(tmp_path / "sub" / "a.mp3")
+    _touch(tmp_path / "nota.txt")
+    _touch(tmp_path / "nota.json", '{"titulo": "Nota"}')
+    _touch(tmp_path / "otro.xyz")
+
+    assets = discover_raw_assets(tmp_path)
+
+    assert [(a.id, a.kind) for a in assets] == [
+        ("audio1", "audio"),
+        ("audio2", "audio"),
+        ("txt1", "text"),
+    ]
+    assert assets[0].path_or_url.endswith("b.mp3")
+    assert assets[2].metadata["titulo"] == "Nota"
+
+
+def test_discover_raw_assets_in_run_prioriza_subdirectorios(tmp_path):
+    _touch(tmp_path / "process.md")
+    _touch(tmp_path / "evidence" / "foto.png")
+    assert [a.path_or_url for a in discover_raw_assets_in_run(tmp_path)] == [
+        str(tmp_path / "evidence" / "foto.png")
+    ]
+
+    _touch(tmp_path / "assets" / "clip.mp4")
+    assert [a.id for a in discover_raw_assets_in_run(tmp_path)] == ["vid1"]
+
+
+def test_discover_raw_assets_in_run_cae_al_directorio_completo(tmp_path):
+    _touch(tmp_path / "process.md")
+    (tmp_path / "assets").mkdir()
+
+    assert [a.id for a in discover_raw_assets_in_run(tmp_path)] == ["txt1"]
+    assert discover_raw_assets_in_run(tmp_path / "no-existe") == []
+
+
+def test_discover_raw_assets_in_run_memoiza_y_devuelve_copias(tmp_path, monkeypatch):
+    import process_ai_core.ingest as ingest
+
+    _touch(tmp_path / "assets" / "clip.mp4")
+    first = discover_raw_assets_in_run(tmp_path)
+    first[0].metadata["titulo"] = "modificado"
+
+    def _no_scan(_root):
+        raise AssertionError("no debería volver a recorrer el árbol")
+
+    monkeypatch.setattr(ingest, "_scan_supported_files", _no_scan)
+    second = discover_raw_assets_in_run(tmp_path)
+    assert [a.id for a in second] == ["vid1"]
+    assert second[0].metadata["titulo"] == "clip"
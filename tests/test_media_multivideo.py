@@ -42,3 +42,34 @@ def test_assets_despues_del_video_no_se_descartan(monkeypatch, tmp_path):
     ids = {e.id for e in enriched}
     assert "vid1" in ids, "el video debe procesarse"
     assert "aud1" in ids, "el asset posterior al video ya NO debe descartarse (bug fijado)"
+
+
+def test_transcripciones_de_audio_en_paralelo_conservan_orden(monkeypatch, tmp_path):
+    """Las transcripciones se lanzan juntas, pero el orden de enriched es el de raw_assets."""
+    import threading
+    import time
+
+    in_flight = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def _fake_transcribe(path, *a, **k):
+        with lock:
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        time.sleep(0.05)
+        with lock:
+            in_flight["now"] -= 1
+        return f"texto de {path}"
+
+    monkeypatch.setattr(media, "transcribe_audio", _fake_transcribe)
+
+    raw_assets = [
+        RawAsset(id=f"aud{i}", kind="audio", path_or_url=f"a{i}.mp3", metadata={})
+        for i in range(1, 4)
+    ]
+
+    enriched, _images_by_step, _evidence = media.enrich_assets(raw_assets, output_base=tmp_path)
+
+    assert [e.id for e in enriched] == ["aud1", "aud2", "aud3"]
+    assert [e.extracted_text for e in enriched] == ["texto de a1.mp3", "texto de a2.mp3", "texto de a3.mp3"]
+    assert in_flight["max"] > 1
@@ -0,0 +1,93 @@
+"""Caché de has_permission: evita re-consultar permisos y se invalida al cambiar roles."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from process_ai_core.db.database import Base
+from process_ai_core.db.models import Permission, Role, User, Workspace, WorkspaceMembership
+from process_ai_core.db.permissions import has_permission
+
+
+@pytest.fixture
+def session():
+    engine = create_engine(
+        "sqlite+pysqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    s = sessionmaker(bind=engine)()
+    try:
+        yield s
+    finally:
+        s.close()
+        engine.dispose()
+
+
+def _seed(session):
+    view = Permission(name="documents.view", category="documents")
+    approve = Permission(name="documents.approve", category="documents")
+    viewer = Role(name="viewer", permissions=[view])
+    approver = Role(name="approver", permissions=[view, approve])
+    ws = Workspace(id="ws-1", slug="ws-1", name="WS", workspace_type="organization")
+    user = User(id="u-1", email="u@example.com", name="U")
+    membership = WorkspaceMembership(user_id=user.id, workspace_id=ws.id, role_obj=viewer)
+    session.add_all([view, approve, viewer, approver, ws, user, membership])
+    session.commit()
+    return membership, approver
+
+
+def _count_queries(session):
+    counter = {"n": 0}
+
+    @event.listens_for(session.get_bind(), "before_cursor_execute")
+    def _count(*_args, **_kwargs):
+        counter["n"] += 1
+
+    return counter
+
+
+def test_resultado_cacheado_no_vuelve_a_consultar(session):
+    _seed(session)
+    assert has_permission(session, "u-1", "ws-1", "documents.view") is True
+
+    counter = _count_queries(session)
+    assert has_permission(session, "u-1", "ws-1", "documents.view") is True
+    assert counter["n"] == 0
+
+
+def test_cambio_de_rol_invalida_la_cache(session):
+    membership, approver = _seed(session)
+    assert has_permission(session, "u-1", "ws-1", "documents.approve") is False
+
+    membership.role_obj = approver
+    session.commit()
+
+    assert has_permission(session, "u-1", "ws-1", "documents.approve") is True
+
+
+def test_cambio_flusheado_se_ve_en_la_sesion_y_no_se_cachea(session):
+    membership, approver = _seed(session)
+    assert has_permission(session, "u-1", "ws-1", "documents.approve") is False
+
+    membership.role_obj = approver
+    session.flush()
+    # La sesión ve su propio cambio, pero sin cachearlo hasta el commit.
+    assert has_permission(session, "u-1", "ws-1", "documents.approve") is True
+    session.rollback()
+
+    assert has_permission(session, "u-1", "ws-1", "documents.approve") is False
+
+
+def test_ttl_cero_desactiva_la_cache(session, monkeypatch):
+    _seed(session)
+    monkeypatch.setenv("PERMISSION_CACHE_TTL_SECONDS", "0")
+    has_permission(session, "u-1", "ws-1", "documents.view")
+
+    counter = _count_queries(session)
+    has_permission(session, "u-1", "ws-1", "documents.view")
+    assert counter["n"] > 0
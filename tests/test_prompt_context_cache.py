@@ -0,0 +1,89 @@
+"""Caché del bloque de contexto: catálogo y documentos importados por workspace."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from process_ai_core.db.database import Base
+from process_ai_core.db.models import DocumentVersion, Folder, Process, Workspace
+from process_ai_core.db.models_catalog import CatalogOption
+from process_ai_core.prompt_context import build_context_block
+
+
+@pytest.fixture
+def session():
+    engine = create_engine(
+        "sqlite+pysqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    s = sessionmaker(bind=engine)()
+    try:
+        yield s
+    finally:
+        s.close()
+        engine.dispose()
+
+
+def _seed(session):
+    ws = Workspace(
+        id="ws-1", slug="ws-1", name="WS", workspace_type="organization", business_type="retail"
+    )
+    folder = Folder(id="f-1", workspace_id=ws.id, name="Ventas", path="Ventas")
+    doc = Process(id="d-1", workspace_id=ws.id, folder_id=folder.id, name="Cobro")
+    imported = Process(id="d-2", workspace_id=ws.id, folder_id=folder.id, name="Manual")
+    version = DocumentVersion(
+        document_id=imported.id,
+        version_number=1,
+        version_status="APPROVED",
+        content_type="imported",
+        content_json="{}",
+        content_markdown="Texto del manual",
+        source_file_name="manual.pdf",
+        is_current=True,
+    )
+    option = CatalogOption(
+        domain="business_type", value="retail", label="Retail", prompt_text="Negocio minorista."
+    )
+    session.add_all([ws, folder, doc, imported, version, option])
+    session.commit()
+    return ws, doc, version, option
+
+
+def _capture_queries(session):
+    statements: list[str] = []
+
+    @event.listens_for(session.get_bind(), "before_cursor_execute")
+    def _capture(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    return statements
+
+
+def test_segundo_bloque_no_reconsulta_catalogo_ni_importados(session):
+    ws, doc, _version, _option = _seed(session)
+    first = build_context_block(session, ws, doc)
+    assert "- Negocio minorista." in first
+    assert "Documento de contexto (manual.pdf):\nTexto del manual" in first
+
+    statements = _capture_queries(session)
+    assert build_context_block(session, ws, doc) == first
+    # Solo queda la carpeta del documento (parte no cacheada del bloque).
+    assert not [s for s in statements if "catalog_options" in s or "document_versions" in s]
+
+
+def test_cambios_en_catalogo_o_importados_invalidan(session):
+    ws, doc, version, option = _seed(session)
+    build_context_block(session, ws, doc)
+
+    option.prompt_text = "Comercio minorista."
+    version.content_markdown = "Manual v2"
+    session.commit()
+
+    block = build_context_block(session, ws, doc)
+    assert "- Comercio minorista." in block
+    assert "Manual v2" in block
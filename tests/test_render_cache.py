@@ -0,0 +1,86 @@
+"""Caché de PDFs por contenido de los runs de patch (api/routes/_render_cache.py)."""
+
+import pytest
+
+from api.routes import _render_cache as render_cache
+from api.routes._uploads import link_or_copy
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    d = tmp_path / "_render_cache"
+    monkeypatch.setattr(render_cache, "_render_cache_dir", lambda: d)
+    return d
+
+
+def _run(tmp_path, name: str, source_assets=None):
+    run = tmp_path / name
+    (run / "assets").mkdir(parents=True)
+    if source_assets is not None:
+        for f in source_assets.iterdir():
+            link_or_copy(f, run / "assets" / f.name)
+    return run
+
+
+def test_mismo_contenido_reutiliza_el_pdf(tmp_path, cache_dir):
+    base = _run(tmp_path, "base")
+    (base / "assets" / "step_01.png").write_bytes(b"png")
+    clone = _run(tmp_path, "clone", source_assets=base / "assets")
+
+    renders: list[str] = []
+
+    def _producer(run):
+        def _render():
+            renders.append(run.name)
+            out = run / "process.pdf"
+            out.write_bytes(b"%PDF " + run.name.encode())
+            return out
+        return _render
+
+    key_base = render_cache.render_cache_key("ws", "# Proc", base / "assets", None)
+    key_clone = render_cache.render_cache_key("ws", "# Proc", clone / "assets", None)
+    assert key_base == key_clone
+
+    render_cache.get_or_render_pdf(key_base, base / "process.pdf", _producer(base))
+    out = render_cache.get_or_render_pdf(key_clone, clone / "process.pdf", _producer(clone))
+
+    assert renders == ["base"]
+    assert out.read_bytes() == b"%PDF base"
+    # Copias independientes: reescribir el PDF de un run no toca la caché.
+    assert not (clone / "process.pdf").samefile(base / "process.pdf")
+    (base / "process.pdf").write_bytes(b"%PDF regenerado")
+    assert (cache_dir / f"{key_base}.pdf").read_bytes() == b"%PDF base"
+
+
+def test_la_clave_depende_de_los_bytes_de_los_assets(tmp_path):
+    run = _run(tmp_path, "run")
+    asset = run / "assets" / "step_01.png"
+    asset.write_bytes(b"png-a")
+    key = render_cache.render_cache_key("ws", "# Proc", run / "assets", None)
+
+    copia = _run(tmp_path, "copia")
+    (copia / "assets" / "step_01.png").write_bytes(b"png-a")
+    assert render_cache.render_cache_key("ws", "# Proc", copia / "assets", None) == key
+
+    asset.write_bytes(b"png-b")
+    assert render_cache.render_cache_key("ws", "# Proc", run / "assets", None) != key
+
+
+def test_cambio_de_markdown_o_workspace_cambia_la_clave(tmp_path):
+    run = _run(tmp_path, "run")
+    key = render_cache.render_cache_key("ws", "# Proc", run / "assets", None)
+    assert render_cache.render_cache_key("ws", "# Otro", run / "assets", None) != key
+    assert render_cache.render_cache_key("ws2", "# Proc", run / "assets", None) != key
+
+
+def test_poda_por_cantidad(tmp_path, cache_dir, monkeypatch):
+    monkeypatch.setattr(render_cache, "RENDER_CACHE_MAX_ENTRIES", 2)
+    run = _run(tmp_path, "run")
+    for i in range(4):
+        def _render(i=i):
+            out = run / f"p{i}.pdf"
+            out.write_bytes(b"%PDF")
+            return out
+        render_cache.get_or_render_pdf(f"k{i}", run / "process.pdf", _render)
+
+    assert len(list(cache_dir.glob("*.pdf"))) == 2
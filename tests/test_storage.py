@@ -47,6 +47,15 @@ def test_put_get_roundtrip(storage):
     assert storage.get(key) == b"%PDF-1.4 data"
 
 
+def test_put_fileobj_roundtrip(storage):
+    import io
+
+    data = b"\x89PNG" + b"x" * (3 * 1024 * 1024)  # más que un bloque de copia
+    key = storage.put_fileobj("workspaces/w1/editor-uploads/d1/img.png", io.BytesIO(data))
+    assert key == "workspaces/w1/editor-uploads/d1/img.png"
+    assert storage.get(key) == data
+
+
 def test_exists(storage):
     key = "a/b.txt"
     assert storage.exists(key) is False
@@ -182,3 +191,57 @@ def test_delete_prefix(storage):
 
 def test_delete_prefix_missing_is_zero(storage):
     assert storage.delete_prefix("workspaces/ws-X/runs/nope") == 0
+
+
+# --- existing_keys (chequeo de existencia por lote) ---------------------------
+
+def test_existing_keys(storage):
+    storage.put("workspaces/ws-A/runs/r1/process.json", b"{}")
+    storage.put("workspaces/ws-A/runs/r2/process.pdf", b"%PDF")
+
+    found = storage.existing_keys([
+        "/workspaces/ws-A/runs/r1/process.json",
+        "workspaces/ws-A/runs/r1/process.pdf",
+        "workspaces/ws-A/runs/r2/process.pdf",
+    ])
+    assert found == {
+        "workspaces/ws-A/runs/r1/process.json",
+        "workspaces/ws-A/runs/r2/process.pdf",
+    }
+
+
+def test_local_path(storage):
+    storage.put("workspaces/ws-A/runs/r1/process.md", b"# x")
+
+    path = storage.local_path("workspaces/ws-A/runs/r1/process.md")
+    assert path is not None and path.read_bytes() == b"# x"
+    assert storage.local_path("workspaces/ws-A/runs/r1/missing.md") is None
+    assert storage.local_path("workspaces/ws-A/runs/r1") is None  # directorio
+
+
+def test_supabase_existing_keys_lists_each_parent_once():
+    """Las claves de un mismo run se resuelven con un solo list() del directorio."""
+    from process_ai_core.storage.supabase import SupabaseStorage
+
+    calls = []
+
+    class _FakeStore:
+        def list(self, path):
+            calls.append(path)
+            return [{"name": "process.json"}, {"name": "process.md"}]
+
+    class _FakeClient:
+        class storage:
+            @staticmethod
+            def from_(bucket):
+                return _FakeStore()
+
+    # Sin __init__: no crea un cliente real de Supabase.
+    s = SupabaseStorage.__new__(SupabaseStorage)
+    s._client, s._bucket = _FakeClient(), "b"
+    keys = [f"workspaces/w/runs/r1/process.{ext}" for ext in ("json", "md", "pdf")]
+
+    found = s.existing_keys(keys)
+
+    assert found == {"workspaces/w/runs/r1/process.json", "workspaces/w/runs/r1/process.md"}
+    assert calls == ["workspaces/w/runs/r1"]
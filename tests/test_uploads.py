@@ -0,0 +1,58 @@
+"""Persistencia de uploads por bloques (api/routes/_uploads.py)."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+
+from fastapi import UploadFile
+
+import api.routes._uploads as uploads
+
+
+def test_save_upload_copia_por_bloques(monkeypatch, tmp_path):
+    monkeypatch.setattr(uploads, "UPLOAD_CHUNK_SIZE", 4)
+    payload = b"0123456789" * 3
+    upload = UploadFile(file=io.BytesIO(payload), filename="audio.mp3")
+
+    dest = tmp_path / "aud1.mp3"
+    asyncio.run(uploads.save_upload(upload, dest))
+
+    assert dest.read_bytes() == payload
+
+
+def test_plan_uploads_numera_por_tipo_y_valida_extension(tmp_path):
+    import pytest
+    from fastapi import HTTPException
+
+    from api.routes.documents.runs import _plan_uploads
+
+    files = [
+        UploadFile(file=io.BytesIO(b"a"), filename="intro.mp3"),
+        UploadFile(file=io.BytesIO(b"b"), filename="cierre.mp3"),
+    ]
+    planned = _plan_uploads(files, "audio", "aud", tmp_path)
+
+    assert [a.id for a, _u, _p in planned] == ["aud1", "aud2"]
+    assert [p.name for _a, _u, p in planned] == ["aud1.mp3", "aud2.mp3"]
+    assert planned[0][0].metadata == {"titulo": "intro"}
+    assert not any(p.exists() for _a, _u, p in planned)  # no escribe a disco
+
+    with pytest.raises(HTTPException):
+        _plan_uploads([UploadFile(file=io.BytesIO(b"x"), filename="x.exe")], "audio", "aud", tmp_path)
+
+
+def test_link_or_copy_enlaza_y_cae_a_copia(monkeypatch, tmp_path):
+    src = tmp_path / "video.mp4"
+    src.write_bytes(b"frames")
+
+    uploads.link_or_copy(src, tmp_path / "vid1.mp4")
+    assert (tmp_path / "vid1.mp4").stat().st_ino == src.stat().st_ino
+
+    def _exdev(_src, _dst):
+        raise OSError(18, "Invalid cross-device link")
+
+    monkeypatch.setattr(uploads.os, "link", _exdev)
+    uploads.link_or_copy(src, tmp_path / "vid2.mp4")
+    assert (tmp_path / "vid2.mp4").read_bytes() == b"frames"
+    assert (tmp_path / "vid2.mp4").stat().st_ino != src.stat().st_ino